@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+bench_codec.py - JSON(indent) / msgpack 저장 형식 로드·저장 시간 비교
+
+godpack.json 형태(키 문자열 -> 상태)와 heartbeat 기록(dict 리스트) 형태의
+합성 데이터를 만들어 형식별 파일 크기, 저장 시간, 로드 시간을 측정합니다.
+
+사용법:
+    python scripts/benchmark/bench_codec.py
+    python scripts/benchmark/bench_codec.py --entries 50000 --repeat 5
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.modules import Codec
+
+
+def make_godpack(n):
+    """godpack.json 형태의 합성 데이터"""
+    states = ["Yet", "Good", "Bad", "NaN"]
+    data = {}
+    for i in range(n):
+        key = f"2025.{(i % 12) + 1:02d}.{(i % 28) + 1:02d} {i % 24:02d}:{i % 60:02d} user{i % 500} {700 + i % 100} {20 * (i % 5 + 1)}% {i % 5 + 1}P"
+        data[key] = random.choice(states)
+    return data
+
+
+def make_heartbeat(n):
+    """heartbeat_data/<user>.json 형태의 합성 데이터"""
+    return [{
+        "timestamp": f"2025-04-06T{i % 24:02d}:{i % 60:02d}:00+00:00",
+        "barracks": random.randint(0, 200),
+        "version": "v6.4.1",
+        "type": "Inject Wonderpick 96P+",
+        "select": "Buzzwole, Solgaleo",
+        "group": "GROUP7",
+    } for i in range(n)]
+
+
+def bench(path, data, fmt, repeat):
+    """(파일 크기, 평균 저장 시간, 평균 로드 시간)"""
+    if os.path.exists(path):
+        os.remove(path)
+    save = load = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        Codec.write_file(path, data, fmt, indent=4)
+        save += time.perf_counter() - start
+        start = time.perf_counter()
+        Codec.read_file(path)
+        load += time.perf_counter() - start
+    return os.path.getsize(path), save / repeat, load / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON / msgpack 저장 형식 벤치마크")
+    parser.add_argument("--entries", type=int, default=20000, help="데이터 개수")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수")
+    args = parser.parse_args()
+
+    formats = [Codec.FORMAT_JSON]
+    if Codec.msgpack is not None:
+        formats.append(Codec.FORMAT_MSGPACK)
+    else:
+        print("⚠️ msgpack 패키지가 없어 JSON만 측정합니다.")
+
+    datasets = {
+        "godpack": make_godpack(args.entries),
+        "heartbeat": make_heartbeat(args.entries),
+    }
+
+    print(f"=== 저장 형식 벤치마크 ({args.entries:,}개, {args.repeat}회 평균) ===")
+    print(f"{'데이터':<10} {'형식':<8} {'크기(bytes)':>14} {'저장(ms)':>10} {'로드(ms)':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, data in datasets.items():
+            for fmt in formats:
+                size, save, load = bench(os.path.join(tmp, f"{name}.{fmt}"), data, fmt, args.repeat)
+                print(f"{name:<10} {fmt:<8} {size:>14,} {save * 1000:>10.2f} {load * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+bench_gist.py - GIST.py 원격 백엔드를 로컬 Gist 대역 서버로 측정
+
+scripts/testing/gist_server.py 를 같은 프로세스(별도 스레드)에서 띄우고
+GITHUB_API_URL/GITHUB_RAW_URL 을 그 주소로 바꾼 뒤 아래를 측정합니다.
+    fetch_data   동기 requests 경로 (gist 정보 + raw)
+    afetch_raw   공유 커넥션 풀 경로, --concurrency 개 동시 요청
+    aupdate      같은 gist 파일들을 동시에 갱신 (배치 PATCH 수 포함)
+    detect       SERVER.found_GodPack -> GODPACK/GPTEST 배치 PATCH 완료까지
+
+사용법:
+    python scripts/benchmark/bench_gist.py
+    python scripts/benchmark/bench_gist.py --latency 80 --jitter 40 --concurrency 8 --entries 20000
+    python scripts/benchmark/bench_gist.py --error-rate 0.05 --output results/gist.json
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from types import SimpleNamespace
+from datetime import datetime, timezone
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'scripts', 'testing'))
+
+from gist_server import GistStandIn
+
+GIST_ID = "benchgist"
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(p / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def summarize(op, times, **extra):
+    row = {
+        "op": op,
+        "n": len(times),
+        "p50_ms": round(percentile(times, 50) * 1000, 3),
+        "p99_ms": round(percentile(times, 99) * 1000, 3),
+    }
+    row.update(extra)
+    extra_str = " ".join(f"{k}={v}" for k, v in extra.items())
+    print(f"{op:<12} {row['n']:>6} {row['p50_ms']:>10.3f} {row['p99_ms']:>10.3f}  {extra_str}")
+    return row
+
+
+def godpack_message(i):
+    """GIST.SERVER.extract_GodPack 형식의 감지 메시지"""
+    return SimpleNamespace(
+        content=f"God pack found\nBENCH{i} (1234567812345678)\n[2/5][{i % 5 + 1}P] Solgaleo",
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+async def run_async(GIST, results, repeat, concurrency):
+    from src.modules.GistClient import get_client, get_batcher
+
+    # afetch_raw: 동시 요청
+    files = [GIST.JSON(GIST_ID, "GodPack7", False) for _ in range(concurrency)]
+    times = []
+    for _ in range(repeat):
+        async def timed(file):
+            start = time.perf_counter()
+            await file.afetch_raw()
+            times.append(time.perf_counter() - start)
+        await asyncio.gather(*(timed(file) for file in files))
+    client = get_client()
+    results.append(summarize("afetch_raw", times, concurrency=concurrency,
+                             not_modified=client.not_modified, requests=client.requests))
+
+    # aupdate: 같은 gist의 여러 파일을 동시에 갱신
+    names = [f"Bench{i}" for i in range(concurrency)]
+    updaters = [GIST.JSON(GIST_ID, name, False) for name in names]
+    batcher = get_batcher()
+    patches_before = batcher.patches
+    times = []
+    for r in range(repeat):
+        for updater in updaters:
+            updater.edit('+', f"key{r}", "Yet")
+        start = time.perf_counter()
+        await asyncio.gather(*(updater.aupdate() for updater in updaters))
+        times.append(time.perf_counter() - start)
+    results.append(summarize("aupdate", times, files=concurrency,
+                             patches=batcher.patches - patches_before))
+
+    # detect: found_GodPack -> 배치 PATCH 완료
+    godpack = GIST.JSON(GIST_ID, "GodPack7", False)
+    godpack.DATA = await godpack.afetch_raw()
+    gptest = GIST.JSON(GIST_ID, "Code7", False)
+    server = GIST.SERVER(0, None, godpack, gptest, 0, 0, 0, 0, {})
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        server.found_GodPack(godpack_message(i))
+        await batcher.flush()
+        times.append(time.perf_counter() - start)
+    results.append(summarize("detect", times))
+
+    await client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GIST.py 원격 백엔드 벤치마크 (로컬 대역 서버)")
+    parser.add_argument("--entries", type=int, default=5000, help="GodPack7 초기 항목 수")
+    parser.add_argument("--repeat", type=int, default=20, help="반복 횟수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 요청 수")
+    parser.add_argument("--latency", type=float, default=50, help="서버 응답 지연 (ms)")
+    parser.add_argument("--jitter", type=float, default=20, help="추가 무작위 지연 최대치 (ms)")
+    parser.add_argument("--error-rate", type=float, default=0, help="500 응답 비율 (0~1)")
+    parser.add_argument("--output", help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    godpack = {f"2025.04.{i % 28 + 1:02d} 10:00 user{i} {i} 40% 2P": "Good" for i in range(args.entries)}
+    server = GistStandIn({GIST_ID: {"GodPack7": json.dumps(godpack), "Code7": "{}"}},
+                         latency=args.latency / 1000, jitter=args.jitter / 1000, error_rate=args.error_rate)
+    url = server.start_in_thread()
+
+    # GIST 모듈은 import 시점에 주소를 읽으므로 먼저 설정
+    os.environ['GITHUB_API_URL'] = url
+    os.environ['GITHUB_RAW_URL'] = url
+    os.environ.setdefault('GITHUB_USER_ID', server.user)
+    os.environ.setdefault('GITHUB_GIST_TOKEN', 'bench')
+    os.environ['GIST_CONCURRENCY'] = str(args.concurrency)
+    from src.modules import GIST
+
+    print(f"=== Gist 벤치마크 ({url}, 지연 {args.latency}±{args.jitter}ms, 오류율 {args.error_rate}) ===")
+    print(f"{'작업':<12} {'n':>6} {'p50(ms)':>10} {'p99(ms)':>10}")
+    results = []
+
+    times = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        GIST.JSON(GIST_ID, "GodPack7")
+        times.append(time.perf_counter() - start)
+    results.append(summarize("fetch_data", times, entries=args.entries))
+
+    asyncio.run(run_async(GIST, results, args.repeat, args.concurrency))
+    server.stop_thread()
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "latency_ms": args.latency,
+        "jitter_ms": args.jitter,
+        "error_rate": args.error_rate,
+        "server": server.stats,
+        "results": results,
+    }
+    print(f"\n서버 통계: {server.stats}")
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"✅ 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+bench_parser.py - Heartbeat 메시지 파싱 시간 비교 (기존 방식 vs HeartbeatParser)
+
+messages.py / messages_for_barrack.py 형식의 합성 메시지를 만들어
+기존 Poke2 parse_heartbeat_message + GIST.USER.extract 를 각각 돌리는 경우와
+HeartbeatParser.parse 한 번으로 두 결과를 만드는 경우의 처리 시간을 측정합니다.
+
+사용법:
+    python scripts/benchmark/bench_parser.py
+    python scripts/benchmark/bench_parser.py --messages 50000 --repeat 5
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.modules import HeartbeatParser
+
+
+def make_message(i):
+    """Heartbeat 메시지 (두 테스트 시나리오 형식을 번갈아)"""
+    packs_list = ["Shining", "Arceus", "Palkia", "Dialga", "Mew", "Charizard", "Pikachu"]
+    online = ", ".join(str(n) for n in range(1, random.randint(2, 40)))
+    minutes, packs = random.randint(0, 600), random.randint(0, 2000)
+    avg = packs / minutes if minutes else 0.0
+    separator = " | " if i % 2 else " "
+    return f'''user{i % 500}
+Online: Main, {online}
+Offline: none
+Time: {minutes}m{separator}Packs: {packs} | Avg: {avg:.2f} packs/min
+Version: {random.choice(["Arturo-v6.3.29", "mixman208-v6.4.14", "Letsw-v6.5.2"])}
+Type: {random.choice(["5 Pack (Fast) (Menu Delete)", "Inject for Reroll (1P Method)", "Normal Opening"])}
+Opening: {", ".join(random.sample(packs_list, k=2))},'''
+
+
+def legacy_poke2(content):
+    """기존 Poke2 parse_heartbeat_message (내용 전체에 re.search 여러 번)"""
+    data = {'barracks': 0, 'version': 'Unknown', 'type': 'Unknown', 'select': 'Unknown'}
+    online_line = next((line.strip() for line in content.splitlines() if line.strip().lower().startswith("online:")), None)
+    if online_line:
+        data['barracks'] = len(re.findall(r'\b\d+\b', online_line.split(":", 1)[1].strip()))
+    stats_match = re.search(r"^Time:\s*(\d+)m\s*\|\s*Packs:\s*(\d+)\s*\|\s*Avg:\s*([\d.]+)\s*packs/min", content, re.MULTILINE | re.IGNORECASE)
+    if stats_match:
+        data['time_minutes'] = int(stats_match.group(1))
+        data['packs'] = int(stats_match.group(2))
+        data['packs_per_min'] = float(stats_match.group(3))
+    version_match = re.search(r"^Version:\s*(.*?)\s*$", content, re.MULTILINE | re.IGNORECASE)
+    if version_match: data['version'] = version_match.group(1).strip()
+    type_match = re.search(r"^Type:\s*(.*?)\s*$", content, re.MULTILINE | re.IGNORECASE)
+    if type_match: data['type'] = type_match.group(1).strip()
+    select_match = re.search(r"^Select:\s*(.*?)\s*$", content, re.MULTILINE | re.IGNORECASE)
+    opening_match = re.search(r"^Opening:\s*(.*?)\s*$", content, re.MULTILINE | re.IGNORECASE)
+    select_value = select_match.group(1).strip() if select_match else None
+    opening_value = opening_match.group(1).strip() if opening_match else None
+    if select_value and opening_value:
+        data['select'] = opening_value if len(opening_value) >= len(select_value) else select_value
+    elif opening_value or select_value:
+        data['select'] = opening_value or select_value
+    return data
+
+
+def legacy_gist(content, created_at):
+    """기존 GIST.USER.extract (줄마다 정규식 여러 개)"""
+    inform = {'TIME': created_at}
+    for line in content.split("\n"):
+        if 'Online' in line:
+            inform['BARRACKS'] = len(re.findall(r'\d+', line))
+        if 'Time' in line:
+            match = re.search(r'Time:\s*(\d+)m.*?Packs:\s*(\d+).*?Avg:\s*([\d.]+)', line)
+            if match:
+                inform['RUNTIME'] = int(match.group(1))
+                inform['PACKS'] = int(match.group(2))
+                inform['AVG'] = float(match.group(3)) if inform['RUNTIME'] else float('nan')
+        if 'Type' in line:
+            num_match = re.search(r"Type:\s*(\d+)", line)
+            inform['TYPE'] = int(num_match.group(1)) if num_match else None
+            inform['METHOD'] = re.findall(r"\(([^)]+)\)", line)
+        if 'Select' in line:
+            match = re.search(r"Select:\s*(.*)", line)
+            if match:
+                inform['SELECT'] = [item.strip() for item in match.group(1).split(',') if item.strip()]
+        if 'Opening' in line:
+            match = re.search(r"Opening:\s*(.*)", line)
+            if match:
+                inform['SELECT'] = [item.strip() for item in match.group(1).split(',') if item.strip()]
+    return inform
+
+
+def parse_both(content):
+    """HeartbeatParser 한 번으로 두 형식 모두"""
+    heartbeat = HeartbeatParser.parse(content)
+    return HeartbeatParser.to_record(heartbeat), HeartbeatParser.to_inform(heartbeat, 0)
+
+
+def bench(func, messages, repeat):
+    """메시지당 평균 처리 시간 (마이크로초, 가장 빠른 회차)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for content in messages:
+            func(content)
+        best = min(best, time.perf_counter() - start)
+    return best / len(messages) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Heartbeat 메시지 파서 벤치마크")
+    parser.add_argument("--messages", type=int, default=20000, help="메시지 개수")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수")
+    args = parser.parse_args()
+
+    messages = [make_message(i) for i in range(args.messages)]
+    cases = [
+        ("기존 Poke2", legacy_poke2),
+        ("기존 GIST", lambda content: legacy_gist(content, 0)),
+        ("기존 둘 다", lambda content: (legacy_poke2(content), legacy_gist(content, 0))),
+        ("parse", HeartbeatParser.parse),
+        ("parse+변환", parse_both),
+    ]
+
+    print(f"=== Heartbeat 파서 벤치마크 ({args.messages:,}개, {args.repeat}회 중 최고) ===")
+    print(f"{'방식':<12} {'메시지당(us)':>14}")
+    for name, func in cases:
+        print(f"{name:<12} {bench(func, messages, args.repeat):>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+bench_storage.py - 저장소 계층별 데이터 크기에 따른 비용 측정
+
+대상:
+    GISTAdapter.JsonAdapter / TextAdapter
+    LocalFileAdapter (JSON / TEXT)
+    LocalFile.openFile / uploadFile / backup
+
+갓팩(godpack.json) 1k~200k개, 멤버(online.txt / member.json) 100~10k개의 합성 데이터로
+load, edit+update, fetch_raw, backup 의 p50/p99 지연과 작업당 기록 바이트를 측정하고
+결과를 JSON으로 저장합니다 (버전 간 회귀 비교용).
+
+사용법:
+    python scripts/benchmark/bench_storage.py
+    python scripts/benchmark/bench_storage.py --godpacks 1000,200000 --members 100,10000 --repeat 20
+    python scripts/benchmark/bench_storage.py --output results/storage.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime
+
+# 프로젝트 루트를 path에 추가
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+# LocalFileAdapter는 평면 import를 사용
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src', 'modules'))
+
+from src.modules.LocalFile import LocalFile
+from src.modules.GISTAdapter import JsonAdapter, TextAdapter
+from src.modules.FileCache import read_cache
+import LocalFileAdapter
+import FileCache as flat_FileCache
+
+STATES = ["Yet", "Good", "Bad", "NaN"]
+
+
+def godpack_key(i):
+    """godpack.json 형태의 키"""
+    return (f"2025.{(i % 12) + 1:02d}.{(i % 28) + 1:02d} {i % 24:02d}:{i % 60:02d} "
+            f"user{i % 500} {700 + i % 100} {20 * (i % 5 + 1)}% {i % 5 + 1}P")
+
+
+def make_godpack(n):
+    return {godpack_key(i): random.choice(STATES) for i in range(n)}
+
+
+def make_codes(n):
+    """online.txt 형태의 친구코드 목록"""
+    return [f"{random.randrange(10 ** 15, 10 ** 16)}" for _ in range(n)]
+
+
+def make_members(n):
+    """member.json 형태 (이름 -> 친구코드)"""
+    return {f"member{i}": code for i, code in enumerate(make_codes(n))}
+
+
+def written_bytes():
+    """프로세스가 지금까지 write() 한 바이트 (/proc/self/io, 없으면 None)"""
+    try:
+        with open('/proc/self/io') as f:
+            for line in f:
+                if line.startswith('wchar:'):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(p / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def measure(func, repeat):
+    """(지연 목록(초), 작업당 평균 기록 바이트)"""
+    times = []
+    before = written_bytes()
+    for i in range(repeat):
+        start = time.perf_counter()
+        func(i)
+        times.append(time.perf_counter() - start)
+    after = written_bytes()
+    per_op = (after - before) / repeat if before is not None and after is not None else None
+    return times, per_op
+
+
+def record(results, target, op, size, times, per_op):
+    row = {
+        "target": target,
+        "op": op,
+        "size": size,
+        "n": len(times),
+        "p50_ms": round(percentile(times, 50) * 1000, 3),
+        "p99_ms": round(percentile(times, 99) * 1000, 3),
+        "bytes_per_op": round(per_op) if per_op is not None else None,
+    }
+    results.append(row)
+    bytes_str = f"{row['bytes_per_op']:,}" if per_op is not None else "-"
+    print(f"{target:<28} {op:<16} {size:>8,} {row['p50_ms']:>10.3f} {row['p99_ms']:>10.3f} {bytes_str:>14}")
+
+
+def drop_caches():
+    """stat 캐시 비우기 (파싱 비용까지 측정)"""
+    read_cache.invalidate()
+    flat_FileCache.read_cache.invalidate()
+
+
+def bench_adapter(results, target, adapter, size, repeat, make_edit):
+    """load / edit+update / fetch_raw 측정 (load는 캐시 적중/미적중 따로)"""
+    record(results, target, "load", size, *measure(lambda i: adapter.load(), repeat))
+    record(results, target, "load_nocache", size, *measure(lambda i: (drop_caches(), adapter.load()), repeat))
+    record(results, target, "edit+update", size, *measure(lambda i: (make_edit(adapter, i), adapter.update()), repeat))
+    record(results, target, "fetch_raw", size, *measure(lambda i: adapter.fetch_raw(), repeat))
+
+
+def edit_godpack(adapter, i):
+    adapter.edit('+', godpack_key(10 ** 7 + i), "Yet")
+
+
+def edit_text(adapter, i):
+    adapter.edit('+', f"{10 ** 15 + i}")
+
+
+def bench_godpack(results, size, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LocalFile(base_path=os.path.join(tmp, "poke_data"), journal=False)
+        storage.uploadFile("Group7", "Group7_godpack", make_godpack(size), 'JSON')
+
+        adapter = JsonAdapter(storage, "group7", "godpack.json", name="GodPack7")
+        bench_adapter(results, "GISTAdapter.JsonAdapter", adapter, size, repeat, edit_godpack)
+
+        os.environ['DATA_PATH'] = tmp
+        adapter = LocalFileAdapter.JSON(None, 'GodPack7')
+        bench_adapter(results, "LocalFileAdapter.JSON", adapter, size, repeat, edit_godpack)
+
+        data = storage.openFile("Group7", "Group7_godpack", 'JSON')
+        record(results, "LocalFile", "openFile", size,
+               *measure(lambda i: storage.openFile("Group7", "Group7_godpack", 'JSON'), repeat))
+        record(results, "LocalFile", "openFile_nocache", size,
+               *measure(lambda i: (drop_caches(), storage.openFile("Group7", "Group7_godpack", 'JSON')), repeat))
+        record(results, "LocalFile", "uploadFile", size,
+               *measure(lambda i: storage.uploadFile("Group7", "Group7_godpack", data, 'JSON'), repeat))
+
+        # 첫 백업은 전체 복사, 이후는 (변경이 없으므로) 하드링크만
+        record(results, "LocalFile", "backup_full", size, *measure(lambda i: storage.backup(), 1))
+        record(results, "LocalFile", "backup", size, *measure(lambda i: storage.backup(), repeat))
+
+
+def bench_members(results, size, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LocalFile(base_path=os.path.join(tmp, "poke_data"), journal=False)
+        codes = make_codes(size)
+        storage.uploadFile("Group7", "Group7_online", codes, 'TEXT')
+        storage.uploadFile("Common", "Common_member", make_members(size), 'JSON')
+
+        adapter = TextAdapter(storage, "group7", "online.txt", name="Group7")
+        bench_adapter(results, "GISTAdapter.TextAdapter", adapter, size, repeat, edit_text)
+
+        os.environ['DATA_PATH'] = tmp
+        adapter = LocalFileAdapter.TEXT(None, 'Group7')
+        bench_adapter(results, "LocalFileAdapter.TEXT", adapter, size, repeat, edit_text)
+
+        adapter = JsonAdapter(storage, "common", "member.json", name="Alliance")
+        bench_adapter(results, "GISTAdapter.JsonAdapter", adapter, size, repeat,
+                      lambda a, i: a.edit('+', f"new{i}", f"{10 ** 15 + i}"))
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="저장소 계층 벤치마크")
+    parser.add_argument("--godpacks", default="1000,20000,200000", help="갓팩 개수 목록 (쉼표 구분)")
+    parser.add_argument("--members", default="100,1000,10000", help="멤버 수 목록 (쉼표 구분)")
+    parser.add_argument("--repeat", type=int, default=10, help="작업별 반복 횟수")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: 표준 출력에만 표)")
+    args = parser.parse_args()
+
+    random.seed(0)
+    results = []
+    print(f"{'대상':<28} {'작업':<16} {'크기':>8} {'p50(ms)':>10} {'p99(ms)':>10} {'bytes/op':>14}")
+    for size in [int(s) for s in args.godpacks.split(',') if s]:
+        bench_godpack(results, size, args.repeat)
+    for size in [int(s) for s in args.members.split(',') if s]:
+        bench_members(results, size, args.repeat)
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n✅ 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+backup_data.py - poke_data 증분 백업 / 보존 정리 / 복원 스크립트
+
+변경되지 않은 파일은 이전 스냅샷에 하드링크하고 바뀐 파일만 복사합니다.
+스냅샷 위치: <data>/poke_data/backup/YYYYMMDD_HHMMSS/
+
+사용법:
+    python scripts/migration/backup_data.py create
+    python scripts/migration/backup_data.py create --group group7
+    python scripts/migration/backup_data.py list
+    python scripts/migration/backup_data.py prune --hourly 24 --daily 7 --weekly 4
+    python scripts/migration/backup_data.py restore                      # 최신 스냅샷
+    python scripts/migration/backup_data.py restore 20250406_055800 --group group7
+"""
+
+import os
+import sys
+import argparse
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.modules.LocalFile import LocalFile
+from src.modules.paths import get_data_path
+
+
+def snapshot_size(path):
+    """스냅샷이 새로 차지한 용량 (링크 수가 1인 파일만)"""
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for filename in files:
+            st = os.stat(os.path.join(root, filename))
+            if st.st_nlink == 1:
+                total += st.st_size
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="poke_data 증분 백업 관리")
+    parser.add_argument("--data-dir", default=get_data_path("poke_data"), help="poke_data 디렉토리")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    create = sub.add_parser("create", help="스냅샷 생성")
+    create.add_argument("--group", help="특정 그룹만 백업 (예: group7)")
+    create.add_argument("--no-prune", action="store_true", help="보존 정리 생략")
+
+    sub.add_parser("list", help="스냅샷 목록")
+
+    prune = sub.add_parser("prune", help="보존 정책에 맞지 않는 스냅샷 삭제")
+    prune.add_argument("--hourly", type=int, help="시간 단위 보존 개수 (기본: BACKUP_KEEP_HOURLY)")
+    prune.add_argument("--daily", type=int, help="일 단위 보존 개수 (기본: BACKUP_KEEP_DAILY)")
+    prune.add_argument("--weekly", type=int, help="주 단위 보존 개수 (기본: BACKUP_KEEP_WEEKLY)")
+
+    restore = sub.add_parser("restore", help="스냅샷에서 복원 (봇을 멈춘 뒤 실행)")
+    restore.add_argument("snapshot", nargs="?", help="스냅샷 이름 (기본: 최신)")
+    restore.add_argument("--group", help="특정 그룹만 복원")
+
+    args = parser.parse_args()
+    storage = LocalFile(base_path=args.data_dir, journal=False)
+
+    if args.command == "create":
+        ok = storage.backup(args.group)
+        if ok and not args.no_prune:
+            storage.pruneBackups()
+        return 0 if ok else 1
+
+    if args.command == "list":
+        snapshots = storage.listBackups()
+        print(f"=== 스냅샷 {len(snapshots)}개 ===")
+        for name in snapshots:
+            size = snapshot_size(os.path.join(args.data_dir, "backup", name))
+            print(f"{name:<20} 신규 {size:>12,} bytes")
+        return 0
+
+    if args.command == "prune":
+        removed = storage.pruneBackups(args.hourly, args.daily, args.weekly)
+        for name in removed:
+            print(f"🗑️ {name}")
+        return 0
+
+    if args.command == "restore":
+        return 0 if storage.restore(args.snapshot, args.group) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+convert_storage_format.py - 저장 파일을 JSON <-> msgpack 으로 변환하는 스크립트
+
+대상: poke_data/*/godpack.json, godpackCode.json, member.json
+파일명은 그대로 두고 내용 형식만 바꿉니다 (읽을 때 자동 판별).
+heartbeat_data 는 줄 단위 JSONL(<user>.jsonl)과 매니페스트라 변환하지 않습니다 (JSON만 지원).
+
+사용법:
+    python scripts/migration/convert_storage_format.py --to msgpack
+    python scripts/migration/convert_storage_format.py --to json --data-dir data_test
+    python scripts/migration/convert_storage_format.py --to msgpack --dry-run
+"""
+
+import os
+import sys
+import glob
+import argparse
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.modules import Codec
+from src.modules.paths import DATA_DIR
+
+POKE_DATA_FILES = ["godpack.json", "godpackCode.json", "member.json"]
+
+
+def find_targets(data_dir):
+    """변환 대상 파일 목록"""
+    targets = []
+    for name in POKE_DATA_FILES:
+        targets.extend(glob.glob(os.path.join(data_dir, "poke_data", "*", name)))
+    return sorted(targets)
+
+
+def convert(data_dir, target_format, dry_run=False):
+    """data_dir 아래 대상 파일을 target_format 으로 변환"""
+    print(f"=== 저장 형식 변환 시작: {data_dir} → {target_format} ===")
+    if target_format == Codec.FORMAT_MSGPACK and Codec.msgpack is None:
+        print("❌ msgpack 패키지가 설치되어 있지 않습니다. (pip install msgpack)")
+        return False
+
+    converted = skipped = failed = 0
+    before_total = after_total = 0
+    for path in find_targets(data_dir):
+        current = Codec.file_format(path)
+        if current is None or current == target_format:
+            skipped += 1
+            continue
+        try:
+            data, _ = Codec.read_file(path)
+            before = os.path.getsize(path)
+            after = len(Codec.dumps(data, target_format))
+            if not dry_run:
+                Codec.write_file(path, data, target_format)
+            before_total += before
+            after_total += after
+            converted += 1
+        except Exception as e:
+            print(f"❌ 변환 실패: {path} ({e})")
+            failed += 1
+
+    print(f"✅ 변환 {converted}개 / 건너뜀 {skipped}개 / 실패 {failed}개")
+    if converted:
+        print(f"📦 크기: {before_total:,} → {after_total:,} bytes ({after_total / before_total * 100:.1f}%)")
+    if dry_run:
+        print("(dry-run: 실제 파일은 변경하지 않았습니다)")
+    return failed == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="저장 파일 JSON <-> msgpack 변환")
+    parser.add_argument("--to", choices=[Codec.FORMAT_JSON, Codec.FORMAT_MSGPACK], required=True,
+                        help="변환할 형식")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="데이터 디렉토리 (기본: data/)")
+    parser.add_argument("--dry-run", action="store_true", help="변환하지 않고 결과만 출력")
+    args = parser.parse_args()
+    return 0 if convert(args.data_dir, args.to, args.dry_run) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
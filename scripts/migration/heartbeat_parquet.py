@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+heartbeat_parquet.py - Heartbeat 기록 Parquet 내보내기 / 정리 / 분석 조회
+
+<data>/heartbeat_parquet/date=YYYY-MM-DD/*.parquet 에 기록합니다.
+Poke2는 HEARTBEAT_PARQUET=true 이면 새 Heartbeat를 계속 추가하므로,
+export는 기존 기록(또는 Poke20의 heartbeat_data20)을 처음 한 번 옮길 때 사용합니다.
+<user>.json 리스트로 남아 있는 기록(Poke20)은 변환하지 않고 읽기만 합니다.
+
+사용법:
+    python scripts/migration/heartbeat_parquet.py export
+    python scripts/migration/heartbeat_parquet.py export --dir heartbeat_data20
+    python scripts/migration/heartbeat_parquet.py compact
+    python scripts/migration/heartbeat_parquet.py group-hour --days 30
+    python scripts/migration/heartbeat_parquet.py drop --recent-hours 24 --baseline-days 7 --threshold 0.2
+"""
+
+import os
+import sys
+import argparse
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.modules.HeartbeatStore import HeartbeatStore
+from src.modules import HeartbeatParquet
+from src.modules.paths import get_data_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Heartbeat Parquet 분석 저장소")
+    parser.add_argument("command", choices=["export", "compact", "group-hour", "drop"])
+    parser.add_argument("--dir", default="heartbeat_data", help="export 원본 Heartbeat 폴더 이름")
+    parser.add_argument("--parquet", default="heartbeat_parquet", help="Parquet 폴더 이름")
+    parser.add_argument("--days", type=int, default=30, help="group-hour 조회 기간 (일)")
+    parser.add_argument("--recent-hours", type=int, default=24, help="drop 최근 기간 (시간)")
+    parser.add_argument("--baseline-days", type=int, default=7, help="drop 기준 기간 (일)")
+    parser.add_argument("--threshold", type=float, default=0.2, help="drop 하락 비율 기준")
+    args = parser.parse_args()
+
+    if not HeartbeatParquet.AVAILABLE:
+        print("❌ pyarrow가 설치되어 있지 않습니다 (pip install pyarrow)")
+        return 1
+    parquet = HeartbeatParquet.HeartbeatParquet(get_data_path(args.parquet))
+
+    if args.command == "export":
+        store = HeartbeatStore(get_data_path(args.dir))
+        if not store.users() and not store.legacy_users():
+            print(f"❌ 내보낼 Heartbeat 기록이 없습니다 ({store.data_dir})")
+            return 1
+        count = parquet.export_store(store)
+        print(f"✅ 내보내기 완료: {count}행 ({store.data_dir} -> {parquet.root_dir})")
+    elif args.command == "compact":
+        print(f"✅ 파티션 {parquet.compact()}개 정리")
+    elif args.command == "group-hour":
+        df = HeartbeatParquet.barracks_per_group_hour(parquet, days=args.days)
+        print(df.to_string(index=False))
+    else:
+        df = HeartbeatParquet.packs_per_min_drop(parquet, recent_hours=args.recent_hours,
+                                                 baseline_days=args.baseline_days, threshold=args.threshold)
+        print(df.to_string(index=False) if not df.empty else "📊 하락한 사용자 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+rollup_heartbeats.py - Heartbeat 원본 보존 기간 적용 / 시간·일별 요약 조회
+
+보존 기간이 지난 원본 기록을 <dir>/rollup/<user>.json 요약으로 옮깁니다.
+Poke2는 6시간마다 자동으로 실행하므로, 수동 정리나 보존 기간을 바꿔 다시 돌릴 때 사용합니다.
+요약 대상은 JSONL(<user>.jsonl) 기록뿐입니다. Poke20(heartbeat_data20)처럼 기존 <user>.json
+리스트를 쓰는 폴더는 그 봇이 파일을 계속 다시 쓰므로 요약/변환하지 않고, show로 읽기만 합니다.
+
+사용법:
+    python scripts/migration/rollup_heartbeats.py run
+    python scripts/migration/rollup_heartbeats.py run --raw-days 7
+    python scripts/migration/rollup_heartbeats.py show 사용자이름 --since 2025-03-01 --daily
+    python scripts/migration/rollup_heartbeats.py show 사용자이름 --dir heartbeat_data20
+"""
+
+import os
+import sys
+import json
+import argparse
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.modules.HeartbeatStore import HeartbeatStore, sanitize_filename
+from src.modules.HeartbeatRollup import HeartbeatRollup
+from src.modules.paths import get_data_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Heartbeat 보존 기간 적용 / 요약 조회")
+    parser.add_argument("command", choices=["run", "show"])
+    parser.add_argument("user", nargs="?", help="show 대상 사용자")
+    parser.add_argument("--dir", default="heartbeat_data", help="데이터 디렉토리 아래 Heartbeat 폴더 이름")
+    parser.add_argument("--raw-days", type=int, help="원본 보존 일수 (기본: HEARTBEAT_RAW_DAYS)")
+    parser.add_argument("--hourly-days", type=int, help="시간별 요약 보존 일수 (기본: HEARTBEAT_HOURLY_DAYS)")
+    parser.add_argument("--since", help="show 시작 시각 (ISO, 예: 2025-03-01)")
+    parser.add_argument("--daily", action="store_true", help="show를 일별 요약으로")
+    args = parser.parse_args()
+
+    store = HeartbeatStore(get_data_path(args.dir))
+    rollup = HeartbeatRollup(store, raw_days=args.raw_days, hourly_days=args.hourly_days)
+    legacy = store.legacy_users()
+
+    if args.command == "run":
+        if legacy:
+            print(f"⚠️ 기존 .json 기록 {len(legacy)}명은 건너뜀 (JSONL만 요약, 파일은 그대로 둠)")
+        if not store.users():
+            print(f"❌ 요약할 JSONL 기록이 없습니다 ({store.data_dir})")
+            return 1
+        moved = rollup.run()
+        for user_name, count in sorted(moved.items()):
+            print(f"  {user_name}: {count}개")
+        print(f"✅ 요약 완료: {len(moved)}명, 원본 {sum(moved.values())}개 정리 ({store.data_dir})")
+    else:
+        if not args.user:
+            parser.error("show에는 사용자 이름이 필요합니다")
+        if sanitize_filename(args.user) in legacy:
+            # 기존 .json은 요약이 없으므로 원본만 (변환하지 않고 읽기)
+            rows = [r for r in store.read_legacy(args.user) if not args.since or r['timestamp'] >= args.since]
+        else:
+            rows = rollup.history(args.user, since=args.since, resolution="daily" if args.daily else "hourly")
+        for row in rows:
+            print(json.dumps(row, ensure_ascii=False))
+        print(f"📊 {len(rows)}행")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+gist_server.py - GitHub Gist API 로컬 대역 서버 (GIST.py 오프라인 부하 테스트용)
+
+GIST.py / GistClient가 쓰는 범위만 구현합니다.
+    GET   /gists/{id}                    gist 정보 (files.*.content / raw_url, ETag/304)
+    PATCH /gists/{id}                    {"files": {이름: {"content": ...}}} (content가 null이면 삭제)
+    GET   /{user}/{id}/raw/{name}        raw 파일 (GITHUB_RAW_URL 형식)
+    GET   /_stats                        요청 통계 (동시 처리 최대치 포함)
+
+지연(--latency/--jitter), 오류 주입(--error-rate), 속도 제한 헤더(--rate-limit)를 지원합니다.
+봇/스크립트는 아래 환경변수로 이 서버를 바라보게 합니다.
+    GITHUB_API_URL=http://127.0.0.1:8787
+    GITHUB_RAW_URL=http://127.0.0.1:8787
+
+사용법:
+    python scripts/testing/gist_server.py
+    python scripts/testing/gist_server.py --port 8787 --latency 80 --jitter 40 --error-rate 0.02
+    python scripts/testing/gist_server.py --rate-limit 5000 --seed gists.json   # {"gist_id": {"파일명": "내용"}}
+"""
+
+import json
+import time
+import random
+import asyncio
+import hashlib
+import argparse
+import threading
+
+from aiohttp import web
+
+
+class GistStandIn:
+    """메모리 기반 Gist API 대역 서버"""
+
+    def __init__(self, gists=None, latency=0.0, jitter=0.0, error_rate=0.0,
+                 rate_limit=None, rate_window=3600, user="standin"):
+        """
+        Args:
+            gists: 초기 데이터 {gist_id: {파일명: 내용}} (없는 gist는 처음 요청 시 생성)
+            latency / jitter: 응답 지연 (초) = latency + uniform(0, jitter)
+            error_rate: 500 응답 비율 (0~1)
+            rate_limit: 창(rate_window초)당 허용 요청 수 (None이면 제한 없음, 헤더만 보냄)
+        """
+        self.gists = gists if gists is not None else {}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.user = user
+        self.url = None
+        self._runner = None
+        self._window_start = time.time()
+        self._window_used = 0
+        self.stats = {"get": 0, "raw": 0, "patch": 0, "not_modified": 0,
+                      "errors": 0, "rate_limited": 0, "active": 0, "peak": 0}
+
+    # ---- 응답 공통 처리 ----
+    def _rate_headers(self):
+        now = time.time()
+        if now - self._window_start >= self.rate_window:
+            self._window_start, self._window_used = now, 0
+        self._window_used += 1
+        limit = self.rate_limit or 5000
+        return {
+            "X-RateLimit-Limit": str(limit),
+            "X-RateLimit-Remaining": str(max(0, limit - self._window_used)),
+            "X-RateLimit-Used": str(self._window_used),
+            "X-RateLimit-Reset": str(int(self._window_start + self.rate_window)),
+        }
+
+    @web.middleware
+    async def _middleware(self, request, handler):
+        if request.path == "/_stats":
+            return await handler(request)
+        self.stats["active"] += 1
+        self.stats["peak"] = max(self.stats["peak"], self.stats["active"])
+        try:
+            headers = self._rate_headers()
+            delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+            if delay:
+                await asyncio.sleep(delay)
+            if self.rate_limit and self._window_used > self.rate_limit:
+                self.stats["rate_limited"] += 1
+                return web.json_response({"message": "API rate limit exceeded"}, status=403, headers=headers)
+            if self.error_rate and random.random() < self.error_rate:
+                self.stats["errors"] += 1
+                return web.json_response({"message": "Server Error (injected)"}, status=500, headers=headers)
+            response = await handler(request)
+            response.headers.update(headers)
+            return response
+        finally:
+            self.stats["active"] -= 1
+
+    def _gist(self, gist_id):
+        return self.gists.setdefault(gist_id, {})
+
+    def _raw_url(self, request, gist_id, name):
+        return f"{request.scheme}://{request.host}/{self.user}/{gist_id}/raw/{name}"
+
+    # ---- 핸들러 ----
+    async def _get_gist(self, request):
+        self.stats["get"] += 1
+        gist_id = request.match_info["id"]
+        files = {name: {"filename": name, "raw_url": self._raw_url(request, gist_id, name),
+                        "size": len(content.encode('utf-8')), "content": content, "truncated": False}
+                 for name, content in self._gist(gist_id).items()}
+        body = json.dumps({"id": gist_id, "files": files}, ensure_ascii=False)
+        etag = '"' + hashlib.sha1(body.encode('utf-8')).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag:
+            self.stats["not_modified"] += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(text=body, headers={"ETag": etag}, content_type="application/json")
+
+    async def _get_raw(self, request):
+        self.stats["raw"] += 1
+        content = self._gist(request.match_info["id"]).get(request.match_info["name"])
+        if content is None:
+            return web.Response(status=404, text="404: Not Found")
+        etag = '"' + hashlib.sha1(content.encode('utf-8')).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag:
+            self.stats["not_modified"] += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(text=content, headers={"ETag": etag}, content_type="text/plain")
+
+    async def _patch_gist(self, request):
+        self.stats["patch"] += 1
+        try:
+            payload = await request.json()
+        except ValueError:
+            return web.json_response({"message": "Problems parsing JSON"}, status=400)
+        gist = self._gist(request.match_info["id"])
+        for name, info in payload.get("files", {}).items():
+            if info is None or info.get("content") is None:
+                gist.pop(name, None)
+            else:
+                gist[name] = info["content"]
+        return await self._get_gist(request)
+
+    async def _get_stats(self, request):
+        return web.json_response(self.stats)
+
+    def make_app(self):
+        app = web.Application(middlewares=[self._middleware], client_max_size=64 * 1024 * 1024)
+        app.router.add_get("/_stats", self._get_stats)
+        app.router.add_get("/gists/{id}", self._get_gist)
+        app.router.add_patch("/gists/{id}", self._patch_gist)
+        app.router.add_get("/{user}/{id}/raw/{name}", self._get_raw)
+        return app
+
+    # ---- 실행 ----
+    async def start(self, host="127.0.0.1", port=0):
+        """현재 이벤트 루프에서 시작 -> 기본 URL"""
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def start_in_thread(self, host="127.0.0.1", port=0):
+        """별도 스레드의 이벤트 루프에서 시작 (동기 requests 호출과 함께 쓸 때) -> 기본 URL"""
+        started = threading.Event()
+        loop = asyncio.new_event_loop()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.start(host, port))
+            started.set()
+            loop.run_forever()
+            loop.run_until_complete(self.stop())
+            loop.close()
+
+        thread = threading.Thread(target=run, name="gist-standin", daemon=True)
+        thread.start()
+        started.wait()
+        self._thread_loop, self._thread = loop, thread
+        return self.url
+
+    def stop_thread(self):
+        loop = getattr(self, '_thread_loop', None)
+        if loop:
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join()
+            self._thread_loop = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GitHub Gist API 로컬 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency", type=float, default=0, help="응답 지연 (ms)")
+    parser.add_argument("--jitter", type=float, default=0, help="추가 무작위 지연 최대치 (ms)")
+    parser.add_argument("--error-rate", type=float, default=0, help="500 응답 비율 (0~1)")
+    parser.add_argument("--rate-limit", type=int, help="시간당 허용 요청 수 (초과 시 403)")
+    parser.add_argument("--seed", help="초기 데이터 JSON 파일 ({gist_id: {파일명: 내용}})")
+    args = parser.parse_args()
+
+    gists = {}
+    if args.seed:
+        with open(args.seed, 'r', encoding='utf-8') as f:
+            gists = json.load(f)
+
+    server = GistStandIn(gists, latency=args.latency / 1000, jitter=args.jitter / 1000,
+                         error_rate=args.error_rate, rate_limit=args.rate_limit)
+
+    print(f"🚀 Gist 대역 서버: http://{args.host}:{args.port}")
+    print(f"   GITHUB_API_URL=http://{args.host}:{args.port}")
+    print(f"   GITHUB_RAW_URL=http://{args.host}:{args.port}")
+    web.run_app(server.make_app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
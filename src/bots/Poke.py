@@ -22,8 +22,13 @@ if project_root:
     sys.path.insert(0, project_root)
 
 # 프로젝트 모듈 import (절대 경로)
-from src.modules import GISTAdapter as GIST  # LocalFile을 사용하는 어댑터
+# STORAGE_BACKEND=sqlite 이면 SQLite(WAL) 백엔드, 기본은 LocalFile
+if os.getenv('STORAGE_BACKEND', 'local').lower() == 'sqlite':
+    from src.modules import SQLiteAdapter as GIST  # SQLite를 사용하는 어댑터
+else:
+    from src.modules import GISTAdapter as GIST  # LocalFile을 사용하는 어댑터
 from src.modules.paths import ensure_directories, LOGS_DIR
+from src.modules.StorageIO import storage_io
 from src.modules.PokeConfig import get_time_thresholds, get_bad_thresholds, get_special_conditions
 
 # 로깅 설정 함수
@@ -411,13 +416,13 @@ async def do_update():
             for user in remove:
                 user.offline(Server)
                 logger.info(f"[TIMEOUT] {user.NAME} 님이 OFF-LINE 되었습니다.")
-                Server.FILE.update()
+                await Server.FILE.aupdate()
                 await Server_Channel[ID].send(f"{user.NAME} 님이 OFF-LINE 되었습니다.")
     
     # 기존 WAITING → ONLINE 처리
     RAW_GIST_DICT = {}
     for ID, Server in SERVER_DICT.items() :
-        RAW_GIST_DICT[ID] = Server.FILE.fetch_raw()
+        RAW_GIST_DICT[ID] = await Server.FILE.afetch_raw()
         for user in list(Server.WAITING) :
             if user.CODE in RAW_GIST_DICT[ID] :
                 Server.WAITING.discard(user)
@@ -589,15 +594,16 @@ async def do_verify(Server):
                 await alert_channel.send(f"유효하지 않은 포스트가 검증 채널에 있습니다.\n제목 : {thread_name}")
 
         
-    yet_list = [text for text, verify in Server.GODPACK.DATA.items() if verify == 'Yet']
+    yet_list = Server.GODPACK.INDEX.keys_with_state('Yet')
     yet_change = False
+    thread_names = {state : {temp.name for temp in threads} for state, threads in THREAD_DICT.items()}
     for text in yet_list :
         parts = text.split()
-        title = f"{parts[2]} {parts[3]} / {parts[4]} / {parts[5]} / {parts[0]} {parts[1]}"
-        if title in [temp.name for temp in THREAD_DICT["Yet"]] :
+        title = Server.GODPACK.INDEX.title(text)
+        if title in thread_names["Yet"] :
             continue
         else :
-            if title in [temp.name for temp in THREAD_DICT["Good"]] :
+            if title in thread_names["Good"] :
                 thread = next((temp for temp in THREAD_DICT["Good"] if title == temp.name), None)
                 Server.GODPACK.edit('+', text, "Good")
                 yet_change = True
@@ -610,13 +616,13 @@ async def do_verify(Server):
                 except Exception as e:
                     logger.error(f"{title} 박물관 전시 실패! ", e)
             
-            elif title in [temp.name for temp in THREAD_DICT["Bad"]] :
+            elif title in thread_names["Bad"] :
                 Server.GODPACK.edit('+', text, "Bad")
                 Server.GPTEST.edit('-', text, None)
                 yet_change = True
                 logger.info(f"❗❗ {parts[2]} {parts[3]} 은 망으로 검증 되었습니다.")
                 await alert_channel.send(f"❗❗ {parts[2]} {parts[3]} 은 망으로 검증 되었습니다.")
-            elif title in [temp.name for temp in THREAD_DICT["Error"]] :
+            elif title in thread_names["Error"] :
                 logger.error(f"❗❗ {parts[2]} {parts[3]} 에 오류가 있습니다.")
             else :
                 KST = timezone(timedelta(hours=9))
@@ -657,8 +663,8 @@ async def do_verify(Server):
                         logger.error(f"{title} 포스팅 실패 : ", e)
                     await asyncio.sleep(1)
         if yet_change :
-            Server.GODPACK.update()
-            Server.GPTEST.update()
+            await Server.GODPACK.aupdate()
+            await Server.GPTEST.aupdate()
 
 async def verify_periodic(Server):
     """주기적으로 verify 실행"""
@@ -666,6 +672,31 @@ async def verify_periodic(Server):
         await asyncio.sleep(120)
         await do_verify(Server)
 
+async def backup_periodic(interval):
+    """주기적으로 데이터 증분 백업 (BACKUP_INTERVAL 분, I/O 풀에서 실행)"""
+    logger.info(f"backup_periodic 시작 {interval}분 주기로 실행")
+    while True:
+        await asyncio.sleep(interval * 60)
+        try:
+            await storage_io.run('backup', GIST.backup)
+        except Exception as e:
+            logger.error(f"❌ 백업 실패: {e}")
+
+async def do_archive(Server):
+    """보존 기간이 지난 검증 완료 기록을 월별 아카이브로 이동 (파일 쓰기는 storage_io에서)"""
+    try:
+        moved = await Server.GODPACK.aarchive_cold()
+        if moved:
+            logger.info(f"📦 {Server.FILE.NAME} 갓팩 기록 {moved}개를 아카이브로 옮겼습니다.")
+    except Exception as e:
+        logger.error(f"❌ {Server.FILE.NAME} 아카이브 이동 실패: {e}")
+
+async def archive_periodic(Server):
+    """주기적으로 archive 실행 (6시간)"""
+    while True:
+        await do_archive(Server)
+        await asyncio.sleep(6 * 60 * 60)
+
 @bot.event
 async def on_ready():
     logger.info(f"✅ 로그인됨: {bot.user}")
@@ -679,6 +710,13 @@ async def on_ready():
         await recent_offline(server)
 
 
+@bot.event
+async def on_disconnect():
+    """연결이 끊기면 write-behind 대기 중인 변경사항을 기록"""
+    logger.warning("[BOT DISCONNECT] Discord 연결 끊김 - 대기 중인 파일 변경사항 기록")
+    await GIST.aflush()
+
+
 @bot.event
 async def on_message(message):
     if message.author == bot.user:
@@ -699,7 +737,7 @@ async def on_message(message):
                 if USER_DICT[name].CODE not in Server.FILE.DATA:
                     logger.info(f"✅ 수집된 이름: {name}, 코드 : {USER_DICT[name].CODE}")
                     USER_DICT[name].online(Server)
-                    Server.FILE.update()
+                    await Server.FILE.aupdate()
                     await message.channel.send(f"로그인 시도 : {name}")
                     await message.channel.send("GIST 업데이트까지 약 5분 정도 소요됩니다.")
                 
@@ -718,7 +756,7 @@ async def on_message(message):
         
         elif "found by" in message.content:
             logger.info("Pseudo God Pack 을 찾았습니다.")
-            inform, title = Server.found_Pseudo(message)
+            inform, title = await Server.afound_Pseudo(message)
             
             if inform and title :
                 images = message.attachments
@@ -730,7 +768,7 @@ async def on_message(message):
         
         elif "Valid" in message.content :
             logger.info("God Pack 을 찾았습니다!")
-            inform, title = Server.found_GodPack(message)
+            inform, title = await Server.afound_GodPack(message)
             
             if inform and title :
                 images = message.attachments
@@ -764,9 +802,8 @@ async def change_pack(ctx, name, number, Mode) :
         await ctx.send("해당 명령어는 명령어 채널에 해주세요.")
         return
     
-    nameber = name + ' ' + number
-    
-    godpacks = [text for text in Server.GODPACK.DATA if nameber in text]
+    # (이름, 번호) 인덱스 조회
+    godpacks = Server.GODPACK.INDEX.find(name, number)
     
     alert_channel = await bot.fetch_channel(Server.DETECT)
     main_channel  = await bot.fetch_channel(MAIN_CHANNEL)
@@ -848,20 +885,19 @@ async def yet(ctx):
         await ctx.send("해당 명령어는 명령어 채널에 해주세요.")
         return
 
-    yet_list = [yet_str(text) for text, verify in Server.GODPACK.DATA.items() if verify == 'Yet']
+    yet_list = [yet_str(text) for text in Server.GODPACK.INDEX.keys_with_state('Yet')]
     yet_list = sorted(yet_list, key=lambda s: (s.lower(), s))
     
     recent_good = set()
-    for text, verify in Server.GODPACK.DATA.items() :
-        if verify == 'Good' :
-            parts = text.split()
-            date = parts[0]
-            hour = parts[1]
-            if Is_recent(date, hour, 2) :
-                recent_good.add(yet_str(text, "**"))
-                
-            elif Is_recent(date, hour, 4) :
-                recent_good.add(yet_str(text, "*"))
+    for text in Server.GODPACK.INDEX.keys_with_state('Good') :
+        parts = text.split()
+        date = parts[0]
+        hour = parts[1]
+        if Is_recent(date, hour, 2) :
+            recent_good.add(yet_str(text, "**"))
+            
+        elif Is_recent(date, hour, 4) :
+            recent_good.add(yet_str(text, "*"))
                 
                 
     recent_good_list = sorted(recent_good)
@@ -918,18 +954,16 @@ async def verify(ctx):
         status[post.name] = (bad, good, no)
         
     yet_list = []
-    for text, verify in Server.GODPACK.DATA.items() :
-        if verify == 'Yet' :
-            parts = text.split()
-            title = f"{parts[2]} {parts[3]} / {parts[4]} / {parts[5]} / {parts[0]} {parts[1]}"
-            
-            if title in status :
-                bad, good, no = status[title]
-                add = f"{bad:<3}{no:<3}{good:<3}"
-                table = " "*(len(convert_str(text))+5) + 'X  ' + '?  ' + 'V  '
-                yet_list.append(convert_str(text) + ' '*5 + add)
-            else :
-                await ctx.send(f"{title} 이 발견되지 않았습니다. 검증 채널을 확인해주세요")
+    for text in Server.GODPACK.INDEX.keys_with_state('Yet') :
+        title = Server.GODPACK.INDEX.title(text)
+        
+        if title in status :
+            bad, good, no = status[title]
+            add = f"{bad:<3}{no:<3}{good:<3}"
+            table = " "*(len(convert_str(text))+5) + 'X  ' + '?  ' + 'V  '
+            yet_list.append(convert_str(text) + ' '*5 + add)
+        else :
+            await ctx.send(f"{title} 이 발견되지 않았습니다. 검증 채널을 확인해주세요")
     yet_list.sort()
     
     if yet_list:
@@ -1084,35 +1118,32 @@ async def custom(ctx):
                 
                 
     yet_dict = {}
-    for text, verify in Server.GODPACK.DATA.items() :
-        if verify == 'Yet' :
-            parts = text.split()
-            title = f"{parts[2]} {parts[3]} / {parts[4]} / {parts[5]} / {parts[0]} {parts[1]}"
-            if title in picked :
-                continue
-            
-            yet_dict[text] = verify
+    for text in Server.GODPACK.INDEX.keys_with_state('Yet') :
+        title = Server.GODPACK.INDEX.title(text)
+        if title in picked :
+            continue
+        
+        yet_dict[text] = 'Yet'
 
 
     yet_list = [yet_str(text) for text, verify in yet_dict.items()]
     yet_list = sorted(yet_list, key=lambda s: (s.lower(), s))
     
     recent_good = set()
-    for text, verify in Server.GODPACK.DATA.items() :
-        if verify == 'Good' :
-            parts = text.split()
-            title = f"{parts[2]} {parts[3]} / {parts[4]} / {parts[5]} / {parts[0]} {parts[1]}"
-            
-            if title in picked :
-                continue
-            date = parts[0]
-            hour = parts[1]
-            
-            if Is_recent(date, hour, 2) :
-                recent_good.add(yet_str(text, "**"))
-            
-            elif Is_recent(date, hour, 4) :
-                recent_good.add(yet_str(text, "*"))
+    for text in Server.GODPACK.INDEX.keys_with_state('Good') :
+        title = Server.GODPACK.INDEX.title(text)
+        
+        if title in picked :
+            continue
+        parts = text.split()
+        date = parts[0]
+        hour = parts[1]
+        
+        if Is_recent(date, hour, 2) :
+            recent_good.add(yet_str(text, "**"))
+        
+        elif Is_recent(date, hour, 4) :
+            recent_good.add(yet_str(text, "*"))
                 
                 
     recent_good_list = sorted(recent_good)
@@ -1127,6 +1158,22 @@ async def custom(ctx):
     else:
         await ctx.send("축팩 및 미검증이 없습니다.")    
 
+@bot.command()
+async def history(ctx, name, number):
+    """아카이브된(보존 기간이 지난) 갓팩 기록 조회"""
+    Server = next((S for S in SERVER_DICT.values() if ctx.channel.id == S.COMMAND), None)
+    
+    if Server is None:
+        await ctx.send("해당 명령어는 명령어 채널에 해주세요.")
+        return
+    
+    archived = Server.GODPACK.ARCHIVE.query(name=name, number=number)
+    if archived :
+        history_list = [f"{convert_str(text)} | {state}" for text, state in sorted(archived.items())]
+        await safe_send(ctx, f"{name} {number} 아카이브 기록 {len(history_list)}\n" + "\n".join(history_list), True)
+    else :
+        await ctx.send(f"{name} {number} 의 아카이브 기록이 없습니다.")
+
 @bot.command()
 async def add(ctx, name, code):
     if str(ctx.author.id) in Admin.DATA:
@@ -1478,17 +1525,30 @@ async def main():
         asyncio.create_task(auto_shutdown(test_duration))
     
     asyncio.create_task(update_periodic())
+    # WRITE_BEHIND=true 일 때 파일 쓰기를 모아서 처리
+    GIST.start_flusher()
     
     for Server in SERVER_DICT.values() :
         asyncio.create_task(verify_periodic(Server))
-    async with bot:
-        await bot.start(DISCORD_TOKEN)
+        asyncio.create_task(archive_periodic(Server))
+    # BACKUP_INTERVAL(분) 이 있으면 로컬 파일 증분 백업 (SQLite 백엔드는 제외)
+    backup_interval = int(os.getenv('BACKUP_INTERVAL', '0'))
+    if backup_interval > 0 and hasattr(GIST, 'backup'):
+        asyncio.create_task(backup_periodic(backup_interval))
+    try:
+        async with bot:
+            await bot.start(DISCORD_TOKEN)
+    finally:
+        # 종료 시 남은 변경사항 기록
+        GIST.flush()
 
 async def auto_shutdown(duration):
     """테스트 모드에서 지정된 시간 후 봇을 종료"""
     await asyncio.sleep(duration)
     logger.info(f"[TEST MODE] Auto-shutdown after {duration} seconds")
     await bot.close()
+    # os._exit는 atexit/finally를 건너뛰므로 먼저 기록
+    GIST.flush()
     # 강제 종료를 위한 추가 조치
     os._exit(0)
 
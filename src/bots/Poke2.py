@@ -5,6 +5,7 @@ import json
 import os
 import re
 import shutil
+import threading
 import logging # 로깅 모듈 추가
 import random # Added import
 import glob # glob 모듈 임포트 추가
@@ -18,6 +19,15 @@ load_dotenv()
 
 # 프로젝트 모듈 import
 from ..modules.paths import DATA_DIR, ensure_directories
+from ..modules import Codec # JSON / msgpack 자동 판별
+from ..modules.HeartbeatStore import HeartbeatStore # 사용자별 추가 전용(JSONL) Heartbeat 기록
+from ..modules.HeartbeatRollup import HeartbeatRollup # 오래된 Heartbeat 시간/일별 요약
+from ..modules import HeartbeatParquet # 분석용 Parquet 저장소 (pyarrow 필요)
+from ..modules import StateSnapshot # 빠른 재시작용 상태 스냅샷
+from ..modules.ChannelCursor import ChannelCursors, RateBudget # 채널별 히스토리 커서 / 조회 속도 제한
+from ..modules.HeartbeatQueue import HeartbeatQueue, LIVE, BACKFILL # Heartbeat 일괄 처리 큐
+from ..modules import HeartbeatParser # Heartbeat 메시지 파서 (GIST.USER와 공용)
+from ..modules.StorageIO import storage_io # 파일 I/O 스레드 풀 (파일별 순서 보장)
 
 # --- 로깅 설정 ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s:%(levelname)s:%(message)s')
@@ -32,8 +42,19 @@ DISCORD_TOKEN = os.getenv('DISCORD_BOT_TOKEN') # 봇 토큰
 # 데이터 디렉토리 경로 정의
 HEARTBEAT_DATA_DIR = os.path.join(DATA_DIR, "heartbeat_data")
 USER_DATA_DIR = os.path.join(DATA_DIR, "user_data")
+HEARTBEAT_PARQUET_DIR = os.path.join(DATA_DIR, "heartbeat_parquet") # HEARTBEAT_PARQUET=true 일 때 분석용 사본
+STATE_SNAPSHOT_PATH = os.path.join(DATA_DIR, "poke2_state.json") # 최신 기록/프로필/스캔 기준 시각 스냅샷
+STATE_SNAPSHOT_INTERVAL = int(os.getenv('STATE_SNAPSHOT_INTERVAL', '300')) # 스냅샷 저장 주기 (초)
+CHANNEL_CURSOR_PATH = os.path.join(DATA_DIR, "heartbeat_cursors.json") # 채널별 마지막 처리 메시지 ID
+CATCHUP_CONCURRENCY = int(os.getenv('CATCHUP_CONCURRENCY', '2')) # 동시에 따라잡을 채널 수
+CATCHUP_PAGES_PER_SECOND = float(os.getenv('CATCHUP_PAGES_PER_SECOND', '2')) # 히스토리 조회 한도 (100개 단위 페이지, 전체 채널 합계)
+HEARTBEAT_QUEUE_WORKERS = int(os.getenv('HEARTBEAT_QUEUE_WORKERS', '2')) # Heartbeat 큐 작업자 수
+HEARTBEAT_QUEUE_SIZE = int(os.getenv('HEARTBEAT_QUEUE_SIZE', '1000')) # 실시간/따라잡기 각각의 최대 대기 수 (넘으면 넣는 쪽이 대기)
+HEARTBEAT_BATCH_SIZE = int(os.getenv('HEARTBEAT_BATCH_SIZE', '100')) # 한 번에 묶어 처리할 최대 메시지 수
+HEARTBEAT_BATCH_WAIT_MS = int(os.getenv('HEARTBEAT_BATCH_WAIT_MS', '50')) # 묶음을 채우려고 기다리는 시간 (밀리초)
 USER_INFO_SOURCE_URL = os.getenv('PASTEBIN_URL') # 사용자 정보 소스 URL
 TARGET_BARRACKS_DEFAULT = 170 # 기본 목표 배럭 정의
+PROFILE_FLUSH_INTERVAL = int(os.getenv('PROFILE_FLUSH_INTERVAL', '30')) # 변경된 프로필 일괄 저장 주기 (초)
 
 # 팩 선호도 기본 순서
 DEFAULT_PACK_ORDER = ["Buzzwole", "Solgaleo", "Lunala", "Shining", "Arceus", "Palkia", "Dialga", "Mew", "Pikachu", "Charizard", "Mewtwo"]
@@ -101,6 +122,28 @@ bot = commands.Bot(command_prefix="!", intents=intents) # Client -> Bot 변경,
 heartbeat_records = {}
 # 사용자 프로필 정보 (메모리): {user_name: User}
 user_profiles = {}
+# 프로필 색인: {discord_id: User}, {친구 코드: User} (index_user_profile로 갱신)
+profiles_by_discord_id = {}
+profiles_by_code = {}
+_profile_index_keys = {} # 사용자 이름 -> 색인에 올린 (discord_id, 친구 코드)
+# Heartbeat 기록 저장소 (heartbeat_data/<user>.jsonl)
+heartbeat_store = HeartbeatStore(HEARTBEAT_DATA_DIR)
+# 보존 기간이 지난 Heartbeat 요약 (heartbeat_data/rollup/<user>.json)
+heartbeat_rollup = HeartbeatRollup(heartbeat_store)
+# 분석용 Parquet 사본 (HEARTBEAT_PARQUET=true 이고 pyarrow가 있을 때만)
+heartbeat_parquet = None
+if os.getenv('HEARTBEAT_PARQUET', 'false').lower() == 'true':
+    if HeartbeatParquet.AVAILABLE:
+        heartbeat_parquet = HeartbeatParquet.HeartbeatParquet(HEARTBEAT_PARQUET_DIR)
+    else:
+        logging.warning("⚠️ HEARTBEAT_PARQUET=true 이지만 pyarrow가 없어 Parquet 기록을 건너뜁니다.")
+# 저장 대기 중인 변경된 프로필: {user_name: User} (aflush_user_profiles가 일괄 저장)
+dirty_profiles = {}
+# 채널별 커서 (히스토리 따라잡기가 끝난 채널만 실시간 메시지로 커서 전진)
+channel_cursors = ChannelCursors(CHANNEL_CURSOR_PATH)
+caught_up_channels = set()
+# Discord 핸들러 -> 저장 작업자 사이의 큐 (main()에서 생성)
+heartbeat_queue = None
 
 # 테스트 플래그
 test_flag = False # True로 설정 시 모든 등록 유저를 온라인으로 간주, False로 설정 시 온라인 유저만 감지
@@ -128,6 +171,19 @@ class User:
         self.custom_target_barracks: int | None = None # 사용자 지정 목표 배럭
         self.preferred_pack_order: list[str] | None = None # 사용자 지정 팩 선호도 순서
         self.graduated_packs: list[str] = [] # 졸업팩 목록 추가 (기본값 빈 리스트)
+        self._saved_hash: int | None = None # 마지막으로 저장/로드한 상태의 해시 (None이면 저장 필요)
+
+    def _state_hash(self, data=None):
+        """저장되는 필드 전체의 해시 (data가 있으면 그 to_dict() 결과의 해시)"""
+        return hash(json.dumps(self.to_dict() if data is None else data, sort_keys=True, ensure_ascii=False))
+
+    def is_dirty(self):
+        """마지막 저장 이후 바뀐 필드가 있는지"""
+        return self._saved_hash != self._state_hash()
+
+    def mark_clean(self, data=None):
+        """현재 상태(또는 실제로 저장한 to_dict() 결과)를 저장된 상태로 기록"""
+        self._saved_hash = self._state_hash(data)
 
     def update_from_heartbeat(self, heartbeat_data, source_group_name: str | None = None): # source_group_name 인자 추가
         """Heartbeat 데이터 및 소스 그룹 정보로 사용자 정보 업데이트"""
@@ -145,6 +201,7 @@ class User:
             self.code = code
         if discord_id:
             self.discord_id = discord_id
+        index_user_profile(self)
 
     def to_dict(self):
         """User 객체를 딕셔너리로 변환"""
@@ -202,6 +259,27 @@ class User:
 
         return user
 
+# --- 프로필 색인 ---
+def index_user_profile(user):
+    """discord_id/친구 코드 색인에 User 반영 (이전 값은 제거, 같은 값을 가진 사용자가 여럿이면 마지막 것)"""
+    old_discord_id, old_code = _profile_index_keys.pop(user.name, (None, None))
+    for index, old_key in ((profiles_by_discord_id, old_discord_id), (profiles_by_code, old_code)):
+        if old_key and getattr(index.get(old_key), "name", None) == user.name:
+            del index[old_key]
+    if user.discord_id:
+        profiles_by_discord_id[user.discord_id] = user
+    if user.code:
+        profiles_by_code[user.code] = user
+    _profile_index_keys[user.name] = (user.discord_id, user.code)
+
+def rebuild_profile_index():
+    """user_profiles 전체로 색인 다시 만들기 (프로필 일괄 로드 후)"""
+    profiles_by_discord_id.clear()
+    profiles_by_code.clear()
+    _profile_index_keys.clear()
+    for user in user_profiles.values():
+        index_user_profile(user)
+
 # --- 데이터 처리 함수 (공통) ---
 def sanitize_filename(name):
     """사용자 이름을 안전한 파일명으로 변환"""
@@ -223,24 +301,27 @@ def get_data_filepath(user_name, base_dir):
     return os.path.join(base_dir, f"{sanitize_filename(user_name)}.json")
 
 def read_json_file(filepath, data_type_name, user_name, default_value):
-    """JSON 파일 읽기 (오류 시 기본값 반환)"""
+    """JSON(또는 msgpack) 파일 읽기 (오류 시 기본값 반환)"""
     if not os.path.exists(filepath):
         return default_value
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
+        data, _ = Codec.read_file(filepath)
+        return data
+    except ValueError as e:
         logging.warning(f"⚠️ 사용자 '{user_name}' {data_type_name} 파일 JSON 디코딩 오류: {filepath}. 기본값 반환. Error: {e}")
         return default_value
     except OSError as e:
         logging.error(f"❌ 사용자 '{user_name}' {data_type_name} 파일 읽기 오류: {filepath}. Error: {e}", exc_info=True)
         return default_value
 
+# 루프(명령어 즉시 저장)와 storage_io 스레드(일괄 저장)가 같은 .tmp 파일을 동시에 쓰지 않도록
+_json_write_lock = threading.Lock()
+
 def write_json_file(filepath, data, data_type_name, user_name):
-    """JSON 파일 쓰기"""
+    """JSON 파일 쓰기 (기존 파일이 msgpack이면 msgpack 유지)"""
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        with _json_write_lock:
+            Codec.write_file(filepath, data, indent=4)
         return True
     except OSError as e:
         logging.error(f"❌ 사용자 '{user_name}' {data_type_name} 파일 쓰기 오류: {filepath}. Error: {e}", exc_info=True)
@@ -248,37 +329,27 @@ def write_json_file(filepath, data, data_type_name, user_name):
 
 # --- 데이터 처리 함수 (Heartbeat) ---
 def read_heartbeat_data(user_name):
-    """사용자 Heartbeat JSON 파일 읽기 (없거나 오류 시 빈 리스트 반환)"""
-    filepath = get_data_filepath(user_name, HEARTBEAT_DATA_DIR)
-    data = read_json_file(filepath, "Heartbeat", user_name, [])
-    if isinstance(data, list):
-        valid_data = [r for r in data if isinstance(r, dict) and 'timestamp' in r]
-        valid_data.sort(key=lambda x: x.get('timestamp', ''))
-        return valid_data
-    elif data: # 파일은 읽었으나 형식이 리스트가 아닐 때
-        logging.warning(f"⚠️ 사용자 '{user_name}' Heartbeat 파일 형식이 리스트가 아님: {filepath}. 빈 리스트 반환.")
-    return []
+    """사용자 Heartbeat 전체 기록 읽기 (시간순, 없으면 빈 리스트)"""
+    try:
+        return heartbeat_store.read(user_name)
+    except OSError as e:
+        logging.error(f"❌ 사용자 '{user_name}' Heartbeat 파일 읽기 오류: {e}", exc_info=True)
+        return []
 
 def write_heartbeat_data(user_name, data_list):
-    """사용자 Heartbeat 기록 리스트를 JSON 파일에 쓰기 (정렬 포함) 및 _last.json 업데이트"""
-    filepath = get_data_filepath(user_name, HEARTBEAT_DATA_DIR)
-    success = False
+    """사용자 Heartbeat 기록 전체를 다시 쓰기 (정렬/중복 제거 포함)"""
+    try:
+        return heartbeat_store.write(user_name, data_list)
+    except OSError as e:
+        logging.error(f"❌ 사용자 '{user_name}' Heartbeat 파일 쓰기 오류: {e}", exc_info=True)
+        return False
+
+def append_heartbeat_record(user_name, record):
+    """Heartbeat 기록 한 줄 추가 (이미 있는 timestamp면 False)"""
     try:
-        data_list.sort(key=lambda x: x.get('timestamp', '')) # 쓰기 전 정렬 보장
-        if write_json_file(filepath, data_list, "Heartbeat", user_name):
-            success = True
-            # --- _last.json 업데이트 로직 추가 ---
-            if data_list: # 데이터가 있을 경우에만 최신 기록 저장
-                latest_record = data_list[-1] # 정렬 후 마지막 요소가 최신
-                last_filepath = filepath.replace(".json", "_last.json")
-                last_data = {"latest_record": latest_record}
-                if not write_json_file(last_filepath, last_data, "최신 Heartbeat", user_name):
-                    logging.warning(f"⚠️ 사용자 '{user_name}'의 최신 Heartbeat 파일(_last.json) 쓰기 실패: {last_filepath}")
-                    # _last.json 쓰기 실패는 전체 작업 실패로 간주하지 않음 (선택적)
-            # --- _last.json 업데이트 로직 끝 ---
-        return success # 기본 파일 쓰기 성공 여부 반환
-    except Exception as e: # 정렬 중 오류 발생 가능성
-        logging.error(f"❌ 사용자 '{user_name}' Heartbeat 데이터 처리(정렬/쓰기) 중 오류: {e}", exc_info=True)
+        return heartbeat_store.append(user_name, record)
+    except OSError as e:
+        logging.error(f"❌ 사용자 '{user_name}' Heartbeat 기록 추가 오류: {e}", exc_info=True)
         return False
 
 # --- 데이터 처리 함수 (User Profile) ---
@@ -339,11 +410,12 @@ def read_user_profile(user_name):
 
         user = User.from_dict(data)
         if user:
-            # --- 파일 업데이트 (필요한 경우) ---
+            # --- 파일 업데이트 (필요한 경우, 로드 중에는 쓰지 않고 다음 일괄 저장에 맡김) ---
             if needs_update:
-                logging.info(f"  💾 사용자 '{user_name}' 프로필 파일 업데이트 (필요한 기본값 추가/수정됨).")
-                if not write_user_profile(user):
-                    logging.warning(f"⚠️ 사용자 '{user_name}' 프로필 파일 업데이트 실패: {filepath}")
+                logging.info(f"  💾 사용자 '{user_name}' 프로필 기본값 추가/수정됨. 다음 일괄 저장 때 기록합니다.")
+                queue_user_profile(user)
+            else:
+                user.mark_clean()
             # --- 파일 업데이트 끝 ---
             return user
         else:
@@ -356,7 +428,81 @@ def write_user_profile(user):
         logging.warning("❌ 잘못된 User 객체 전달됨. 쓰기 작업 건너뜀.")
         return False
     filepath = get_data_filepath(user.name, USER_DATA_DIR)
-    return write_json_file(filepath, user.to_dict(), "프로필", user.name)
+    if not write_json_file(filepath, user.to_dict(), "프로필", user.name):
+        return False
+    user.mark_clean()
+    dirty_profiles.pop(user.name, None)
+    return True
+
+def queue_user_profile(user):
+    """바뀐 프로필만 다음 일괄 저장 대상으로 등록 (바뀐 것이 없으면 False)"""
+    if not user.is_dirty():
+        return False
+    dirty_profiles[user.name] = user
+    return True
+
+def _write_profiles(pending):
+    """(경로, 데이터, 이름) 목록 쓰기 -> 성공 여부 목록 (storage_io 스레드에서)"""
+    return [write_json_file(filepath, data, "프로필", name) for filepath, data, name in pending]
+
+async def aflush_user_profiles():
+    """저장 대기 중인 프로필 일괄 저장 -> 저장한 수 (복사본은 루프에서, 파일 쓰기는 storage_io에서)
+    쓰는 동안 다시 바뀌었거나 저장에 실패한 프로필은 dirty로 남아 다음 주기에 저장됩니다.
+    """
+    users = []
+    for user in list(dirty_profiles.values()):
+        if user.is_dirty():
+            users.append(user)
+        else:
+            dirty_profiles.pop(user.name, None)
+    if not users:
+        return 0
+    pending = [(get_data_filepath(user.name, USER_DATA_DIR), user.to_dict(), user.name) for user in users]
+    results = await storage_io.run(('profiles', USER_DATA_DIR), _write_profiles, pending)
+    written = 0
+    for user, (_, data, _), ok in zip(users, pending, results):
+        if not ok:
+            continue
+        written += 1
+        user.mark_clean(data)
+        if not user.is_dirty():
+            dirty_profiles.pop(user.name, None)
+    return written
+
+async def heartbeat_retention_periodic(interval_hours=6):
+    """보존 기간이 지난 Heartbeat 원본을 시간/일별 요약으로 옮기기 (사용자별로 큐 작업자의 추가와 같은 순서로 스레드에서)"""
+    await initialization_complete.wait()
+    while True:
+        moved_users = moved_records = 0
+        for user_name in heartbeat_store.users():
+            try:
+                count = await storage_io.run(('heartbeat', user_name), heartbeat_rollup.roll_up, user_name)
+            except (OSError, ValueError) as e:
+                logging.error(f"❌ Heartbeat 요약 실패 ({user_name}): {e}")
+                count = 0
+            if count:
+                moved_users += 1
+                moved_records += count
+        if moved_records:
+            logging.info(f"🗜️ Heartbeat 요약 완료: {moved_users}명, 원본 {moved_records}개 정리")
+        if heartbeat_parquet:
+            try:
+                heartbeat_parquet.flush()
+                heartbeat_parquet.compact() # 파티션마다 쌓인 작은 파일 합치기
+            except (OSError, ValueError) as e:
+                logging.error(f"❌ Heartbeat Parquet 정리 실패: {e}", exc_info=True)
+        await asyncio.sleep(interval_hours * 3600)
+
+async def flush_profiles_periodic():
+    """PROFILE_FLUSH_INTERVAL초마다 변경된 프로필 저장"""
+    while True:
+        await asyncio.sleep(PROFILE_FLUSH_INTERVAL)
+        try:
+            written = await aflush_user_profiles()
+            if written:
+                logging.info(f"💾 변경된 사용자 프로필 {written}개 저장")
+        except Exception as e:
+            logging.error(f"❌ 사용자 프로필 일괄 저장 중 오류: {e}", exc_info=True)
 
 # --- 데이터 로딩 함수 (공통) ---
 def load_all_data(data_dir, data_type_name, read_func, target_dict):
@@ -420,14 +566,16 @@ async def update_user_profiles_from_source():
                     if name and code and discord_id:
                         # 메모리에 있는 User 객체 찾기
                         user_profile = user_profiles.get(name)
+                        code_owner = profiles_by_code.get(code)
+                        if code_owner and code_owner.name != name:
+                            logging.warning(f"⚠️ 친구 코드 {code}가 '{code_owner.name}'와 '{name}'에 중복 등록되어 있습니다.")
                         if user_profile:
                             # 변경 사항 확인 후 업데이트 및 저장
                             if user_profile.discord_id != discord_id or user_profile.code != code:
                                 user_profile.update_identity(code=code, discord_id=discord_id)
-                                if write_user_profile(user_profile):
+                                if queue_user_profile(user_profile): # 다음 일괄 저장 때 기록
                                     # logging.debug(f"  🔄 사용자 정보 업데이트됨: {name} (ID: {discord_id}, Code: {code})")
                                     updated_count += 1
-                                # else: 실패 시 write_user_profile에서 에러 로그 기록
                         # else:
                             # logging.debug(f"  ❓ 소스에 있으나 프로필 없는 사용자: {name} (Heartbeat 기록이 먼저 필요할 수 있음)")
                             # 필요 시 여기서 새 User 생성 가능
@@ -449,104 +597,198 @@ async def update_user_profiles_from_source():
     except Exception as e:
         logging.error(f"❌ 사용자 정보 소스 처리 중 예상치 못한 오류 발생: {e}", exc_info=True)
 
-# --- Heartbeat 메시지 파싱 ---
-def parse_heartbeat_message(content):
-    """메시지 내용에서 heartbeat 정보 추출"""
-    data = {'barracks': 0, 'version': 'Unknown', 'type': 'Unknown', 'select': 'Unknown'}
-    online_line = next((line.strip() for line in content.splitlines() if line.strip().lower().startswith("online:")), None)
-    if online_line:
-        # "Online:" 다음의 숫자들을 찾음 (쉼표 포함 가능성 고려)
-        numbers_str = online_line.split(":", 1)[1].strip()
-        # 쉼표 제거 후 공백 기준으로 분리하여 숫자만 추출
-        numbers_in_line = [num for num in re.findall(r'\b\d+\b', numbers_str)]
-        data['barracks'] = len(numbers_in_line)
-
-    version_match = re.search(r"^Version:\s*(.*?)\s*$", content, re.MULTILINE | re.IGNORECASE)
-    if version_match: data['version'] = version_match.group(1).strip()
-    type_match = re.search(r"^Type:\s*(.*?)\s*$", content, re.MULTILINE | re.IGNORECASE)
-    if type_match: data['type'] = type_match.group(1).strip()
-
-    # --- Select/Opening 파싱 로직 수정 ---
-    select_match = re.search(r"^Select:\s*(.*?)\s*$", content, re.MULTILINE | re.IGNORECASE)
-    opening_match = re.search(r"^Opening:\s*(.*?)\s*$", content, re.MULTILINE | re.IGNORECASE)
-
-    select_value = select_match.group(1).strip() if select_match else None
-    opening_value = opening_match.group(1).strip() if opening_match else None
-
-    if select_value and opening_value:
-        # 둘 다 있으면 더 긴 값을 선택
-        data['select'] = opening_value if len(opening_value) >= len(select_value) else select_value
-        logging.debug(f"Heartbeat 파싱: Select와 Opening 모두 발견. 더 긴 값 선택: '{data['select']}'")
-    elif opening_value:
-        # Opening만 있으면 Opening 값 사용
-        data['select'] = opening_value
-    elif select_value:
-        # Select만 있으면 Select 값 사용
-        data['select'] = select_value
-    # 둘 다 없으면 기본값 'Unknown' 유지
-    # --- 파싱 로직 수정 끝 ---
-
-    return data
-
-async def process_heartbeat_message(message, channel_id_str, channel_name):
-    """Heartbeat 메시지 처리 (Heartbeat 기록 및 User 프로필 업데이트)"""
-    if "Online:" not in message.content: return False
-
-    user_name = "Unknown User"
-    try:
-        user_name = message.content.split("\n")[0].strip()
-        if not user_name:
-            # logging.debug(f"⚠️ [{channel_name}] 사용자 이름 없는 메시지 건너뜀: {message.content[:50]}...")
-            return False
-
-        timestamp_dt = message.created_at.replace(tzinfo=timezone.utc)
-        timestamp_iso = timestamp_dt.isoformat()
-
-        # --- 1. Heartbeat 기록 처리 ---
-        parsed_heartbeat_data = parse_heartbeat_message(message.content)
-        # 그룹 이름 추출 ("Group7-Heartbeat" -> "Group7" 또는 채널 이름 그대로)
-        simple_group_name = channel_name.split('-')[0] if '-' in channel_name else channel_name
-
-        heartbeat_record_specific = {
-            "timestamp": timestamp_iso,
-            "source_group": simple_group_name, # 소스 그룹 정보 추가
-            **parsed_heartbeat_data
-        }
+# --- Heartbeat 메시지 처리 ---
+def build_heartbeat_item(message, channel_name):
+    """Heartbeat 메시지 -> (사용자 이름, 기록) (Heartbeat가 아니면 None)"""
+    if "Online:" not in message.content: return None
+    heartbeat = HeartbeatParser.parse(message.content)
+    user_name = heartbeat.user_name
+    if not user_name:
+        return None
+    timestamp_iso = message.created_at.replace(tzinfo=timezone.utc).isoformat()
+    # 그룹 이름 추출 ("Group7-Heartbeat" -> "Group7" 또는 채널 이름 그대로)
+    simple_group_name = channel_name.split('-')[0] if '-' in channel_name else channel_name
+    record = {
+        "timestamp": timestamp_iso,
+        "source_group": simple_group_name, # 소스 그룹 정보 추가
+        **HeartbeatParser.to_record(heartbeat)
+    }
+    return user_name, record
 
-        heartbeat_data_list = read_heartbeat_data(user_name)
-
-        if any(record.get('timestamp') == timestamp_iso for record in heartbeat_data_list):
-            return False
-
-        heartbeat_data_list.append(heartbeat_record_specific)
-        heartbeat_saved = False
-        if write_heartbeat_data(user_name, heartbeat_data_list):
-            # 메모리(heartbeat_records) 업데이트 시에도 source_group 포함
-            heartbeat_records[user_name] = {
-                "latest_record": heartbeat_record_specific,
-                 # "source_group": simple_group_name # 최신 그룹 정보 저장 (check_heartbeat_status에서 사용) - heartbeat_records 로딩 시 처리되므로 중복 저장 불필요
-            }
-            heartbeat_saved = True
-
-        # --- 2. User 프로필 업데이트 ---
-        user_profile = user_profiles.get(user_name)
-        if not user_profile:
-            user_profile = read_user_profile(user_name)
+async def store_heartbeat_batch(items):
+    """큐 작업자가 꺼낸 묶음 처리 - 사용자별로 모아 한 번씩 기록 추가 및 프로필 업데이트 -> 신규 기록 수
+    파일 쓰기는 storage_io 스레드에서 사용자별 순서대로 실행하고, 메모리/프로필 갱신은 이벤트 루프에서 합니다.
+    기록 저장에 실패한 사용자가 있으면 예외를 올려 묶음 전체를 실패로 표시합니다 (커서가 넘어가지 않음).
+    """
+    by_user = {}
+    for item in items:
+        user_name, record = item.payload
+        by_user.setdefault(user_name, []).append(record)
+
+    results = await asyncio.gather(*(storage_io.run(('heartbeat', sanitize_filename(user_name)),
+                                                    heartbeat_store.append_many, user_name, records)
+                                     for user_name, records in by_user.items()), return_exceptions=True)
+    stored = 0
+    failed = []
+    for (user_name, records), added in zip(by_user.items(), results):
+        # --- 1. Heartbeat 기록 처리 (중복 timestamp 제외, 파일 쓰기 한 번) ---
+        if isinstance(added, Exception):
+            logging.error(f"❌ Heartbeat 기록 저장 실패: {added} | 사용자: {user_name} ({len(records)}개)",
+                          exc_info=added)
+            failed.append(user_name)
+            continue
+        if not added:
+            continue
+        stored += len(added)
+        try:
+            latest_record = heartbeat_store.latest(user_name)
+            heartbeat_records[user_name] = {"latest_record": latest_record}
+            if heartbeat_parquet:
+                for record in added:
+                    heartbeat_parquet.add(user_name, record)
+
+            # --- 2. User 프로필 업데이트 (사용자의 가장 최신 기록일 때만) ---
+            newest = max(added, key=lambda r: r['timestamp'])
+            if latest_record and newest['timestamp'] < latest_record.get('timestamp', ''):
+                continue # 이미 더 최신 기록이 있음 (오래된 backfill) - 프로필을 되돌리지 않음
+            user_profile = user_profiles.get(user_name)
             if not user_profile:
-                user_profile = User(user_name)
-                logging.info(f"✨ 신규 사용자 프로필 생성: {user_name}")
+                user_profile = read_user_profile(user_name)
+                if not user_profile:
+                    user_profile = User(user_name)
+                    logging.info(f"✨ 신규 사용자 프로필 생성: {user_name}")
+            user_profile.update_from_heartbeat(newest, newest["source_group"])
+            if user_profiles.get(user_name) is not user_profile:
+                user_profiles[user_name] = user_profile
+                index_user_profile(user_profile)
+            queue_user_profile(user_profile) # 실제로 바뀐 경우에만 다음 일괄 저장 때 기록
+        except Exception as e:
+            # 기록은 이미 저장됨 - 프로필 오류로 커서를 막지 않음
+            logging.error(f"❌ Heartbeat 프로필 처리 중 예외 발생: {e} | 사용자: {user_name}", exc_info=True)
+    if failed:
+        raise RuntimeError(f"Heartbeat 기록 저장 실패 {len(failed)}명 (신규 {stored}개는 저장됨): {', '.join(failed)}")
+    return stored
+
+def advance_heartbeat_cursors(items):
+    """묶음 처리 후 채널 커서를 빠짐없이 처리된 위치까지 전진
+    따라잡는 중인 채널은 실시간 메시지 위치로 커서를 건너뛰지 않도록 따라잡기 위치만 사용
+    """
+    for channel_id in {item.channel_id for item in items}:
+        position = heartbeat_queue.position(channel_id, include_live=channel_id in caught_up_channels)
+        if position:
+            channel_cursors.advance(channel_id, position)
+
+# --- 채널 히스토리 따라잡기 ---
+async def catch_up_channel(config, fallback_after, semaphore, budget):
+    """채널 커서 이후 메시지를 모두 큐에 넣고 처리될 때까지 대기 -> (스캔 수, 큐에 넣은 수)
+    커서가 없으면 저장된 최신 Heartbeat 시각(없으면 최근 1시간)부터 읽습니다.
+    큐가 차면 put()이 기다리므로 조회 속도가 처리 속도에 맞춰집니다.
+    """
+    group_name = config.get("NAME", "Unnamed Group")
+    channel_id = config.get("HEARTBEAT_ID")
+    scanned = queued = 0
+    last_message_id = None
+    async with semaphore:
+        try:
+            channel = await bot.fetch_channel(channel_id)
+            cursor = channel_cursors.get(channel_id)
+            if cursor:
+                after = discord.Object(id=cursor)
+                logging.info(f"  채널 스캔 중: {group_name} ({channel_id}) - 메시지 {cursor} 이후부터")
+            else:
+                after = fallback_after or datetime.now(timezone.utc) - timedelta(hours=1)
+                logging.info(f"  채널 스캔 중: {group_name} ({channel_id}) - 커서 없음, {after.strftime('%Y-%m-%d %H:%M:%S %Z')} 이후부터")
+
+            async for message in channel.history(limit=None, after=after, oldest_first=True):
+                if scanned % 100 == 0: # discord.py는 100개 단위로 페이지를 가져옴
+                    await budget.acquire()
+                scanned += 1
+                last_message_id = message.id
+                item = build_heartbeat_item(message, group_name)
+                if item: # 커서는 처리된 뒤 advance_heartbeat_cursors가 전진 (중단되면 거기부터 이어서)
+                    await heartbeat_queue.put(channel_id, message.id, item, BACKFILL)
+                    queued += 1
+                if scanned % 2000 == 0:
+                    logging.info(f"    [{group_name}] {scanned}개 메시지 스캔됨... ({heartbeat_queue.summary()})")
+            await heartbeat_queue.wait_channel(channel_id)
+            if last_message_id: # 끝의 Heartbeat가 아닌 메시지까지 (실패한 묶음이 있으면 그 앞까지만)
+                channel_cursors.advance(channel_id, heartbeat_queue.scanned_position(channel_id, last_message_id))
+            caught_up_channels.add(channel_id)
+            logging.info(f"    [{group_name}] 스캔 완료 ({scanned}개 스캔, {queued}개 처리).")
+        except Exception as e:
+            logging.error(f"❌ 채널 '{group_name}' 스캔 중 예상치 못한 오류 발생: {e}", exc_info=True)
+    return scanned, queued
 
-        # Heartbeat 데이터와 그룹 정보로 User 객체 업데이트
-        user_profile.update_from_heartbeat(parsed_heartbeat_data, simple_group_name) # simple_group_name 전달
+# --- 상태 스냅샷 (빠른 재시작) ---
+def parse_utc_timestamp(ts_str):
+    """ISO 문자열 -> UTC datetime (형식 오류면 None)"""
+    try:
+        ts = datetime.fromisoformat(ts_str.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+async def asave_state_snapshot():
+    """최신 기록/중복 확인 창/프로필/스캔 기준 시각을 파일 하나로 저장 (상태 복사는 루프에서, 직렬화/파일 쓰기는 storage_io에서)"""
+    await aflush_user_profiles() # 스냅샷의 프로필이 파일보다 앞서지 않도록
+    state = {
+        "heartbeat": heartbeat_store.snapshot(),
+        "profiles": {name: profile.to_dict() for name, profile in user_profiles.items()},
+        "scan_cursor": heartbeat_store.high_water_mark(),
+    }
+    await storage_io.run(STATE_SNAPSHOT_PATH, StateSnapshot.save, STATE_SNAPSHOT_PATH, state)
 
-        user_profiles[user_name] = user_profile
-        write_user_profile(user_profile)
+def load_state_snapshot():
+    """스냅샷 + 스냅샷 이후 바뀐 파일로 메모리 채우기 -> 스캔 기준 시각 (스냅샷을 못 쓰면 False)"""
+    state = StateSnapshot.load(STATE_SNAPSHOT_PATH)
+    if state is None:
+        return False
+    saved_at = state["saved_at"]
+
+    # Heartbeat: 바뀐(또는 스냅샷에 없는) 파일만 끝부분을 다시 읽음
+    snapshot_heartbeat = state.get("heartbeat", {})
+    hb_files, hb_changed = StateSnapshot.changed_since(HEARTBEAT_DATA_DIR, ".jsonl", saved_at)
+    known = {sanitize_filename(name) for name in snapshot_heartbeat}
+    reread = hb_changed | (hb_files - known)
+    skipped = reread | (known - hb_files)
+    heartbeat_store.restore(snapshot_heartbeat, skip=skipped)
+    restored = [name for name in snapshot_heartbeat if sanitize_filename(name) not in skipped]
+    for user_name in restored + [heartbeat_store.display_name(filename) for filename in sorted(reread)]:
+        latest_record = heartbeat_store.latest(user_name)
+        if latest_record:
+            heartbeat_records[user_name] = {"latest_record": latest_record}
+
+    # 프로필: 바뀐 파일은 다시 읽고, 파일이 없어진 프로필은 버림
+    profile_files, profile_changed = StateSnapshot.changed_since(USER_DATA_DIR, ".json", saved_at)
+    restored_profiles = 0
+    for data in state.get("profiles", {}).values():
+        user = User.from_dict(data)
+        if not user:
+            continue
+        filename = sanitize_filename(user.name)
+        if filename in profile_files and filename not in profile_changed:
+            user.mark_clean()
+            user_profiles[user.name] = user
+            restored_profiles += 1
+    restored_names = {sanitize_filename(name) for name in user_profiles}
+    for filename in profile_changed | (profile_files - restored_names):
+        user = read_user_profile(filename)
+        if user:
+            user_profiles[user.name] = user
 
-        return heartbeat_saved
+    logging.info(f"⚡ 상태 스냅샷 로드: Heartbeat {len(heartbeat_records)}명 (다시 읽음 {len(reread)}), "
+                 f"프로필 {len(user_profiles)}명 (다시 읽음 {len(user_profiles) - restored_profiles})")
+    return state.get("scan_cursor")
 
-    except Exception as e:
-        logging.error(f"❌ [{channel_name}] Heartbeat 처리 중 예외 발생: {e} | 사용자: {user_name} | 메시지: {message.content[:100]}...", exc_info=True)
-        return False
+async def state_snapshot_periodic():
+    """STATE_SNAPSHOT_INTERVAL초마다 상태 스냅샷 저장 (초기화 완료 후)"""
+    await initialization_complete.wait()
+    while True:
+        try:
+            await asave_state_snapshot()
+        except (OSError, TypeError, ValueError) as e:
+            logging.error(f"❌ 상태 스냅샷 저장 실패: {e}", exc_info=True)
+        await asyncio.sleep(STATE_SNAPSHOT_INTERVAL)
 
 # --- 이벤트 핸들러 및 주기적 작업 ---
 
@@ -554,90 +796,44 @@ async def perform_initial_setup():
     """시간이 오래 걸리는 초기화 작업을 수행하는 함수 (백그라운드 실행)"""
     logging.info("--- 초기화 시작 (백그라운드) ---")
     global heartbeat_records, user_profiles
-    # 1. 데이터 로딩
-    load_all_data(HEARTBEAT_DATA_DIR, "Heartbeat", read_heartbeat_data, heartbeat_records)
-    load_all_data(USER_DATA_DIR, "사용자 프로필", read_user_profile, user_profiles)
-
-    # 2. 최신 타임스탬프 스캔 (여전히 시간이 걸릴 수 있으므로 주의)
-    logging.info("🔍 최신 Heartbeat 타임스탬프 찾는 중 (_last.json 파일 스캔)...")
-    overall_latest_timestamp = None
-    last_files = glob.glob(os.path.join(HEARTBEAT_DATA_DIR, "*_last.json"))
-    logging.info(f"  발견된 _last.json 파일 수: {len(last_files)}")
-
-    processed_files = 0
-    for last_file in last_files:
-        processed_files += 1
-        if processed_files % 500 == 0: # 많은 파일 처리 시 로그 출력
-             logging.info(f"  {processed_files}/{len(last_files)} 개의 _last.json 파일 처리 중...")
-        try:
-            with open(last_file, 'r', encoding='utf-8') as f:
-                last_data = json.load(f)
-                if "latest_record" in last_data and "timestamp" in last_data["latest_record"]:
-                    ts_str = last_data["latest_record"]["timestamp"]
-                    try:
-                        ts = datetime.fromisoformat(ts_str.replace('Z', '+00:00'))
-                        if ts.tzinfo is None: ts = ts.replace(tzinfo=timezone.utc)
-
-                        if overall_latest_timestamp is None or ts > overall_latest_timestamp:
-                            overall_latest_timestamp = ts
-                    except ValueError:
-                        logging.warning(f"⚠️ 파일 '{os.path.basename(last_file)}'의 잘못된 타임스탬프 형식 발견: {ts_str}")
-        except json.JSONDecodeError:
-            logging.warning(f"⚠️ 파일 '{os.path.basename(last_file)}' 읽기/파싱 오류 (JSON 형식 오류)")
-        except IOError as e:
-            logging.warning(f"⚠️ 파일 '{os.path.basename(last_file)}' 읽기 오류: {e}")
-        except Exception as e:
-             logging.error(f"❌ _last.json 파일 처리 중 예상치 못한 오류 ({os.path.basename(last_file)}): {e}")
+    # 1. 데이터 로딩 (스냅샷이 있으면 스냅샷 + 이후 바뀐 파일만, 없으면 전체)
+    ensure_data_dir(HEARTBEAT_DATA_DIR, "Heartbeat")
+    ensure_data_dir(USER_DATA_DIR, "사용자 프로필")
+    snapshot_cursor = load_state_snapshot()
+    if snapshot_cursor is False:
+        logging.info(f"💾 Heartbeat 최신 기록 로드 시작: {HEARTBEAT_DATA_DIR}")
+        latest_by_user = heartbeat_store.load_latest() # 각 파일 끝부분만 읽음
+        for user_name, latest_record in latest_by_user.items():
+            heartbeat_records[user_name] = {"latest_record": latest_record}
+        logging.info(f"✅ Heartbeat 데이터 로드 완료: {len(latest_by_user)}명")
+        load_all_data(USER_DATA_DIR, "사용자 프로필", read_user_profile, user_profiles)
+    rebuild_profile_index() # discord_id/친구 코드 색인 (스냅샷/전체 로드 공통)
+
+    # 2. 최신 타임스탬프 (저장소의 사용자별 최신 기록 중 최댓값)
+    overall_latest_timestamp = parse_utc_timestamp(snapshot_cursor) if snapshot_cursor else None
+    high_water_mark = heartbeat_store.high_water_mark()
+    ts = parse_utc_timestamp(high_water_mark)
+    if high_water_mark and ts is None:
+        logging.warning(f"⚠️ 잘못된 타임스탬프 형식 발견: {high_water_mark}")
+    elif ts and (overall_latest_timestamp is None or ts > overall_latest_timestamp):
+        overall_latest_timestamp = ts
 
     if overall_latest_timestamp:
         logging.info(f"📊 전체 사용자 중 가장 최신 Heartbeat 타임스탬프: {overall_latest_timestamp.strftime('%Y-%m-%d %H:%M:%S %Z')}")
     else:
         logging.info("📊 기록된 최신 Heartbeat 타임스탬프를 찾지 못했습니다. (모든 메시지를 스캔할 수 있음)")
 
-    # 3. 채널 히스토리 스캔 (가장 시간이 많이 걸리는 부분, 최적화 필요)
+    # 3. 채널 히스토리 따라잡기 (채널별 커서 이후 전부, 채널 동시 진행)
     logging.info("📡 감시 채널 스캔 시작 (백그라운드)...")
-    total_scanned = 0
-    history_processed_count = 0
-
-    # 채널별 스캔 시작 (overall_latest_timestamp 사용)
-    for config in GROUP_CONFIGS:
-        group_name = config.get("NAME", "Unnamed Group")
-        channel_id = config.get("HEARTBEAT_ID")
-        if channel_id:
-            logging.info(f"  채널 스캔 중: {group_name} ({channel_id})...")
-            channel_processed_count = 0
-            channel_scanned = 0
-            try:
-                channel = await bot.fetch_channel(channel_id)
-                # overall_latest_timestamp가 있으면 그 이후만, 없으면 최근 10000개 (또는 전체)
-                scan_after_timestamp = overall_latest_timestamp
-                # 만약 저장된 최신 타임스탬프가 없거나, 너무 오래된 경우 (예: 1시간 이전)에는 최근 1시간만 조회
-                if scan_after_timestamp is None or (datetime.now(timezone.utc) - scan_after_timestamp) > timedelta(hours=1):
-                    scan_after_timestamp = datetime.now(timezone.utc) - timedelta(hours=1)
-                    logging.info(f"    최신 타임스탬프가 없거나 1시간 이상 경과되어, 최근 1시간({scan_after_timestamp.strftime('%Y-%m-%d %H:%M:%S %Z')})부터 스캔합니다.")
-
-                # !!! 중요: limit=None은 매우 많은 메시지를 가져올 수 있어 시간이 오래 걸리고 API 제한에 걸릴 수 있습니다. !!!
-                # 실제 운영 시에는 limit을 설정하거나 (예: limit=5000)
-                # 또는 더 짧은 시간 범위(예: timedelta(minutes=30))로 제한하는 것이 좋습니다.
-                history_iterator = channel.history(limit=None, after=scan_after_timestamp, oldest_first=True)
-
-                async for message in history_iterator:
-                    channel_scanned += 1
-                    total_scanned += 1
-                    if await process_heartbeat_message(message, str(channel_id), group_name):
-                        channel_processed_count += 1
-                        history_processed_count += 1
-                    if channel_scanned % 2000 == 0:
-                        logging.info(f"    [{group_name}] {channel_scanned}개 메시지 스캔됨...")
-
-                logging.info(f"    [{group_name}] 스캔 완료 ({channel_scanned}개 스캔, {channel_processed_count}개 신규 처리).")
-                initial_scan_complete_event.set() # 스캔 완료 이벤트는 여기서 설정 (기존 위치)
-
-            except Exception as e:
-                logging.error(f"❌ 채널 '{group_name}' 스캔 중 예상치 못한 오류 발생: {e}")
-                import traceback
-                traceback.print_exc() # 상세 오류 출력
-
+    semaphore = asyncio.Semaphore(CATCHUP_CONCURRENCY)
+    budget = RateBudget(CATCHUP_PAGES_PER_SECOND)
+    stored_before = heartbeat_queue.stats["stored"]
+    results = await asyncio.gather(*(catch_up_channel(config, overall_latest_timestamp, semaphore, budget)
+                                     for config in GROUP_CONFIGS if config.get("HEARTBEAT_ID")))
+    channel_cursors.save()
+    initial_scan_complete_event.set()
+    total_scanned = sum(scanned for scanned, _ in results)
+    history_processed_count = heartbeat_queue.stats["stored"] - stored_before # 같은 기간의 실시간 메시지 포함
     logging.info(f"📡 전체 채널 스캔 완료 (총 {total_scanned}개 스캔, {history_processed_count}개 신규 처리).")
 
     # 4. Pastebin 업데이트
@@ -705,12 +901,10 @@ async def on_message(message):
             target_user_profile: User | None = None
             target_user_name = "Unknown"
 
-            # 메모리에서 사용자 찾기
-            for user_name, profile in user_profiles.items():
-                if profile.discord_id == author_id_str:
-                    target_user_profile = profile
-                    target_user_name = user_name
-                    break
+            # 메모리에서 사용자 찾기 (discord_id 색인)
+            target_user_profile = profiles_by_discord_id.get(author_id_str)
+            if target_user_profile:
+                target_user_name = target_user_profile.name
 
             if target_user_profile:
                 current_custom_target = target_user_profile.custom_target_barracks
@@ -766,11 +960,9 @@ async def on_message(message):
             target_user_profile: User | None = None
             target_user_name = "Unknown User"
 
-            for user_name, profile in user_profiles.items():
-                if profile.discord_id == discord_id_str:
-                    target_user_profile = profile
-                    target_user_name = user_name
-                    break
+            target_user_profile = profiles_by_discord_id.get(discord_id_str)
+            if target_user_profile:
+                target_user_name = target_user_profile.name
 
             if target_user_profile:
                 logging.info(f"  - 사용자 프로필 찾음: {target_user_name}")
@@ -818,10 +1010,11 @@ async def on_message(message):
         # Heartbeat 채널 확인 (기존 로직과 유사)
         heartbeat_channel_id = config.get("HEARTBEAT_ID")
         if heartbeat_channel_id and channel_id == heartbeat_channel_id:
-            channel_id_str = str(channel_id)
             channel_name_for_log = f"{group_name}-Heartbeat" # 로그용 채널 이름
             # logging.info(f"Processing Heartbeat for {group_name}...") # 디버깅 로그 필요 시
-            await process_heartbeat_message(message, channel_id_str, channel_name_for_log)
+            item = build_heartbeat_item(message, channel_name_for_log)
+            if item: # 저장/프로필 업데이트/커서 전진은 큐 작업자가 묶어서 처리
+                await heartbeat_queue.put(channel_id, message.id, item, LIVE)
             return # 메시지 처리가 완료되었으므로 루프 종료
 
         # GP 결과 감지 채널 확인 (신규 추가)
@@ -1419,6 +1612,18 @@ async def check_heartbeat_status():
         await optimize_and_apply_lists(initial_map, current_online_profiles)
 
         print("--- 사용자 상태 확인 및 목록 업데이트 완료 ---")
+
+        # 순서가 뒤바뀐 Heartbeat 파일 정리 (대상이 있을 때만)
+        logging.info(f"📥 Heartbeat 큐: {heartbeat_queue.summary()}")
+        channel_cursors.save() # 실시간 메시지로 전진한 커서 저장
+        compacted = await storage_io.run(('heartbeat', 'compact'), heartbeat_store.compact) # 파일별 잠금은 저장소가 관리
+        if compacted:
+            logging.info(f"🧹 Heartbeat 파일 {compacted}개 정렬/정리 완료")
+        if heartbeat_parquet:
+            try:
+                heartbeat_parquet.flush()
+            except (OSError, ValueError) as e:
+                logging.error(f"❌ Heartbeat Parquet 기록 실패: {e}", exc_info=True)
         await asyncio.sleep(60)
 
 # ... (GP 관련 함수들 복구 - parse_godpack_message, post_gp_result, process_gp_result_message)
@@ -1589,14 +1794,36 @@ async def main():
     """메인 실행 함수"""
     # 필요한 디렉토리 생성
     ensure_directories("heartbeat_data", "user_data", "raw")
-    
+    global heartbeat_queue
+    heartbeat_queue = HeartbeatQueue(store_heartbeat_batch, workers=HEARTBEAT_QUEUE_WORKERS,
+                                     maxsize=HEARTBEAT_QUEUE_SIZE, batch_size=HEARTBEAT_BATCH_SIZE,
+                                     batch_wait=HEARTBEAT_BATCH_WAIT_MS / 1000,
+                                     after_batch=advance_heartbeat_cursors)
+    heartbeat_queue.start()
+
     try:
         async with bot:
             bot.loop.create_task(check_heartbeat_status())
+            bot.loop.create_task(flush_profiles_periodic())
+            bot.loop.create_task(heartbeat_retention_periodic())
+            bot.loop.create_task(state_snapshot_periodic())
             await bot.start(DISCORD_TOKEN)
     except Exception as e:
         logging.critical(f"봇 실행 중 치명적인 오류 발생: {e}", exc_info=True)
     finally:
+        try:
+            await asyncio.wait_for(heartbeat_queue.stop(), timeout=30) # 큐에 남은 Heartbeat 먼저 저장
+        except asyncio.TimeoutError:
+            logging.warning(f"⚠️ Heartbeat 큐를 다 비우지 못하고 종료합니다: {heartbeat_queue.summary()}")
+            await heartbeat_queue.stop(drain=False)
+        written = await aflush_user_profiles() # 남은 변경분 저장
+        if written:
+            logging.info(f"💾 종료 전 사용자 프로필 {written}개 저장")
+        if heartbeat_parquet:
+            heartbeat_parquet.flush()
+        channel_cursors.save()
+        if initialization_complete.is_set(): # 로드가 끝나지 않은 상태는 저장하지 않음
+            await asave_state_snapshot()
         logging.info("봇 종료.")
 
 # --- 슬래시 명령어 정의 ---
@@ -1608,12 +1835,10 @@ async def my_profile_info(interaction: discord.Interaction):
     target_user_profile: User | None = None
     target_user_name = "Unknown"
 
-    # 메모리에서 사용자 찾기
-    for user_name, profile in user_profiles.items():
-        if profile.discord_id == user_id_str:
-            target_user_profile = profile
-            target_user_name = user_name
-            break
+    # 메모리에서 사용자 찾기 (discord_id 색인)
+    target_user_profile = profiles_by_discord_id.get(user_id_str)
+    if target_user_profile:
+        target_user_name = target_user_profile.name
 
     if target_user_profile:
         logging.info(f"Slash Command: /myinfo by {interaction.user.name} ({user_id_str}) - 사용자 찾음: {target_user_name}") # 명령어 이름 로그 수정
@@ -1688,12 +1913,10 @@ async def set_target_barracks(interaction: discord.Interaction, barracks: int):
             await interaction.response.send_message(f"목표 배럭 수는 1 이상 500 이하의 값이어야 합니다.", ephemeral=True)
         return
 
-    # 메모리에서 사용자 찾기
-    for user_name, profile in user_profiles.items():
-        if profile.discord_id == user_id_str:
-            target_user_profile = profile
-            target_user_name = user_name
-            break
+    # 메모리에서 사용자 찾기 (discord_id 색인)
+    target_user_profile = profiles_by_discord_id.get(user_id_str)
+    if target_user_profile:
+        target_user_name = target_user_profile.name
 
     if target_user_profile:
         logging.info(f"Slash Command: /목표배럭설정 by {interaction.user.name} ({user_id_str}) - 사용자: {target_user_name}, 요청 값: {barracks}")
@@ -1771,11 +1994,9 @@ async def set_preferred_packs(
     target_user_profile: User | None = None
     target_user_name = "Unknown"
 
-    for user_name, profile in user_profiles.items():
-        if profile.discord_id == user_id_str:
-            target_user_profile = profile
-            target_user_name = user_name
-            break
+    target_user_profile = profiles_by_discord_id.get(user_id_str)
+    if target_user_profile:
+        target_user_name = target_user_profile.name
 
     if not target_user_profile:
         logging.warning(f"Slash Command: /팩선호도 by {interaction.user.name} ({user_id_str}) - 사용자 데이터 없음")
@@ -1834,12 +2055,10 @@ async def set_graduated_packs(
     user_id_str = str(interaction.user.id)
     target_user_profile: User | None = None
     target_user_name = "Unknown"
-    # 사용자 프로필 찾는 로직 (find_user_profile 헬퍼 함수 대신 직접 구현)
-    for user_name, profile in user_profiles.items():
-        if profile.discord_id == user_id_str:
-            target_user_profile = profile
-            target_user_name = user_name
-            break
+    # 사용자 프로필 찾기 (discord_id 색인)
+    target_user_profile = profiles_by_discord_id.get(user_id_str)
+    if target_user_profile:
+        target_user_name = target_user_profile.name
 
     if not target_user_profile:
         logging.warning(f"Slash Command: /졸업팩 by {interaction.user.name} - 사용자 데이터 없음")
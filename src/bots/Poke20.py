@@ -1,3 +1,16 @@
+"""
+Poke20.py - heartbeat_data20 폴더를 쓰는 독립 실행 봇 (PM2에서 스크립트로 직접 실행)
+src.modules 를 import 하지 않고 기존 <user>.json (리스트) 형식을 그대로 유지합니다.
+
+Poke2의 채널별 커서/동시 히스토리 따라잡기/Heartbeat 큐는 이 봇에 적용하지 않습니다.
+패키지 import(..modules)와 JSONL 저장소가 필요해 독립 실행과 기존 파일 형식을 유지할 수 없기 때문이며,
+이 봇은 지금처럼 전역 시각 기준(최대 1시간)으로만 다시 스캔합니다.
+heartbeat_data20 기록은 scripts/migration 의 오프라인 스크립트가 변환 없이 읽기만 합니다.
+
+같은 이유로 공용 파서(src/modules/HeartbeatParser.py)와 큐 연동도 적용하지 않고
+아래 parse_heartbeat_message를 그대로 둡니다. barracks/version/type/select 값은 HeartbeatParser.to_record()와 같습니다 (stats는 Poke2에만).
+"""
+
 import discord
 import asyncio
 from datetime import datetime, timezone, timedelta
@@ -430,7 +443,7 @@ async def update_user_profiles_from_source():
 
 # --- Heartbeat 메시지 파싱 ---
 def parse_heartbeat_message(content):
-    """메시지 내용에서 heartbeat 정보 추출"""
+    """메시지 내용에서 heartbeat 정보 추출 (Poke2/Poke는 공용 HeartbeatParser 사용, 모듈 docstring 참고)"""
     data = {'barracks': 0, 'version': 'Unknown', 'type': 'Unknown', 'select': 'Unknown'}
     online_line = next((line.strip() for line in content.splitlines() if line.strip().lower().startswith("online:")), None)
     if online_line:
@@ -530,7 +543,9 @@ async def process_heartbeat_message(message, channel_id_str, channel_name):
 # --- 이벤트 핸들러 및 주기적 작업 ---
 
 async def perform_initial_setup():
-    """시간이 오래 걸리는 초기화 작업을 수행하는 함수 (백그라운드 실행)"""
+    """시간이 오래 걸리는 초기화 작업을 수행하는 함수 (백그라운드 실행)
+    채널별 커서/재개는 Poke2에만 있음 (모듈 docstring 참고)
+    """
     logging.info("--- 초기화 시작 (백그라운드) ---")
     global heartbeat_records, user_profiles
     # 1. 데이터 로딩
@@ -0,0 +1,83 @@
+"""
+ChannelCursor.py - 채널별 마지막 처리 메시지(snowflake) 커서와 히스토리 조회 속도 제한
+봇이 재시작하면 채널마다 저장된 커서 이후부터 다시 읽으므로, 얼마나 오래 꺼져 있었든
+빠지는 메시지가 없고 스캔 도중 중단되어도 이어서 읽을 수 있습니다.
+"""
+
+import os
+import time
+import asyncio
+import logging
+
+try:
+    from . import Codec
+except ImportError:  # 평면 import 지원
+    import Codec
+
+logger = logging.getLogger(__name__)
+
+SAVE_EVERY = 200       # 이만큼 처리할 때마다 저장
+SAVE_INTERVAL = 5.0    # 또는 마지막 저장 후 이만큼(초) 지나면 저장
+
+
+class ChannelCursors:
+    """{채널 ID: 마지막 처리 메시지 ID} 파일"""
+
+    def __init__(self, path):
+        self.path = path
+        self.cursors = {}
+        self._pending = 0
+        self._saved_at = time.monotonic()
+        if os.path.exists(path):
+            try:
+                data, _ = Codec.read_file(path)
+                self.cursors = {str(k): int(v) for k, v in data.items()}
+            except (OSError, ValueError, AttributeError, TypeError) as e:
+                logger.warning(f"⚠️ 채널 커서 파일 읽기 실패 ({path}): {e}")
+
+    def get(self, channel_id):
+        """마지막 처리 메시지 ID (없으면 None)"""
+        return self.cursors.get(str(channel_id))
+
+    def advance(self, channel_id, message_id):
+        """커서 전진 (뒤로는 가지 않음), 일정 개수/시간마다 저장"""
+        key = str(channel_id)
+        if message_id <= self.cursors.get(key, 0):
+            return
+        self.cursors[key] = message_id
+        self._pending += 1
+        if self._pending >= SAVE_EVERY or time.monotonic() - self._saved_at >= SAVE_INTERVAL:
+            self.save()
+
+    def save(self):
+        """변경분이 있으면 저장 (원자적 교체)"""
+        if not self._pending:
+            return False
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        Codec.write_file(self.path, self.cursors, indent=None)
+        self._pending = 0
+        self._saved_at = time.monotonic()
+        return True
+
+
+class RateBudget:
+    """여러 채널이 나눠 쓰는 초당 요청 한도 (토큰 버킷)"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(rate, 1)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """토큰 하나를 쓸 때까지 대기"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
@@ -0,0 +1,85 @@
+"""
+Codec.py - JSON / msgpack 저장 형식 처리
+파일마다 형식을 따로 가질 수 있고, 읽을 때 첫 바이트로 형식을 자동 판별합니다.
+(JSON은 항상 '{' 또는 '['로 시작, msgpack은 0x80 이상의 바이트로 시작)
+msgpack이 설치되어 있지 않으면 JSON만 사용합니다.
+Heartbeat 기록(heartbeat_data/<user>.jsonl)은 줄 단위로 추가하는 형식이라 항상 JSON입니다.
+"""
+
+import os
+import json
+import logging
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+FORMAT_JSON = 'json'
+FORMAT_MSGPACK = 'msgpack'
+
+# 새 파일의 기본 형식 (기존 파일은 현재 형식을 유지)
+DEFAULT_FORMAT = os.getenv('STORAGE_FORMAT', FORMAT_JSON).lower()
+if DEFAULT_FORMAT == FORMAT_MSGPACK and msgpack is None:
+    logger.warning("⚠️ STORAGE_FORMAT=msgpack 이지만 msgpack 패키지가 없어 JSON을 사용합니다.")
+    DEFAULT_FORMAT = FORMAT_JSON
+
+
+def detect(raw):
+    """바이트 내용으로 형식 판별 (빈 내용이면 None)"""
+    stripped = raw.lstrip()
+    if not stripped:
+        return None
+    if stripped[:1] in (b'{', b'['):
+        return FORMAT_JSON
+    return FORMAT_MSGPACK
+
+
+def loads(raw):
+    """바이트 -> 객체 (형식 자동 판별), 형식이 잘못되면 ValueError"""
+    fmt = detect(raw)
+    if fmt is None:
+        raise ValueError("빈 파일")
+    if fmt == FORMAT_JSON:
+        return json.loads(raw.decode('utf-8'))
+    if msgpack is None:
+        raise ValueError("msgpack 형식 파일이지만 msgpack 패키지가 설치되어 있지 않습니다")
+    return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+
+
+def dumps(obj, fmt=FORMAT_JSON, indent=2):
+    """객체 -> 바이트"""
+    if fmt == FORMAT_MSGPACK and msgpack is not None:
+        return msgpack.packb(obj, use_bin_type=True)
+    return json.dumps(obj, ensure_ascii=False, indent=indent).encode('utf-8')
+
+
+def file_format(path):
+    """파일의 현재 형식 (없거나 비어 있으면 None)"""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(64)
+    except FileNotFoundError:
+        return None
+    return detect(head)
+
+
+def read_file(path):
+    """파일 읽기 -> (객체, 형식)"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return loads(raw), detect(raw)
+
+
+def write_file(path, obj, fmt=None, indent=2):
+    """파일 쓰기 (fmt가 없으면 기존 파일 형식, 새 파일이면 DEFAULT_FORMAT) -> 사용한 형식"""
+    if fmt is None:
+        fmt = file_format(path) or DEFAULT_FORMAT
+    data = dumps(obj, fmt, indent)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return fmt
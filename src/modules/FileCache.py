@@ -0,0 +1,88 @@
+"""
+FileCache.py - stat() 기반 읽기 캐시
+파일의 (st_mtime_ns, st_size, st_ino)가 그대로면 다시 열고 파싱하지 않고
+캐시된 데이터의 복사본을 반환합니다. 폴링 비용이 stat() 한 번으로 줄어듭니다.
+"""
+
+import os
+import threading
+
+
+def _stat_key(path):
+    """파일 식별 키 (없으면 None)"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _copy(data):
+    """호출자가 수정해도 캐시가 오염되지 않도록 얕은 복사"""
+    if isinstance(data, (set, dict, list)):
+        return data.copy()
+    return data
+
+
+class StatCache:
+    """경로별 파싱 결과 캐시
+
+    tag로 같은 파일을 다른 형식(set/list 등)으로 읽는 호출자를 구분하고,
+    deps에는 함께 검증할 파일(저널 로그 등)을 넘깁니다.
+    """
+
+    def __init__(self):
+        self._entries = {}  # (tag, path) -> (key, data)
+        self._lock = threading.Lock()
+        # 통계
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, path, deps):
+        return tuple(_stat_key(p) for p in (path,) + tuple(deps))
+
+    def get(self, path, loader, deps=(), tag=None):
+        """파일이 바뀌지 않았으면 캐시, 바뀌었으면 loader() 결과를 저장 후 반환"""
+        key = self._key(path, deps)
+        with self._lock:
+            entry = self._entries.get((tag, path))
+            if entry and entry[0] == key:
+                self.hits += 1
+                return _copy(entry[1])
+            self.misses += 1
+        # 읽기 전에 잡은 key로 저장하므로 읽는 도중 바뀌면 다음 조회에서 다시 읽음
+        data = loader()
+        with self._lock:
+            self._entries[(tag, path)] = (key, _copy(data))
+        return data
+
+    def prime(self, path, data, deps=(), tag=None):
+        """직접 기록한 직후 캐시 갱신 (다음 조회가 바로 적중)"""
+        key = self._key(path, deps)
+        with self._lock:
+            for entry_key in [k for k in self._entries if k[1] == path]:
+                del self._entries[entry_key]
+            self._entries[(tag, path)] = (key, _copy(data))
+
+    def invalidate(self, path=None):
+        """경로(또는 전체) 캐시 제거"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                return
+            for entry_key in [k for k in self._entries if k[1] == path]:
+                del self._entries[entry_key]
+
+    def stats(self):
+        """적중/실패 통계"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# 프로세스 전역 캐시
+read_cache = StatCache()
@@ -11,10 +11,25 @@ import os
 from discord.ext import commands
 from datetime import datetime, timedelta
 
+try:
+    from .GistClient import get_client, get_batcher, GITHUB_API_URL, GITHUB_RAW_URL, GIST_BATCH_WINDOW
+    from . import HeartbeatParser
+except ImportError:  # 평면 import 지원 (scripts/)
+    from GistClient import get_client, get_batcher, GITHUB_API_URL, GITHUB_RAW_URL, GIST_BATCH_WINDOW
+    import HeartbeatParser
+
 
 
 GITHUB = {'USER' : os.getenv('GITHUB_USER_ID'), 'TOKEN' : os.getenv('GITHUB_GIST_TOKEN')}
 
+# 동기 요청용 세션 (커넥션 재사용)
+SESSION = requests.Session()
+
+
+async def aflush():
+    """배치 대기 중인 gist 변경을 지금 전송 (종료/연결 끊김 시, 루프 밖 종료는 atexit이 처리)"""
+    return await get_batcher().flush()
+
         
 class FILE():
     def __init__(self, GIST_ID, GIST_FILE, INITIAL = True):
@@ -22,15 +37,15 @@ class FILE():
         self.TOKEN = GITHUB['TOKEN']
         self.ID    = GIST_ID
         self.NAME  = GIST_FILE
-        self.API   = f"https://api.github.com/gists/{self.ID}"
+        self.API   = f"{GITHUB_API_URL}/gists/{self.ID}"
             
         
     def fetch_url(self):
-        api_url = f"https://api.github.com/gists/{self.ID}"
-        raw_url = f"https://gist.githubusercontent.com/{self.USER}/{self.ID}/raw/{self.NAME}"
+        api_url = f"{GITHUB_API_URL}/gists/{self.ID}"
+        raw_url = f"{GITHUB_RAW_URL}/{self.USER}/{self.ID}/raw/{self.NAME}"
         headers = {"Authorization": f"token {self.TOKEN}"}
         try :
-            response = requests.get(api_url, headers=headers)
+            response = SESSION.get(api_url, headers=headers)
             if response.status_code == 200:
                 data = response.json()
                 if self.NAME in data["files"]:
@@ -42,21 +57,36 @@ class FILE():
         except :
             return raw_url
         
+    def content(self):
+        # 정렬해서 같은 데이터는 항상 같은 내용 (배치 변경 감지용)
+        return "\n".join(sorted(self.DATA))
+        
     def update(self):
-        updated = "\n".join(self.DATA)
+        updated = self.content()
+        # 이벤트 루프 안이면 같은 GIST_ID 파일들과 묶어서 한 번에 PATCH
+        if GIST_BATCH_WINDOW > 0 and get_batcher().queue(self.ID, self.NAME, updated):
+            return
 
         headers = {"Authorization": f"token {self.TOKEN}"}
         data = {"files": {self.NAME: {"content": updated}}}
         try:
-            response = requests.patch(self.API, json=data, headers=headers)
+            response = SESSION.patch(self.API, json=data, headers=headers)
         except Exception as e:
             print(f"{self.NAME} 에 이상이 있습니다.", e)
+            return
         if response.status_code == 200:
+            get_batcher().remember(self.ID, self.NAME, updated)
             print(f"{self.NAME} 업데이트 명령 보냄!")
         else:
             print(f"{self.NAME} 업데이트 실패: {response.text}")
     
     def fetch(self, URL):
+        response = SESSION.get(URL)
+        if response.status_code == 200:
+            return self.parse(response.text)
+        return self.parse(None)
+    
+    def parse(self, text):
         pass
     
     def fetch_data(self):
@@ -64,8 +94,35 @@ class FILE():
         return self.fetch(URL)
     
     def fetch_raw(self):
-        URL = f"https://gist.githubusercontent.com/{self.USER}/{self.ID}/raw/{self.NAME}"
+        URL = f"{GITHUB_RAW_URL}/{self.USER}/{self.ID}/raw/{self.NAME}"
         return self.fetch(URL)
+    
+    # 비동기 버전 - 공유 커넥션 풀 + ETag 조건부 요청 (변경 없으면 304)
+    async def afetch_raw(self):
+        try :
+            text = await get_client().fetch_file(self.ID, self.NAME)
+        except Exception as e:
+            print(f"{self.NAME} 가져오기 실패:", e)
+            text = None
+        return self.parse(text)
+    
+    async def afetch_data(self):
+        return await self.afetch_raw()
+    
+    async def aload(self):
+        self.DATA = await self.afetch_raw()
+    
+    async def aupdate(self):
+        try :
+            if GIST_BATCH_WINDOW > 0 :
+                return await get_batcher().submit(self.ID, self.NAME, self.content())
+            ok = await get_client().patch(self.ID, {self.NAME: self.content()})
+        except Exception as e:
+            print(f"{self.NAME} 에 이상이 있습니다.", e)
+            return False
+        if ok :
+            print(f"{self.NAME} 업데이트 명령 보냄!")
+        return ok
         
     def edit(self):
         pass
@@ -79,13 +136,10 @@ class TEXT(FILE):
         else :
             self.DATA = set()
         
-    def fetch(self, URL):
-        response = requests.get(URL)
-        if response.status_code == 200:
-            data = response.text.strip()
-            return set(data.splitlines())
-        else:
+    def parse(self, text):
+        if text is None :
             return set()
+        return set(text.strip().splitlines())
             
     def edit(self, MODE, text):
         if MODE == '+' :
@@ -103,11 +157,10 @@ class JSON(FILE):
         else :
             self.DATA = {}
     
-    def fetch(self, URL):
+    def parse(self, text):
         DATA = {}
-        response = requests.get(URL)
-        if response.status_code == 200:
-            data = json.loads(response.text)
+        if text is not None :
+            data = json.loads(text)
             for key, value in data.items() :
                 DATA[key] = str(value)
         return DATA
@@ -118,19 +171,8 @@ class JSON(FILE):
         elif MODE == '-' :
             self.DATA.pop(key, None)
             
-    def update(self):
-        DICT = json.dumps(self.DATA, indent=4, ensure_ascii=False)
-        
-        headers = {"Authorization": f"token {self.TOKEN}"}
-        data = {"files": {self.NAME: {"content": DICT}}}
-        try:
-            response = requests.patch(self.API, json=data, headers=headers)
-        except Exception as e:
-            print(f"{self.NAME} 에 이상이 있습니다.", e)
-        if response.status_code == 200:
-            print(f"{self.NAME} 업데이트 명령 보냄!")
-        else:
-            print(f"{self.NAME} 업데이트 실패: {response.text}")
+    def content(self):
+        return json.dumps(self.DATA, indent=4, ensure_ascii=False)
 
 
 
@@ -414,45 +456,6 @@ class USER():
             return None
         
     def extract(self, message):
-        inform = {'TIME' : message.created_at}
-        lines = message.content.split("\n")
-        for line in lines:
-            if 'Online' in line:
-                numbers = re.findall(r'\d+', line)
-                inform['BARRACKS'] =  len(numbers)
-                
-            if 'Time' in line:
-                pattern = r'Time:\s*(\d+)m.*?Packs:\s*(\d+).*?Avg:\s*([\d.]+)'
-                match = re.search(pattern, line)
-                if match:
-                    inform['RUNTIME'] = int(match.group(1))
-                    inform['PACKS']   = int(match.group(2))
-                    if inform['RUNTIME'] :
-                        inform['AVG'] = float(match.group(3))
-                    else :
-                        inform['AVG'] = float('nan')
-                    
-            if 'Type' in line:
-                num_pattern = r"Type:\s*(\d+)"
-                num_match = re.search(num_pattern, line)
-                inform['TYPE'] = int(num_match.group(1)) if num_match else None
-                
-                bracket_pattern = r"\(([^)]+)\)"
-                inform['METHOD'] = re.findall(bracket_pattern, line)
-                
-            if 'Select' in line:
-                match = re.search(r"Select:\s*(.*)", line)
-                if match:
-                    content = match.group(1)
-                    inform['SELECT'] = [item.strip() for item in content.split(',') if item.strip()]
-                    
-            if 'Opening' in line:
-                match = re.search(r"Opening:\s*(.*)", line)
-                if match:
-                    content = match.group(1)
-                    inform['SELECT'] = [item.strip() for item in content.split(',') if item.strip()]
-                    
-                    
-        return inform
+        return HeartbeatParser.to_inform(HeartbeatParser.parse(message.content), message.created_at)
 
 
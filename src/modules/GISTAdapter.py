@@ -6,12 +6,26 @@ GISTAdapter.py - GIST 인터페이스를 유지하면서 LocalFile을 사용하
 import os
 import json
 import re
+import atexit
+import threading
 import discord
 import aiohttp
 import io
 from datetime import datetime, timedelta
-from .LocalFile import LocalFile
+from .LocalFile import get_shared
 from .paths import get_data_path
+from .WriteBehind import WriteBehindFlusher
+from .FileCache import read_cache
+from .StorageIO import storage_io
+from . import Codec
+from . import HeartbeatParser
+from .GodpackIndex import IndexedGodpackMixin
+from .GodpackArchive import ArchivedGodpackMixin
+
+# (파일 경로, 어댑터 종류)별 공유 어댑터 - LocalFileAdapter.get_adapter와 같은 방식
+_registry = {}
+_registry_lock = threading.Lock()
+
 
 class GISTAdapter:
     """GIST 클래스와 동일한 인터페이스를 제공하는 어댑터"""
@@ -28,8 +42,35 @@ class GISTAdapter:
         else:
             base_path = get_data_path("poke_data")
             
-        # LocalFile 인스턴스 생성
-        self.local_storage = LocalFile(base_path=base_path)
+        # 기본 경로별 공유 LocalFile 인스턴스
+        self.local_storage = get_shared(base_path=base_path)
+        
+        # WRITE_BEHIND=true 이면 update()를 모아서 주기적으로 기록
+        self.write_behind = os.getenv('WRITE_BEHIND', 'false').lower() == 'true'
+        self.flusher = WriteBehindFlusher() if self.write_behind else None
+    
+    def start_flusher(self):
+        """write-behind 플러셔 시작 (이벤트 루프 안에서 호출)"""
+        if self.flusher:
+            return self.flusher.start()
+        return None
+    
+    async def aflush(self):
+        """대기 중인 변경사항을 비동기로 기록 (on_disconnect 등)"""
+        if self.flusher:
+            await self.flusher.flush()
+    
+    def flush(self):
+        """대기 중인 변경사항을 즉시 기록 (종료 시)"""
+        if self.flusher:
+            self.flusher.flush_sync()
+    
+    def backup(self):
+        """증분 스냅샷 생성 후 보존 정책에 맞게 정리"""
+        ok = self.local_storage.backup()
+        if ok:
+            self.local_storage.pruneBackups()
+        return ok
     
     def TEXT(self, gist_id, filename, initial=True):
         """GIST.TEXT와 동일한 인터페이스"""
@@ -43,7 +84,10 @@ class GISTAdapter:
         }
         
         folder, local_filename = mapping.get(filename, ("common", f"{filename}.txt"))
-        return TextAdapter(self.local_storage, folder, local_filename, name=filename, initial=initial)
+        adapter, created = self._shared_file(TextAdapter, folder, local_filename, name=filename, initial=initial)
+        if not created and not initial:
+            adapter.reset()
+        return adapter
     
     def JSON(self, gist_id, filename):
         """GIST.JSON과 동일한 인터페이스"""
@@ -60,7 +104,20 @@ class GISTAdapter:
         }
         
         folder, local_filename = mapping.get(filename, ("common", f"{filename}.json"))
-        return JsonAdapter(self.local_storage, folder, local_filename, name=filename)
+        # 갓팩 상태 파일은 (이름, 번호)/sub/제목 인덱스를 함께 유지
+        adapter_class = GodpackAdapter if filename.startswith("GodPack") else JsonAdapter
+        return self._shared_file(adapter_class, folder, local_filename, name=filename)[0]
+
+    def _shared_file(self, adapter_class, folder, local_filename, **kwargs):
+        """파일당 하나의 어댑터 (같은 파일의 핸들이 여러 개면 쓰기 락이 갈려 서로 덮어씀) -> (어댑터, 새로 만들었는지)"""
+        key = (os.path.abspath(os.path.join(self.local_storage.base_path, folder, local_filename)), adapter_class)
+        with _registry_lock:
+            adapter = _registry.get(key)
+            if adapter is not None:
+                return adapter, False
+            adapter = _registry[key] = adapter_class(self.local_storage, folder, local_filename,
+                                                     flusher=self.flusher, **kwargs)
+            return adapter, True
     
     def SERVER(self, *args):
         """GIST.SERVER와 동일한 인터페이스"""
@@ -75,39 +132,124 @@ class GISTAdapter:
         return USER(*args)
 
 
-class TextAdapter:
-    """GIST TEXT 클래스 어댑터"""
+class FileAdapter:
+    """TextAdapter/JsonAdapter 공통 쓰기 로직 (즉시 쓰기 / write-behind / 저널)"""
     
-    def __init__(self, storage, folder, filename, name=None, initial=True):
+    def __init__(self, storage, folder, filename, name=None, flusher=None):
         self.storage = storage
         self.folder = folder
         self.filename = filename
         self.file_path = os.path.join(storage.base_path, folder, filename)
-        self.DATA = set()
         self.NAME = name  # GIST와의 호환성을 위해 추가
+        self.flusher = flusher
+        self._version = 0          # edit 마다 증가
+        self._written_version = -1  # 마지막으로 파일에 기록된 버전
+        self._write_lock = threading.Lock()
+        # STORAGE_JOURNAL=true 이면 edit는 로그에 추가하고 update는 임계값을 넘을 때만 스냅샷 기록
+        self.journal = storage.getJournal(self.file_path) if storage.journal_mode else None
+        self._force_compact = False
+    
+    def _touch(self, mode, *args):
+        """데이터 변경 표시 (저널 모드면 작업 로그 추가)"""
+        self._version += 1
+        if self.journal:
+            self.journal.append(mode, *args)
+    
+    def _deps(self):
+        """캐시 검증에 함께 쓰는 파일 (저널 로그)"""
+        return (self.journal.log_path,) if self.journal else ()
+    
+    def _read(self):
+        """파일 상태가 그대로면 stat()만으로 캐시된 데이터 복사본 반환"""
+        return read_cache.get(self.file_path, self._read_file, self._deps(), tag=type(self).__name__)
+    
+    def _snapshot(self):
+        """(버전, 데이터 복사본, 로그 위치) 반환 - 이벤트 루프에서 호출"""
+        mark = self.journal.tell() if self.journal else None
+        return self._version, self._copy_data(), mark
+    
+    def _write(self, snapshot):
+        """스냅샷을 파일에 기록 - 더 최신 버전이 이미 기록됐으면 건너뜀"""
+        version, data, mark = snapshot
+        with self._write_lock:
+            if version < self._written_version:
+                return
+            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            tmp_path = self.file_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(self._encode(data))
+            os.replace(tmp_path, self.file_path)
+            self._written_version = version
+            # 스냅샷에 반영된 로그 구간 정리
+            if self.journal and mark is not None:
+                self.journal.truncate(mark)
+            # 방금 기록한 내용으로 캐시 갱신
+            read_cache.prime(self.file_path, data, self._deps(), tag=type(self).__name__)
+    
+    def _should_write(self):
+        """지금 스냅샷을 직접 기록해야 하는지 판단 (저널/write-behind 처리 포함)"""
+        if self.journal and not self._force_compact and not self.journal.needs_compaction():
+            # 변경사항은 이미 로그에 기록됨
+            return False
+        self._force_compact = False
+        if self.flusher and self.flusher.running:
+            self.flusher.mark_dirty(self)
+            return False
+        return True
+    
+    def update(self):
+        """변경사항을 파일에 저장 (write-behind 모드면 다음 플러시에 기록)"""
+        if self._should_write():
+            self._write(self._snapshot())
+        return True
+    
+    async def aupdate(self):
+        """update()의 비동기 버전 - 복사본만 루프에서 만들고 직렬화/쓰기는 I/O 풀에서"""
+        if self._should_write():
+            await storage_io.run(self.file_path, self._write, self._snapshot())
+        return True
+    
+    async def aload(self):
+        """load()의 비동기 버전"""
+        self.DATA = await storage_io.run(self.file_path, self._read)
+
+
+class TextAdapter(FileAdapter):
+    """GIST TEXT 클래스 어댑터"""
+    
+    def __init__(self, storage, folder, filename, name=None, initial=True, flusher=None):
+        super().__init__(storage, folder, filename, name=name, flusher=flusher)
+        self.DATA = set()
         # GIST와 동일한 동작: initial=True일 때만 파일 로드
         if initial:
             self.load()
-        # initial=False면 빈 set으로 시작
+        else:
+            self.reset()
     
     def load(self):
         """파일에서 데이터 로드"""
+        self.DATA = self._read()
+    
+    def reset(self):
+        """initial=False: 빈 set으로 시작 (다음 update에서 이전 로그까지 파일을 덮어씀)"""
+        self.DATA = set()
+        self._force_compact = True
+    
+    def _read_file(self):
+        """파일 파싱 (+ 저널 로그 재생)"""
+        data = set()
         if os.path.exists(self.file_path):
             with open(self.file_path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                if content:
-                    self.DATA = set(content.split('\n'))
-                else:
-                    self.DATA = set()
-        else:
-            self.DATA = set()
+                data = set(line.strip() for line in f if line.strip())
+        if self.journal:
+            self.journal.replay(data)
+        return data
     
-    def update(self):
-        """변경사항을 파일에 저장"""
-        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
-        with open(self.file_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(sorted(self.DATA)))
-        return True
+    def _copy_data(self):
+        return set(self.DATA)
+    
+    def _encode(self, data):
+        return '\n'.join(sorted(data)).encode('utf-8')
     
     def edit(self, mode, text):
         """데이터 편집"""
@@ -115,15 +257,17 @@ class TextAdapter:
             self.DATA.add(text)
         elif mode == '-':
             self.DATA.discard(text)
+        self._touch(mode, text)
     
     def fetch_raw(self):
         """호환성을 위한 메서드 - GIST 동작 모방"""
         # GIST는 항상 최신 데이터를 GitHub에서 가져오므로
-        # 여기서도 파일에서 직접 읽어서 반환
-        if os.path.exists(self.file_path):
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                return set(line.strip() for line in f if line.strip())
-        return set()
+        # 여기서도 파일 기준으로 반환 (변경이 없으면 캐시 사용)
+        return self._read()
+    
+    async def afetch_raw(self):
+        """fetch_raw()의 비동기 버전"""
+        return await storage_io.run(self.file_path, self._read)
     
     def fetch_data(self):
         """호환성을 위한 메서드"""
@@ -131,35 +275,37 @@ class TextAdapter:
         return self.DATA
 
 
-class JsonAdapter:
+class JsonAdapter(FileAdapter):
     """GIST JSON 클래스 어댑터"""
     
-    def __init__(self, storage, folder, filename, name=None):
-        self.storage = storage
-        self.folder = folder
-        self.filename = filename
-        self.file_path = os.path.join(storage.base_path, folder, filename)
+    def __init__(self, storage, folder, filename, name=None, flusher=None):
+        super().__init__(storage, folder, filename, name=name, flusher=flusher)
         self.DATA = {}
-        self.NAME = name  # GIST와의 호환성을 위해 추가
+        # 저장 형식(json/msgpack)은 파일마다 자동 판별, 새 파일은 STORAGE_FORMAT
+        self._format = Codec.file_format(self.file_path) or Codec.DEFAULT_FORMAT
         self.load()
     
     def load(self):
         """파일에서 데이터 로드"""
+        self.DATA = self._read()
+    
+    def _read_file(self):
+        """파일 파싱 (+ 저널 로그 재생)"""
+        data = {}
         if os.path.exists(self.file_path):
             try:
-                with open(self.file_path, 'r', encoding='utf-8') as f:
-                    self.DATA = json.load(f)
-            except json.JSONDecodeError:
-                self.DATA = {}
-        else:
-            self.DATA = {}
+                data, self._format = Codec.read_file(self.file_path)
+            except ValueError:
+                data = {}
+        if self.journal:
+            self.journal.replay(data)
+        return data
     
-    def update(self):
-        """변경사항을 파일에 저장"""
-        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
-        with open(self.file_path, 'w', encoding='utf-8') as f:
-            json.dump(self.DATA, f, ensure_ascii=False, indent=2)
-        return True
+    def _copy_data(self):
+        return dict(self.DATA)
+    
+    def _encode(self, data):
+        return Codec.dumps(data, self._format, indent=2)
     
     def edit(self, mode, key, value=None):
         """데이터 편집"""
@@ -167,18 +313,31 @@ class JsonAdapter:
             self.DATA[key] = value
         elif mode == '-':
             self.DATA.pop(key, None)
+        self._touch(mode, key, value)
     
     def fetch_raw(self):
         """호환성을 위한 메서드"""
         self.load()
         return self.DATA
     
+    async def afetch_raw(self):
+        """fetch_raw()의 비동기 버전"""
+        await self.aload()
+        return self.DATA
+    
     def fetch_data(self):
         """호환성을 위한 메서드"""
         self.load()
         return self.DATA
 
 
+class GodpackAdapter(ArchivedGodpackMixin, IndexedGodpackMixin, JsonAdapter):
+    """GODPACK 파일 어댑터 (INDEX로 O(1) 조회, 오래된 기록은 ARCHIVE로 분리)"""
+    
+    def _archive_dir(self):
+        return os.path.join(os.path.dirname(self.file_path), "archive")
+
+
 # SERVER 클래스 (GIST.py와 동일)
 class SERVER:
     def __init__(self, ID, File, GodPack, GPTest, Detect, Posting, Command, Museum, Tag):
@@ -194,44 +353,13 @@ class SERVER:
         self.MUSEUM = Museum
         self.Tag = Tag
     
-    def found_GodPack(self, message):
+    def _parse_GodPack(self, message):
         lines = message.content.split("\n")
         if len(lines) < 3:
-            return None, None
-        
-        inform = self.extract_GodPack(lines)
-        
-        if not inform:
-            return None, None
-        
-        message_time = message.created_at + timedelta(hours=9)
-        formatted_time = message_time.strftime("%Y.%m.%d %H:%M")
-
-        title, sub, save = self.make_title(inform, formatted_time)
-        
-        duplic = False
-        if not inform['code']:
-            origin = next((text for text in self.GODPACK.DATA if sub in text), None)
-            duplic = origin is not None
-        
-        if duplic:
-            self.GODPACK.edit('+', save, "NaN")
-            self.GODPACK.update()
-            print("중복 GodPack 입니다")
-            return None, None
-        else:
-            self.GODPACK.edit('+', save, "Yet")
-            self.GODPACK.update()
-            if inform['code']:
-                self.GPTEST.edit('+', save, inform['code'])
-            else:
-                self.GPTEST.edit('+', save, 'NaN')
-            self.GPTEST.update()
-            print("제목 : " + title)
-            
-        return inform, title
+            return None
+        return self.extract_GodPack(lines)
     
-    def found_Pseudo(self, message):
+    def _parse_Pseudo(self, message):
         lines = message.content.split("\n")
         
         # Double two star 등 1줄 메시지를 위한 예외 처리
@@ -240,12 +368,12 @@ class SERVER:
             pass
         elif len(lines) < 3:
             # 기존 3줄 이상 필요한 메시지들을 위한 체크
-            return None, None
-        
-        inform = self.extract_Pseudo(lines)
-        if not inform:
-            return None, None
+            return None
         
+        return self.extract_Pseudo(lines)
+    
+    def _record(self, inform, message, label):
+        """GODPACK/GPTEST 편집 (저장은 호출자가) - 중복이면 title은 None"""
         message_time = message.created_at + timedelta(hours=9)
         formatted_time = message_time.strftime("%Y.%m.%d %H:%M")
         
@@ -253,26 +381,60 @@ class SERVER:
         
         duplic = False
         if not inform['code']:
-            origin = next((text for text in self.GODPACK.DATA if sub in text), None)
+            index = getattr(self.GODPACK, 'INDEX', None)
+            if index is not None:
+                origin = index.find_sub(sub)
+            else:
+                origin = next((text for text in self.GODPACK.DATA if sub in text), None)
             duplic = origin is not None
         
         if duplic:
             self.GODPACK.edit('+', save, "NaN")
-            self.GODPACK.update()
-            print("중복 Pseudo 입니다")
-            return None, None
+            print(f"중복 {label} 입니다")
+            return None
+        
+        self.GODPACK.edit('+', save, "Yet")
+        if inform['code']:
+            self.GPTEST.edit('+', save, inform['code'])
         else:
-            self.GODPACK.edit('+', save, "Yet")
-            self.GODPACK.update()
-            if inform['code']:
-                self.GPTEST.edit('+', save, inform['code'])
-            else:
-                self.GPTEST.edit('+', save, 'NaN')
-            self.GPTEST.update()
-            print("제목 : " + title)
-            
+            self.GPTEST.edit('+', save, 'NaN')
+        print("제목 : " + title)
+        return title
+    
+    def _found(self, inform, message, label):
+        if not inform:
+            return None, None
+        title = self._record(inform, message, label)
+        self.GODPACK.update()
+        if title is None:
+            return None, None
+        self.GPTEST.update()
+        return inform, title
+    
+    async def _afound(self, inform, message, label):
+        if not inform:
+            return None, None
+        title = self._record(inform, message, label)
+        await self.GODPACK.aupdate()
+        if title is None:
+            return None, None
+        await self.GPTEST.aupdate()
         return inform, title
     
+    def found_GodPack(self, message):
+        return self._found(self._parse_GodPack(message), message, "GodPack")
+    
+    def found_Pseudo(self, message):
+        return self._found(self._parse_Pseudo(message), message, "Pseudo")
+    
+    async def afound_GodPack(self, message):
+        """found_GodPack()의 비동기 버전 (파일 쓰기를 I/O 풀에서)"""
+        return await self._afound(self._parse_GodPack(message), message, "GodPack")
+    
+    async def afound_Pseudo(self, message):
+        """found_Pseudo()의 비동기 버전 (파일 쓰기를 I/O 풀에서)"""
+        return await self._afound(self._parse_Pseudo(message), message, "Pseudo")
+    
     async def Post(self, forum_channel, images, inform, title):
         applied_tags = []
         forum_tags = forum_channel.available_tags
@@ -482,52 +644,42 @@ class USER:
             return None
         
     def extract(self, message):
-        inform = {'TIME': message.created_at}
-        lines = message.content.split("\n")
-        for line in lines:
-            if 'Online' in line:
-                numbers = re.findall(r'\d+', line)
-                inform['BARRACKS'] = len(numbers)
-                
-            if 'Time' in line:
-                pattern = r'Time:\s*(\d+)m.*?Packs:\s*(\d+).*?Avg:\s*([\d.]+)'
-                match = re.search(pattern, line)
-                if match:
-                    inform['RUNTIME'] = int(match.group(1))
-                    inform['PACKS'] = int(match.group(2))
-                    if inform['RUNTIME']:
-                        inform['AVG'] = float(match.group(3))
-                    else:
-                        inform['AVG'] = float('nan')
-                    
-            if 'Type' in line:
-                num_pattern = r"Type:\s*(\d+)"
-                num_match = re.search(num_pattern, line)
-                inform['TYPE'] = int(num_match.group(1)) if num_match else None
-                
-                bracket_pattern = r"\(([^)]+)\)"
-                inform['METHOD'] = re.findall(bracket_pattern, line)
-                
-            if 'Select' in line:
-                match = re.search(r"Select:\s*(.*)", line)
-                if match:
-                    content = match.group(1)
-                    inform['SELECT'] = [item.strip() for item in content.split(',') if item.strip()]
-                    
-            if 'Opening' in line:
-                match = re.search(r"Opening:\s*(.*)", line)
-                if match:
-                    content = match.group(1)
-                    inform['SELECT'] = [item.strip() for item in content.split(',') if item.strip()]
-                    
-        return inform
+        return HeartbeatParser.to_inform(HeartbeatParser.parse(message.content), message.created_at)
+
+
+# 싱글톤 인스턴스 (처음 사용할 때 생성 - SERVER/USER만 import해도 LocalFile이 만들어지지 않도록)
+_adapter = None
 
 
-# 싱글톤 인스턴스
-_adapter = GISTAdapter()
+def _get_adapter():
+    global _adapter
+    if _adapter is None:
+        _adapter = GISTAdapter()
+        # 종료 시 남은 write-behind 변경사항 기록
+        atexit.register(_adapter.flush)
+    return _adapter
+
 
 # GIST 모듈과 동일한 인터페이스 제공
-TEXT = _adapter.TEXT
-JSON = _adapter.JSON
+def TEXT(gist_id, filename, initial=True):
+    return _get_adapter().TEXT(gist_id, filename, initial)
+
+def JSON(gist_id, filename):
+    return _get_adapter().JSON(gist_id, filename)
+
+def start_flusher():
+    return _get_adapter().start_flusher()
+
+def flush():
+    if _adapter is not None:
+        _adapter.flush()
+
+async def aflush():
+    if _adapter is not None:
+        await _adapter.aflush()
+
+def backup():
+    return _get_adapter().backup()
+
 SERVER = SERVER  # 클래스 직접 참조
-USER = USER      # 클래스 직접 참조
\ No newline at end of file
+USER = USER      # 클래스 직접 참조
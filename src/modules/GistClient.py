@@ -0,0 +1,263 @@
+"""
+GistClient.py - aiohttp 기반 GitHub Gist 비동기 클라이언트
+하나의 커넥션 풀을 재사용하고, ETag/If-None-Match 조건부 GET으로
+변경 없는 gist는 304로 처리하며, 동시 요청 수를 제한합니다.
+"""
+
+import os
+import json
+import atexit
+import asyncio
+import hashlib
+import logging
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# API 주소 (로컬 대역 서버로 테스트할 때 덮어쓰기)
+GITHUB_API_URL = os.getenv('GITHUB_API_URL', 'https://api.github.com').rstrip('/')
+GITHUB_RAW_URL = os.getenv('GITHUB_RAW_URL', 'https://gist.githubusercontent.com').rstrip('/')
+# 동시 요청 수 제한
+GIST_CONCURRENCY = int(os.getenv('GIST_CONCURRENCY', '4'))
+GIST_TIMEOUT = float(os.getenv('GIST_TIMEOUT', '15'))
+# 같은 gist의 파일 변경을 모으는 시간 (초, 0이면 배치 안 함)
+GIST_BATCH_WINDOW = float(os.getenv('GIST_BATCH_WINDOW', '1'))
+
+
+class GistClient:
+    """Gist API 비동기 클라이언트 (커넥션 풀 + 조건부 요청 + 동시성 제한)"""
+
+    def __init__(self, token=None, api_url=None, concurrency=GIST_CONCURRENCY, timeout=GIST_TIMEOUT):
+        self.token = token if token is not None else os.getenv('GITHUB_GIST_TOKEN')
+        self.api_url = (api_url or GITHUB_API_URL).rstrip('/')
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._session = None
+        self._semaphore = None
+        self._cache = {}  # url -> (etag, body)
+        # 통계
+        self.requests = 0
+        self.not_modified = 0
+
+    def _headers(self):
+        headers = {"Accept": "application/vnd.github+json"}
+        if self.token:
+            headers["Authorization"] = f"token {self.token}"
+        return headers
+
+    async def _get_session(self):
+        """커넥션 풀 세션 (처음 사용할 때 현재 루프에서 생성)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.concurrency)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self._headers(),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    async def get_text(self, url):
+        """조건부 GET - 304면 이전 본문 재사용, 실패하면 None"""
+        session = await self._get_session()
+        headers = {}
+        cached = self._cache.get(url)
+        if cached:
+            headers["If-None-Match"] = cached[0]
+        async with self._semaphore:
+            self.requests += 1
+            async with session.get(url, headers=headers) as resp:
+                if resp.status == 304 and cached:
+                    self.not_modified += 1
+                    return cached[1]
+                if resp.status != 200:
+                    logger.warning(f"[GistClient] GET {url} 실패: {resp.status}")
+                    return None
+                body = await resp.text()
+                etag = resp.headers.get("ETag")
+                if etag:
+                    self._cache[url] = (etag, body)
+                return body
+
+    async def get_gist(self, gist_id):
+        """gist 전체 정보 (files 포함)"""
+        body = await self.get_text(f"{self.api_url}/gists/{gist_id}")
+        return json.loads(body) if body is not None else None
+
+    async def fetch_file(self, gist_id, filename):
+        """gist 안의 파일 내용 (잘린 파일은 raw_url에서 다시 가져옴)"""
+        gist = await self.get_gist(gist_id)
+        if not gist:
+            return None
+        info = gist.get("files", {}).get(filename)
+        if info is None:
+            return None
+        if info.get("truncated") and info.get("raw_url"):
+            return await self.get_text(info["raw_url"])
+        return info.get("content")
+
+    async def patch(self, gist_id, files):
+        """files = {파일명: 내용} 을 한 번의 PATCH로 업로드"""
+        session = await self._get_session()
+        url = f"{self.api_url}/gists/{gist_id}"
+        payload = {"files": {name: {"content": content} for name, content in files.items()}}
+        async with self._semaphore:
+            self.requests += 1
+            async with session.patch(url, json=payload) as resp:
+                if resp.status != 200:
+                    logger.error(f"[GistClient] PATCH {gist_id} 실패: {resp.status} {await resp.text()}")
+                    return False
+                # 내용이 바뀌었으므로 이전 ETag는 폐기
+                self._cache.pop(url, None)
+                return True
+
+    async def close(self):
+        """커넥션 풀 종료"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class GistBatcher:
+    """GIST_ID별로 변경된 파일을 모아 한 번의 PATCH로 보내는 배치 계층
+
+    같은 gist(예: GIST_ID_3의 GodPack7/Code7)에 대한 update()는 한 창(window) 안에서
+    {"files": {...}} 하나로 합쳐지고, 마지막 업로드와 내용이 같은 파일은 보내지 않습니다.
+    """
+
+    def __init__(self, client=None, window=GIST_BATCH_WINDOW):
+        self.client = client
+        self.window = window
+        self._pending = {}   # gist_id -> {파일명: 내용}
+        self._sent = {}      # (gist_id, 파일명) -> 마지막 업로드 내용 해시
+        self._task = None
+        self._done = None    # 아직 보내지 않은 창의 완료 future (flush가 가져감)
+        # 통계
+        self.patches = 0     # 실제 PATCH 횟수
+        self.skipped = 0     # 내용이 같아서 생략된 파일 수
+
+    @staticmethod
+    def _digest(content):
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+    def remember(self, gist_id, name, content):
+        """원격에 이미 있는 내용 기록 (처음 불러온 데이터 등)"""
+        self._sent[(gist_id, name)] = self._digest(content)
+
+    def queue(self, gist_id, name, content):
+        """파일 내용을 다음 창에 등록 - 이벤트 루프가 없으면 False"""
+        if self._sent.get((gist_id, name)) == self._digest(content):
+            self._pending.get(gist_id, {}).pop(name, None)
+            self.skipped += 1
+            return True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        self._pending.setdefault(gist_id, {})[name] = content
+        if self._done is None:
+            self._done = loop.create_future()  # 이 창(아직 보내지 않은 변경)의 완료 future
+        self._schedule(loop)
+        return True
+
+    def _schedule(self, loop):
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._delayed_flush())
+
+    async def submit(self, gist_id, name, content):
+        """등록 후 그 파일을 실은 창의 PATCH가 끝날 때까지 대기"""
+        if not self.queue(gist_id, name, content):
+            return False
+        done = self._done if self._is_pending(gist_id, name) else None
+        if done is None:
+            return True
+        return await asyncio.shield(done)
+
+    def _is_pending(self, gist_id, name):
+        return name in self._pending.get(gist_id, {})
+
+    async def _delayed_flush(self):
+        # PATCH 중에 들어온 변경이나 실패해서 되돌아온 변경이 있으면 다음 창도 이어서 처리
+        while True:
+            await asyncio.sleep(self.window)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"[GistBatcher] 플러시 실패: {e}")
+            if not any(self._pending.values()):
+                return
+
+    async def flush(self, client=None):
+        """모인 변경을 gist마다 한 번의 PATCH로 전송 (이 창을 기다리던 submit에 결과 전달)"""
+        client = client or self.client or get_client()
+        pending, self._pending = self._pending, {}
+        done, self._done = self._done, None
+        ok = True
+        try:
+            for gist_id, files in pending.items():
+                if not files:
+                    continue
+                # 응답 전까지 원격 내용은 알 수 없음 - 보내는 중에 이전 내용으로 되돌린 변경도 생략하지 않도록
+                for name in files:
+                    self._sent.pop((gist_id, name), None)
+                try:
+                    patched = await client.patch(gist_id, files)
+                except Exception as e:
+                    logger.error(f"[GistBatcher] {gist_id} PATCH 오류: {e}")
+                    patched = False
+                if patched:
+                    self.patches += 1
+                    for name, content in files.items():
+                        self._sent[(gist_id, name)] = self._digest(content)
+                    logger.info(f"[GistBatcher] {gist_id} PATCH 완료: {', '.join(files)}")
+                else:
+                    ok = False
+                    # 실패한 파일은 다음 창에 다시 시도 (그 사이 들어온 최신 내용 우선)
+                    retry = self._pending.setdefault(gist_id, {})
+                    for name, content in files.items():
+                        retry.setdefault(name, content)
+        finally:
+            if done is not None and not done.done():
+                done.set_result(ok)
+        return ok
+
+    def flush_at_exit(self):
+        """종료 시 남은 변경 전송 (실행 중인 루프가 없을 때, 새 연결로)"""
+        if not any(self._pending.values()):
+            return True
+        try:
+            asyncio.get_running_loop()
+            return False  # 루프 안에서는 await flush() 사용
+        except RuntimeError:
+            pass
+
+        async def drain():
+            client = GistClient(token=getattr(self.client, "token", None))
+            try:
+                return await self.flush(client)
+            finally:
+                await client.close()
+
+        logger.info(f"[GistBatcher] 종료 전 남은 변경 전송: {', '.join(self._pending)}")
+        return asyncio.run(drain())
+
+
+_client = None
+_batcher = None
+
+
+def get_client():
+    """프로세스 전역 GistClient"""
+    global _client
+    if _client is None:
+        _client = GistClient()
+    return _client
+
+
+def get_batcher():
+    """프로세스 전역 GistBatcher"""
+    global _batcher
+    if _batcher is None:
+        _batcher = GistBatcher()
+        atexit.register(_batcher.flush_at_exit)  # FILE.update()가 배치로 미룬 변경이 남지 않도록
+    return _batcher
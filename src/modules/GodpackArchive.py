@@ -0,0 +1,161 @@
+"""
+GodpackArchive.py - 오래된 갓팩 기록을 월별 아카이브 파일로 분리
+검증이 끝난(Good/Bad/NaN) 기록 중 보존 기간(GODPACK_HOT_DAYS)보다 오래된 것은
+archive/godpack-YYYY-MM.json 으로 옮기고, 라이브 파일에는 최근 기록과 Yet만 남깁니다.
+아카이브 조회는 GodpackArchive.query()로 따로 합니다.
+
+아카이브를 먼저 쓰고 라이브 파일에서 지우므로 중간에 중단되면 기록은 두 파일에 함께 남을 수는 있어도
+어느 쪽에서도 사라지지 않습니다. 아카이브 병합은 멱등(같은 키는 라이브 값으로 덮어씀)이라
+다음 실행이 남은 기록을 다시 옮겨 정리합니다.
+"""
+
+import os
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+
+from . import Codec
+from .GodpackIndex import parse_key
+from .StorageIO import storage_io
+
+# 라이브 파일에 남길 기간 (recent_godpack이 4일을 다시 훑으므로 그보다 길게)
+HOT_DAYS = max(int(os.getenv('GODPACK_HOT_DAYS', '14')), 5)
+KST = timezone(timedelta(hours=9))
+ARCHIVE_PATTERN = re.compile(r"^godpack-(\d{4})-(\d{2})\.json$")
+
+
+def month_of(parsed):
+    """분해된 키의 월 ("2025-04")"""
+    return parsed.date[:7].replace('.', '-')
+
+
+def cold_keys(index, days=None, now=None):
+    """보존 기간이 지난 Good/Bad/NaN 키 목록 (Yet은 항상 유지)"""
+    days = HOT_DAYS if days is None else days
+    now = now or datetime.now(KST)
+    cutoff = (now - timedelta(days=days)).strftime("%Y.%m.%d %H:%M")
+    cold = []
+    for state in index.states():
+        if state == 'Yet':
+            continue
+        for key in index.keys_with_state(state):
+            parsed = index.parsed(key)
+            if parsed and f"{parsed.date} {parsed.time}" < cutoff:
+                cold.append(key)
+    return cold
+
+
+class GodpackArchive:
+    """월별 갓팩 아카이브 디렉토리"""
+
+    def __init__(self, archive_dir):
+        self.archive_dir = archive_dir
+        self._lock = threading.Lock()
+
+    def _path(self, month):
+        return os.path.join(self.archive_dir, f"godpack-{month}.json")
+
+    def months(self):
+        """아카이브된 월 목록 (오름차순)"""
+        if not os.path.isdir(self.archive_dir):
+            return []
+        months = []
+        for name in os.listdir(self.archive_dir):
+            match = ARCHIVE_PATTERN.match(name)
+            if match:
+                months.append(f"{match.group(1)}-{match.group(2)}")
+        return sorted(months)
+
+    def load(self, month):
+        """해당 월 아카이브 (없으면 빈 dict)"""
+        path = self._path(month)
+        if not os.path.exists(path):
+            return {}
+        try:
+            data, _ = Codec.read_file(path)
+        except ValueError:
+            return {}
+        return data
+
+    def add(self, entries):
+        """{키: 상태} 를 월별 파일에 병합 저장 (멱등 - 이미 있는 키는 새 상태로 덮어씀, 파일마다 원자적 교체)"""
+        by_month = {}
+        for key, value in entries.items():
+            parsed = parse_key(key)
+            if parsed:
+                by_month.setdefault(month_of(parsed), {})[key] = value
+        with self._lock:
+            os.makedirs(self.archive_dir, exist_ok=True)
+            for month, items in by_month.items():
+                path = self._path(month)
+                data = self.load(month)
+                data.update(items)
+                Codec.write_file(path, data)
+        return sum(len(items) for items in by_month.values())
+
+    def query(self, name=None, number=None, state=None, since=None, until=None):
+        """아카이브 조회 - since/until 은 "YYYY-MM" (해당 월 파일만 읽음)"""
+        result = {}
+        for month in self.months():
+            if (since and month < since) or (until and month > until):
+                continue
+            for key, value in self.load(month).items():
+                if state is not None and value != state:
+                    continue
+                if name is not None or number is not None:
+                    parsed = parse_key(key)
+                    if not parsed:
+                        continue
+                    if name is not None and parsed.name != name:
+                        continue
+                    if number is not None and parsed.number != number:
+                        continue
+                result[key] = value
+        return result
+
+    def get(self, key):
+        """키 하나의 상태 (해당 월 파일만 읽음)"""
+        parsed = parse_key(key)
+        if not parsed:
+            return None
+        return self.load(month_of(parsed)).get(key)
+
+
+class ArchivedGodpackMixin:
+    """INDEX가 있는 GODPACK 어댑터에 아카이브 분리 기능을 붙이는 믹스인"""
+
+    def _archive_dir(self):
+        raise NotImplementedError
+
+    @property
+    def ARCHIVE(self):
+        archive = self.__dict__.get('_archive')
+        if archive is None:
+            archive = self._archive = GodpackArchive(self._archive_dir())
+        return archive
+
+    def archive_cold(self, days=None, now=None):
+        """오래된 Good/Bad/NaN 기록을 아카이브로 옮기고 라이브 파일 저장 - 옮긴 개수 반환"""
+        keys = cold_keys(self.INDEX, days, now)
+        if not keys:
+            return 0
+        # 아카이브를 먼저 기록해야 중간에 실패해도 기록이 사라지지 않음
+        self.ARCHIVE.add({key: self.DATA[key] for key in keys})
+        for key in keys:
+            self.edit('-', key)
+        self.update()
+        return len(keys)
+
+    async def aarchive_cold(self, days=None, now=None):
+        """archive_cold()의 비동기 버전 - 아카이브 쓰기와 라이브 파일 저장을 storage_io에서"""
+        keys = cold_keys(self.INDEX, days, now)
+        if not keys:
+            return 0
+        entries = {key: self.DATA[key] for key in keys}
+        await storage_io.run(self.ARCHIVE.archive_dir, self.ARCHIVE.add, entries)
+        # 아카이브를 쓰는 동안 상태가 바뀐 키는 라이브에 남김 (다음 실행이 새 상태로 다시 옮김)
+        moved = [key for key, value in entries.items() if self.DATA.get(key) == value]
+        for key in moved:
+            self.edit('-', key)
+        await self.aupdate()
+        return len(moved)
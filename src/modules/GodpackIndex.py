@@ -0,0 +1,137 @@
+"""
+GodpackIndex.py - 갓팩 키 보조 인덱스
+갓팩 키("2025.04.06 05:58 name 735 20% 2P")를 edit 시점에 한 번만 분해해서
+(이름, 번호) -> 키, sub -> 키, 키 -> 포럼 제목, 상태 -> 키 조회를 O(1)로 제공합니다.
+Special 키는 퍼센트 자리에 카드 타입이 들어가며 여러 단어일 수 있습니다 ("... Palkia Full Art 1P").
+"""
+
+import re
+from collections import namedtuple
+
+GodpackKey = namedtuple("GodpackKey", ["date", "time", "name", "number", "percent", "pack"])
+
+# Special Card 타입 중 여러 단어인 것 (GISTAdapter.extract_Pseudo의 카드 타입)
+MULTI_WORD_TYPES = ("Double two star", "Full Art")
+# 날짜 시간 이름(공백 가능) 번호 퍼센트(또는 카드 타입) 팩
+_KEY = re.compile(r"^(\S+) (\S+) (.+?) (\S+) (\d+%|" + "|".join(map(re.escape, MULTI_WORD_TYPES))
+                  + r"|\S+) (\d+P)$")
+
+
+def parse_key(key):
+    """갓팩 키 분해 (형식이 다르면 None) - 이름에 공백이 있거나 카드 타입이 여러 단어여도 분해"""
+    match = _KEY.match(" ".join(key.split()))
+    if not match:
+        return None
+    return GodpackKey(*match.groups())
+
+
+class GodpackIndex:
+    """GODPACK 데이터의 메모리 인덱스 (edit 마다 갱신)"""
+
+    def __init__(self, data=None):
+        self.rebuild(data or {})
+
+    def rebuild(self, data):
+        """전체 데이터로 인덱스 재구성 (load 시)"""
+        self._parsed = {}       # 키 -> GodpackKey
+        self._by_nameber = {}   # (이름, 번호) -> {키: None} (순서 유지)
+        self._by_sub = {}       # "이름 번호 퍼센트 팩" -> 키
+        self._titles = {}       # 키 -> 포럼 제목
+        self._state = {}        # 키 -> 상태
+        self._by_state = {}     # 상태 -> {키: None}
+        self._unparsed = {}     # 형식이 달라 분해하지 못한 키 -> None (find는 부분 문자열로)
+        for key, value in data.items():
+            self.add(key, value)
+
+    def add(self, key, value):
+        """키 추가 또는 상태 변경"""
+        if key in self._state:
+            old = self._state[key]
+            if old == value:
+                return
+            self._by_state.get(old, {}).pop(key, None)
+        else:
+            parsed = parse_key(key)
+            if not parsed:
+                self._unparsed[key] = None
+            else:
+                self._parsed[key] = parsed
+                self._by_nameber.setdefault((parsed.name, parsed.number), {})[key] = None
+                self._by_sub[f"{parsed.name} {parsed.number} {parsed.percent} {parsed.pack}"] = key
+                self._titles[key] = (f"{parsed.name} {parsed.number} / {parsed.percent} / "
+                                     f"{parsed.pack} / {parsed.date} {parsed.time}")
+        self._state[key] = value
+        self._by_state.setdefault(value, {})[key] = None
+
+    def remove(self, key):
+        """키 제거"""
+        if key not in self._state:
+            return
+        self._by_state.get(self._state.pop(key), {}).pop(key, None)
+        self._unparsed.pop(key, None)
+        parsed = self._parsed.pop(key, None)
+        if parsed:
+            keys = self._by_nameber.get((parsed.name, parsed.number), {})
+            keys.pop(key, None)
+            if not keys:
+                self._by_nameber.pop((parsed.name, parsed.number), None)
+            sub = f"{parsed.name} {parsed.number} {parsed.percent} {parsed.pack}"
+            if self._by_sub.get(sub) == key:
+                del self._by_sub[sub]
+                # 같은 sub의 다른 키가 남아 있으면 그 키로 대체
+                other = next((k for k in keys if self._parsed[k].percent == parsed.percent
+                              and self._parsed[k].pack == parsed.pack), None)
+                if other:
+                    self._by_sub[sub] = other
+        self._titles.pop(key, None)
+
+    def find(self, name, number):
+        """(이름, 번호)에 해당하는 키 목록 (분해하지 못한 키는 기존처럼 "이름 번호" 부분 문자열로)"""
+        keys = list(self._by_nameber.get((name, number), {}))
+        if self._unparsed:
+            nameber = f"{name} {number}"
+            keys += [key for key in self._unparsed if nameber in key]
+        return keys
+
+    def find_sub(self, sub):
+        """"이름 번호 퍼센트 팩" 으로 기존 키 조회 (중복 검사용)"""
+        return self._by_sub.get(sub)
+
+    def title(self, key):
+        """키에 해당하는 포럼 제목 ("이름 번호 / 퍼센트 / 팩 / 날짜 시간")"""
+        return self._titles.get(key)
+
+    def parsed(self, key):
+        """분해된 키 (GodpackKey)"""
+        return self._parsed.get(key)
+
+    def states(self):
+        """현재 있는 상태 목록"""
+        return [state for state, keys in self._by_state.items() if keys]
+
+    def keys_with_state(self, state):
+        """상태(Yet/Good/Bad/NaN)별 키 목록"""
+        return list(self._by_state.get(state, {}))
+
+
+class IndexedGodpackMixin:
+    """JSON 어댑터에 GodpackIndex를 붙이는 믹스인 (load/edit 시 자동 갱신)"""
+
+    def __init__(self, *args, **kwargs):
+        self.INDEX = GodpackIndex()
+        super().__init__(*args, **kwargs)
+
+    def load(self):
+        super().load()
+        self.INDEX.rebuild(self.DATA)
+
+    async def aload(self):
+        await super().aload()
+        self.INDEX.rebuild(self.DATA)
+
+    def edit(self, mode, key, value=None):
+        super().edit(mode, key, value)
+        if mode == '+':
+            self.INDEX.add(key, value)
+        elif mode == '-':
+            self.INDEX.remove(key)
@@ -0,0 +1,215 @@
+"""
+HeartbeatParquet.py - Heartbeat 분석용 열 기반(Parquet) 저장소
+기록을 date=YYYY-MM-DD/ 파티션의 Parquet 파일로 모아 두고, pyarrow.dataset으로
+필요한 열/파티션만 읽어 집계합니다 (사용자별 JSONL 수천 개를 열지 않아도 됨).
+봇은 add()로 버퍼에 쌓고 flush()로 파티션마다 파일 하나씩 추가합니다.
+pyarrow가 설치되어 있지 않으면 AVAILABLE이 False이고 사용할 수 없습니다.
+"""
+
+import os
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = ds = pq = None
+
+logger = logging.getLogger(__name__)
+
+AVAILABLE = pa is not None
+FLUSH_ROWS = 5000  # 버퍼가 이만큼 쌓이면 add()에서 바로 기록
+
+# 열 이름 -> (pyarrow 타입 이름, 기록의 키)
+COLUMNS = {
+    "timestamp": ("timestamp", "timestamp"),
+    "user": ("string", None),
+    "source_group": ("string", "source_group"),
+    "barracks": ("int32", "barracks"),
+    "version": ("string", "version"),
+    "type": ("string", "type"),
+    "select": ("string", "select"),
+    "packs": ("int32", "packs"),
+    "time_minutes": ("int32", "time_minutes"),
+    "packs_per_min": ("float64", "packs_per_min"),
+}
+
+
+def _schema():
+    types = {"timestamp": pa.timestamp("us", tz="UTC"), "string": pa.string(),
+             "int32": pa.int32(), "float64": pa.float64()}
+    return pa.schema([(name, types[kind]) for name, (kind, _) in COLUMNS.items()])
+
+
+def _parse_ts(timestamp):
+    ts = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+def _row(user_name, record):
+    """Heartbeat 기록 -> 열 dict (형식이 맞지 않는 값은 None)"""
+    row = {"user": user_name}
+    for name, (kind, key) in COLUMNS.items():
+        if key is None:
+            continue
+        value = record.get(key)
+        if kind == "timestamp":
+            value = _parse_ts(value)
+        elif kind == "int32":
+            value = value if isinstance(value, int) else None
+        elif kind == "float64":
+            value = float(value) if isinstance(value, (int, float)) else None
+        elif value is not None:
+            value = str(value)
+        row[name] = value
+    return row
+
+
+class HeartbeatParquet:
+    """date=YYYY-MM-DD 파티션 Parquet 디렉토리"""
+
+    def __init__(self, root_dir, flush_rows=FLUSH_ROWS):
+        if not AVAILABLE:
+            raise RuntimeError("pyarrow가 설치되어 있지 않습니다 (pip install pyarrow)")
+        self.root_dir = root_dir
+        self.flush_rows = flush_rows
+        self.lock = threading.Lock()
+        self._buffer = []
+        self._seq = 0
+
+    # ---- 쓰기 ----
+    def add(self, user_name, record):
+        """기록 하나를 버퍼에 추가 (timestamp가 잘못된 기록은 건너뜀)"""
+        try:
+            self._buffer.append(_row(user_name, record))
+        except (AttributeError, TypeError, ValueError):
+            logger.debug(f"Parquet: 잘못된 timestamp 건너뜀 ({user_name}): {record.get('timestamp')}")
+            return
+        if len(self._buffer) >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        """버퍼를 날짜별 파티션 파일로 기록 -> 기록한 행 수"""
+        with self.lock:
+            rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+            by_date = {}
+            for row in rows:
+                by_date.setdefault(row["timestamp"].strftime("%Y-%m-%d"), []).append(row)
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S%f")
+            for date, date_rows in by_date.items():
+                self._seq += 1
+                self._write(date, f"part-{stamp}-{self._seq}.parquet",
+                            pa.Table.from_pylist(date_rows, schema=_schema()))
+            return len(rows)
+
+    def _write(self, date, filename, table):
+        partition = os.path.join(self.root_dir, f"date={date}")
+        os.makedirs(partition, exist_ok=True)
+        tmp_path = os.path.join(partition, f".{filename}.tmp")
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, os.path.join(partition, filename))
+
+    def export_store(self, store):
+        """HeartbeatStore 전체를 내보내기 -> 내보낸 행 수 (기존 파티션에 추가됨)
+        변환되지 않은 기존 <user>.json (Poke20 heartbeat_data20 등)은 읽기만 하고 그대로 둠
+        """
+        count = 0
+        for user_name in store.users():
+            for record in store.read(user_name):
+                self.add(user_name, record)
+                count += 1
+        for user_name in store.legacy_users():
+            try:
+                records = store.read_legacy(user_name)
+            except (ValueError, OSError) as e:
+                logger.warning(f"⚠️ 기존 Heartbeat 파일 읽기 실패 ({user_name}): {e}")
+                continue
+            for record in records:
+                self.add(user_name, record)
+                count += 1
+        self.flush()
+        return count
+
+    def compact(self, min_files=2):
+        """파일이 여러 개인 파티션을 하나로 합침 -> 합친 파티션 수"""
+        compacted = 0
+        for date in self.dates():
+            partition = os.path.join(self.root_dir, f"date={date}")
+            files = sorted(f for f in os.listdir(partition) if f.endswith(".parquet"))
+            if len(files) < min_files:
+                continue
+            with self.lock:
+                table = ds.dataset([os.path.join(partition, f) for f in files], format="parquet",
+                                   schema=_schema()).to_table()
+                table = table.sort_by([("user", "ascending"), ("timestamp", "ascending")])
+                # 새 파일을 먼저 기록 (중간에 실패하면 중복은 생겨도 기록은 사라지지 않음)
+                stamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S%f")
+                self._write(date, f"part-{stamp}-compacted.parquet", table)
+                for f in files:
+                    os.remove(os.path.join(partition, f))
+            compacted += 1
+        return compacted
+
+    # ---- 읽기 ----
+    def dates(self):
+        """파티션 날짜 목록 (오름차순)"""
+        if not os.path.isdir(self.root_dir):
+            return []
+        return sorted(name[len("date="):] for name in os.listdir(self.root_dir) if name.startswith("date="))
+
+    def query(self, columns=None, since=None, until=None, users=None, groups=None):
+        """조건에 맞는 행 -> pandas DataFrame
+        since/until 은 datetime (UTC) - 날짜 파티션 단위로 먼저 거르고 timestamp로 다시 거름
+        """
+        columns = list(columns or COLUMNS)
+        if not self.dates():
+            return pa.Table.from_pylist([], schema=_schema()).select(columns).to_pandas()
+        dataset = ds.dataset(self.root_dir, format="parquet", schema=_schema().append(pa.field("date", pa.string())),
+                             partitioning="hive", exclude_invalid_files=True)
+        conditions = []
+        if since is not None:
+            conditions += [ds.field("date") >= since.strftime("%Y-%m-%d"), ds.field("timestamp") >= since]
+        if until is not None:
+            conditions += [ds.field("date") <= until.strftime("%Y-%m-%d"), ds.field("timestamp") < until]
+        if users:
+            conditions.append(ds.field("user").isin(list(users)))
+        if groups:
+            conditions.append(ds.field("source_group").isin(list(groups)))
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+
+# ---- 자주 쓰는 집계 ----
+def barracks_per_group_hour(parquet, days=30, now=None):
+    """그룹별 시간당 배럭 합계 (사용자별로 그 시간의 최대 배럭을 더함)"""
+    now = now or datetime.now(timezone.utc)
+    df = parquet.query(columns=["timestamp", "user", "source_group", "barracks"], since=now - timedelta(days=days))
+    if df.empty:
+        return df.assign(hour=[])[["source_group", "hour", "barracks"]]
+    df["hour"] = df["timestamp"].dt.floor("h")
+    per_user = df.groupby(["source_group", "hour", "user"], as_index=False)["barracks"].max()
+    return per_user.groupby(["source_group", "hour"], as_index=False)["barracks"].sum()
+
+
+def packs_per_min_drop(parquet, recent_hours=24, baseline_days=7, threshold=0.2, now=None):
+    """최근 평균 packs/min이 기준 기간 평균보다 threshold 비율 이상 떨어진 사용자"""
+    now = now or datetime.now(timezone.utc)
+    recent_start = now - timedelta(hours=recent_hours)
+    df = parquet.query(columns=["timestamp", "user", "packs_per_min"],
+                       since=recent_start - timedelta(days=baseline_days), until=now)
+    df = df.dropna(subset=["packs_per_min"])
+    recent = df[df["timestamp"] >= recent_start].groupby("user")["packs_per_min"].mean()
+    baseline = df[df["timestamp"] < recent_start].groupby("user")["packs_per_min"].mean()
+    joined = baseline.to_frame("baseline").join(recent.to_frame("recent"), how="inner")
+    joined = joined[(joined["baseline"] > 0) & (joined["recent"] < joined["baseline"] * (1 - threshold))]
+    joined["change"] = (joined["recent"] / joined["baseline"] - 1).round(3)
+    return joined.reset_index().sort_values("change")
@@ -0,0 +1,121 @@
+"""
+HeartbeatParser.py - Heartbeat 메시지 파서 (Poke2 / GIST.USER 공용)
+메시지 줄을 한 번만 훑으며 미리 컴파일한 패턴으로 두 봇이 쓰던 값을 함께 뽑습니다.
+- Poke2 기준: 줄 맨 앞의 "Key:" (대소문자 무시), 같은 키는 처음 나온 줄 -> to_record()
+- GIST.USER.extract 기준: 키 이름이 줄 어디에든 있으면 (대소문자 구분), 나중 줄이 덮어씀 -> to_inform()
+"""
+
+import re
+from collections import namedtuple
+
+_NUMBER = re.compile(r'\d+')
+_WORD_NUMBER = re.compile(r'\b\d+\b')
+_BRACKET = re.compile(r"\(([^)]+)\)")
+# Poke2: "Time: 120m | Packs: 300 | Avg: 2.50 packs/min"
+_STATS = re.compile(r"Time:\s*(\d+)m\s*\|\s*Packs:\s*(\d+)\s*\|\s*Avg:\s*([\d.]+)\s*packs/min", re.IGNORECASE)
+# GIST: 구분자 없이 "Time: 0m Packs: 0 | Avg: ..." 형태도 허용
+_GIST_STATS = re.compile(r'Time:\s*(\d+)m.*?Packs:\s*(\d+).*?Avg:\s*([\d.]+)')
+_GIST_TYPE = re.compile(r"Type:\s*(\d+)")
+_GIST_SELECT = re.compile(r"Select:\s*(.*)")
+_GIST_OPENING = re.compile(r"Opening:\s*(.*)")
+
+Heartbeat = namedtuple("Heartbeat", [
+    "user_name",
+    # Poke2 기준 값
+    "barracks", "version", "type", "select", "stats",
+    # GIST.USER.extract 기준 값 (없으면 None)
+    "online_count", "gist_stats", "type_number", "methods", "select_list",
+])
+
+
+def _split_list(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def parse(content):
+    """메시지 내용 -> Heartbeat (한 번의 줄 순회)"""
+    lines = content.split("\n")
+    barracks, version, type_, select, opening, stats = 0, None, None, None, None, None
+    online_count = gist_stats = type_number = methods = select_list = None
+    online_seen = False
+
+    for line in lines:
+        # --- Poke2: 줄 맨 앞 키, 처음 나온 값 ---
+        head = line[:8].lower()
+        if not online_seen and line.lstrip()[:7].lower() == "online:":
+            online_seen = True
+            barracks = len(_WORD_NUMBER.findall(line.split(":", 1)[1]))
+        elif head.startswith("time:"):
+            if stats is None:
+                match = _STATS.match(line)
+                if match:
+                    stats = (int(match.group(1)), int(match.group(2)), float(match.group(3)))
+        elif head == "version:":
+            if version is None:
+                version = line[8:].strip()
+        elif head.startswith("type:"):
+            if type_ is None:
+                type_ = line[5:].strip()
+        elif head.startswith("select:"):
+            if select is None:
+                select = line[7:].strip()
+        elif head == "opening:":
+            if opening is None:
+                opening = line[8:].strip()
+
+        # --- GIST: 줄 어디든 키 이름, 나중 값이 덮어씀 ---
+        if 'Online' in line:
+            online_count = len(_NUMBER.findall(line))
+        if 'Time' in line:
+            match = _GIST_STATS.search(line)
+            if match:
+                gist_stats = (int(match.group(1)), int(match.group(2)), float(match.group(3)))
+        if 'Type' in line:
+            match = _GIST_TYPE.search(line)
+            type_number = int(match.group(1)) if match else None
+            methods = _BRACKET.findall(line)
+        if 'Select' in line:
+            match = _GIST_SELECT.search(line)
+            if match:
+                select_list = _split_list(match.group(1))
+        if 'Opening' in line:
+            match = _GIST_OPENING.search(line)
+            if match:
+                select_list = _split_list(match.group(1))
+
+    # Select와 Opening이 둘 다 있으면 더 긴 값
+    if select and opening:
+        select = opening if len(opening) >= len(select) else select
+    else:
+        select = opening or select
+
+    return Heartbeat(lines[0].strip(), barracks, 'Unknown' if version is None else version,
+                     'Unknown' if type_ is None else type_, select or 'Unknown',
+                     stats, online_count, gist_stats, type_number, methods, select_list)
+
+
+def to_record(heartbeat):
+    """Poke2 Heartbeat 기록 필드 dict"""
+    data = {'barracks': heartbeat.barracks, 'version': heartbeat.version,
+            'type': heartbeat.type, 'select': heartbeat.select}
+    if heartbeat.stats:
+        data['time_minutes'], data['packs'], data['packs_per_min'] = heartbeat.stats
+    return data
+
+
+def to_inform(heartbeat, created_at):
+    """GIST.USER.extract 형식 dict"""
+    inform = {'TIME': created_at}
+    if heartbeat.online_count is not None:
+        inform['BARRACKS'] = heartbeat.online_count
+    if heartbeat.gist_stats:
+        runtime, packs, avg = heartbeat.gist_stats
+        inform['RUNTIME'] = runtime
+        inform['PACKS'] = packs
+        inform['AVG'] = avg if runtime else float('nan')
+    if heartbeat.methods is not None:
+        inform['TYPE'] = heartbeat.type_number
+        inform['METHOD'] = heartbeat.methods
+    if heartbeat.select_list is not None:
+        inform['SELECT'] = heartbeat.select_list
+    return inform
@@ -0,0 +1,181 @@
+"""
+HeartbeatQueue.py - Discord 핸들러와 Heartbeat 저장 사이의 크기 제한 큐
+실시간(live) 메시지와 히스토리 따라잡기(backfill) 메시지를 같은 작업자들이 처리하되
+실시간을 항상 먼저 꺼내므로 재시작 직후의 대량 backfill이 실시간 처리를 밀어내지 않습니다.
+소스별 자리(maxsize)가 다 차면 put()이 기다리며(backpressure), 작업자는 여러 개를 묶어(batch) 처리합니다.
+채널별로 끝까지 처리된 위치(position)를 계산해 커서 저장에 씁니다.
+처리에 실패한 묶음의 메시지는 처리된 것으로 보지 않으므로, 커서는 그 앞에서 멈추고 재시작 시 다시 읽습니다.
+"""
+
+import time
+import asyncio
+import inspect
+import logging
+import itertools
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+LIVE = "live"
+BACKFILL = "backfill"
+_PRIORITY = {LIVE: 0, BACKFILL: 1}
+
+# channel_id/message_id: 커서 계산용, payload: 처리 함수에 넘길 값
+QueueItem = namedtuple("QueueItem", ["channel_id", "message_id", "payload", "source"])
+
+
+class HeartbeatQueue:
+    """live/backfill 두 소스를 가진 우선순위 배치 큐"""
+
+    def __init__(self, handler, workers=2, maxsize=1000, batch_size=100, batch_wait=0.05, after_batch=None):
+        """
+        Args:
+            handler: handler(items) - 묶음 하나 처리 -> 저장한 기록 수 (async 함수도 가능, 예외면 묶음 전체 실패)
+            after_batch: after_batch(items) - 처리 완료 표시 후 호출 (커서 저장 등, 실패한 묶음은 호출 안 함)
+            maxsize: 소스별 최대 대기 수 (넘으면 put()이 기다림)
+            batch_wait: 첫 항목을 꺼낸 뒤 더 모으려고 기다리는 시간 (초)
+        """
+        self.handler = handler
+        self.after_batch = after_batch
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self._queue = asyncio.PriorityQueue()
+        self._slots = {source: asyncio.Semaphore(maxsize) for source in _PRIORITY}
+        self._seq = itertools.count()
+        self._tasks = []
+        self._inflight = {}  # 채널 -> 아직 처리되지 않은 메시지 ID 집합
+        self._done = {}      # 채널 -> {소스: 처리된 가장 큰 메시지 ID}
+        self._failed = {}    # 채널 -> 처리에 실패한 가장 작은 메시지 ID (커서가 넘지 않음)
+        self._idle = asyncio.Condition()
+        self.stats = {"queued": {LIVE: 0, BACKFILL: 0}, "processed": 0, "stored": 0, "batches": 0,
+                      "errors": 0, "put_waits": 0, "put_wait_max_ms": 0.0}
+
+    # ---- 넣기 ----
+    async def put(self, channel_id, message_id, payload, source=LIVE):
+        """항목 추가 (소스의 자리가 없으면 빌 때까지 대기)"""
+        slots = self._slots[source]
+        start = time.monotonic()
+        if slots.locked():
+            self.stats["put_waits"] += 1
+        await slots.acquire()
+        waited_ms = (time.monotonic() - start) * 1000
+        self.stats["put_wait_max_ms"] = round(max(self.stats["put_wait_max_ms"], waited_ms), 1)
+        self._inflight.setdefault(channel_id, set()).add(message_id)
+        self.stats["queued"][source] += 1
+        item = QueueItem(channel_id, message_id, payload, source)
+        self._queue.put_nowait((_PRIORITY[source], next(self._seq), item))
+
+    def depth(self, source=None):
+        """대기 중인 항목 수 (source가 없으면 전체)"""
+        if source is None:
+            return self._queue.qsize()
+        return sum(1 for _, _, item in self._queue._queue if item.source == source)
+
+    # ---- 작업자 ----
+    def start(self):
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    async def stop(self, drain=True):
+        """작업자 종료 (drain이면 남은 항목을 모두 처리한 뒤)"""
+        if drain:
+            async with self._idle:
+                await self._idle.wait_for(lambda: not any(self._inflight.values()))
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _next_batch(self):
+        _, _, item = await self._queue.get()
+        batch = [item]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            if self._queue.empty():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    _, _, item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                _, _, item = self._queue.get_nowait()
+            batch.append(item)
+        return batch
+
+    async def _worker(self, number):
+        while True:
+            batch = await self._next_batch()
+            failed = False
+            try:
+                stored = self.handler(batch)
+                if inspect.isawaitable(stored):
+                    stored = await stored
+                self.stats["stored"] += stored or 0
+            except asyncio.CancelledError:
+                self._finish(batch, failed=True)
+                raise
+            except Exception as e:
+                failed = True
+                self.stats["errors"] += 1
+                logger.error(f"❌ Heartbeat 큐 작업자 {number} 처리 오류 ({len(batch)}개): {e}", exc_info=True)
+            self._finish(batch, failed)
+            if self.after_batch and not failed:
+                try:
+                    self.after_batch(batch)
+                except Exception as e:
+                    logger.error(f"❌ Heartbeat 큐 후처리 오류: {e}", exc_info=True)
+            async with self._idle:
+                self._idle.notify_all()
+
+    def _finish(self, batch, failed=False):
+        for item in batch:
+            self._inflight.get(item.channel_id, set()).discard(item.message_id)
+            if failed:
+                self._failed[item.channel_id] = min(self._failed.get(item.channel_id, item.message_id),
+                                                    item.message_id)
+            else:
+                done = self._done.setdefault(item.channel_id, {})
+                done[item.source] = max(done.get(item.source, 0), item.message_id)
+            self._slots[item.source].release()
+        self.stats["processed"] += len(batch)
+        self.stats["batches"] += 1
+
+    # ---- 위치/대기 ----
+    def position(self, channel_id, include_live=True):
+        """이 ID까지는 빠짐없이 처리됨 (커서로 저장해도 안전한 위치, 없으면 None)
+        include_live=False 이면 backfill 처리 위치만 봄 (따라잡기가 끝나기 전)
+        처리에 실패한 메시지가 있으면 그 앞까지만 (이번 실행 동안)
+        """
+        done = self._done.get(channel_id, {})
+        candidates = [done.get(BACKFILL)] + ([done.get(LIVE)] if include_live else [])
+        best = max((c for c in candidates if c), default=None)
+        inflight = self._inflight.get(channel_id)
+        if best is not None and inflight:
+            best = min(best, min(inflight) - 1)
+        if best is not None and channel_id in self._failed:
+            best = min(best, self._failed[channel_id] - 1)
+        return best
+
+    def scanned_position(self, channel_id, scanned_to):
+        """따라잡기 스캔이 scanned_to까지 끝나고 wait_channel() 뒤 커서로 저장해도 안전한 위치
+        Heartbeat가 아닌 끝 메시지까지 포함하되, 처리에 실패한 메시지가 있으면 그 앞까지만
+        """
+        if channel_id in self._failed:
+            return min(scanned_to, self._failed[channel_id] - 1)
+        return scanned_to
+
+    async def wait_channel(self, channel_id):
+        """채널의 대기/처리 중 항목이 모두 끝날 때까지 대기"""
+        async with self._idle:
+            await self._idle.wait_for(lambda: not self._inflight.get(channel_id))
+
+    def summary(self):
+        """로그용 상태 문자열"""
+        stats = self.stats
+        average = stats["processed"] / stats["batches"] if stats["batches"] else 0
+        return (f"대기 live {self.depth(LIVE)} / backfill {self.depth(BACKFILL)}, "
+                f"처리 {stats['processed']} (저장 {stats['stored']}), 평균 묶음 {average:.1f}, "
+                f"대기 발생 {stats['put_waits']}회 (최대 {stats['put_wait_max_ms']}ms), 오류 {stats['errors']}")
@@ -0,0 +1,198 @@
+"""
+HeartbeatRollup.py - Heartbeat 원본 보존 기간과 시간/일 단위 요약(rollup)
+보존 기간(HEARTBEAT_RAW_DAYS)이 지난 원본 기록은 rollup/<user>.json 의 시간별/일별 요약으로
+합치고 JSONL 파일에서 지웁니다. 시간별 요약은 HEARTBEAT_HOURLY_DAYS 동안, 일별 요약은 계속 보관합니다.
+장기 조회는 HeartbeatRollup.history()로 원본(최근) + 요약(과거)을 함께 읽습니다.
+"""
+
+import os
+import logging
+from datetime import datetime, timedelta, timezone
+
+try:
+    from . import Codec
+    from .HeartbeatStore import sanitize_filename
+except ImportError:  # 평면 import 지원
+    import Codec
+    from HeartbeatStore import sanitize_filename
+
+logger = logging.getLogger(__name__)
+
+RAW_DAYS = max(int(os.getenv('HEARTBEAT_RAW_DAYS', '14')), 1)        # 원본 기록 보존 기간
+HOURLY_DAYS = max(int(os.getenv('HEARTBEAT_HOURLY_DAYS', '90')), 1)  # 시간별 요약 보존 기간
+ONLINE_GAP_MINUTES = 15  # 연속 Heartbeat 간격 중 온라인으로 치는 최대치 (Poke2 오프라인 기준과 동일)
+
+HOUR_LEN = len("2025-04-01T10")
+DAY_LEN = len("2025-04-01")
+
+
+def _parse_ts(timestamp):
+    ts = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+def _empty():
+    return {"count": 0, "barracks_min": None, "barracks_max": None, "barracks_sum": 0,
+            "online_minutes": 0.0, "select": {}, "version": {}, "group": {}}
+
+
+def _merge(target, source):
+    """요약 두 개 합치기 (target 갱신)"""
+    target["count"] += source["count"]
+    for key, pick in (("barracks_min", min), ("barracks_max", max)):
+        values = [v for v in (target[key], source[key]) if v is not None]
+        target[key] = pick(values) if values else None
+    target["barracks_sum"] += source["barracks_sum"]
+    target["online_minutes"] = round(target["online_minutes"] + source["online_minutes"], 2)
+    for key in ("select", "version", "group"):
+        for value, count in source[key].items():
+            target[key][value] = target[key].get(value, 0) + count
+    return target
+
+
+def _dominant(counts):
+    return max(counts.items(), key=lambda item: item[1])[0] if counts else None
+
+
+def summarize(bucket):
+    """저장된 요약 -> 조회용 값 (평균, 가장 많이 쓴 pack_select/version/그룹)"""
+    count = bucket["count"]
+    return {
+        "count": count,
+        "barracks_min": bucket["barracks_min"],
+        "barracks_max": bucket["barracks_max"],
+        "barracks_avg": round(bucket["barracks_sum"] / count, 2) if count else None,
+        "online_minutes": bucket["online_minutes"],
+        "pack_select": _dominant(bucket["select"]),
+        "version": _dominant(bucket["version"]),
+        "source_group": _dominant(bucket["group"]),
+    }
+
+
+def aggregate(records, key_len, following=None):
+    """기록 목록(시간순) -> {구간: 요약}. following은 목록 다음 기록 (마지막 간격 계산용)"""
+    buckets = {}
+    for i, record in enumerate(records):
+        timestamp = record.get('timestamp')
+        if not timestamp:
+            continue
+        bucket = buckets.setdefault(timestamp[:key_len], _empty())
+        bucket["count"] += 1
+        barracks = record.get('barracks')
+        if isinstance(barracks, int):
+            bucket["barracks_min"] = barracks if bucket["barracks_min"] is None else min(bucket["barracks_min"], barracks)
+            bucket["barracks_max"] = barracks if bucket["barracks_max"] is None else max(bucket["barracks_max"], barracks)
+            bucket["barracks_sum"] += barracks
+        for key, field in (("select", 'select'), ("version", 'version'), ("group", 'source_group')):
+            value = record.get(field)
+            if value:
+                bucket[key][value] = bucket[key].get(value, 0) + 1
+        nxt = records[i + 1] if i + 1 < len(records) else following
+        if nxt and nxt.get('timestamp'):
+            try:
+                gap = (_parse_ts(nxt['timestamp']) - _parse_ts(timestamp)).total_seconds() / 60
+            except ValueError:
+                gap = 0
+            bucket["online_minutes"] = round(bucket["online_minutes"] + min(max(gap, 0), ONLINE_GAP_MINUTES), 2)
+    return buckets
+
+
+class HeartbeatRollup:
+    """HeartbeatStore 디렉토리의 rollup/<user>.json 관리"""
+
+    def __init__(self, store, raw_days=None, hourly_days=None):
+        self.store = store
+        self.rollup_dir = os.path.join(store.data_dir, "rollup")
+        self.raw_days = RAW_DAYS if raw_days is None else raw_days
+        self.hourly_days = HOURLY_DAYS if hourly_days is None else hourly_days
+
+    def _path(self, user_name):
+        return os.path.join(self.rollup_dir, sanitize_filename(user_name) + ".json")
+
+    def load(self, user_name):
+        """{"hourly": {구간: 요약}, "daily": {구간: 요약}}"""
+        path = self._path(user_name)
+        if os.path.exists(path):
+            try:
+                data, _ = Codec.read_file(path)
+                if isinstance(data, dict):
+                    data.setdefault("hourly", {})
+                    data.setdefault("daily", {})
+                    return data
+            except ValueError as e:
+                logger.warning(f"⚠️ Heartbeat 요약 파일 읽기 실패 ({path}): {e}")
+        return {"hourly": {}, "daily": {}}
+
+    def roll_up(self, user_name, now=None):
+        """보존 기간이 지난 원본을 요약으로 옮김 -> 옮긴 기록 수"""
+        now = now or datetime.now(timezone.utc)
+        # 시간 경계에서 자르면 시간별 요약이 한 번에 완성됨
+        cutoff = (now - timedelta(days=self.raw_days)).strftime("%Y-%m-%dT%H")
+        with self.store.user_lock(user_name):  # 읽고 다시 쓰는 사이에 추가된 기록이 사라지지 않도록
+            return self._roll_up(user_name, now, cutoff)
+
+    def _roll_up(self, user_name, now, cutoff):
+        records = self.store.read(user_name)
+        split = 0
+        while split < len(records) and records[split]['timestamp'][:HOUR_LEN] < cutoff:
+            split += 1
+        if not split:
+            return 0
+        old, keep = records[:split], records[split:]
+        following = keep[0] if keep else None
+
+        rollup = self.load(user_name)
+        for key, key_len in (("hourly", HOUR_LEN), ("daily", DAY_LEN)):
+            for bucket, summary in aggregate(old, key_len, following).items():
+                if bucket in rollup[key]:
+                    _merge(rollup[key][bucket], summary)
+                else:
+                    rollup[key][bucket] = summary
+        hourly_cutoff = (now - timedelta(days=self.hourly_days)).strftime("%Y-%m-%dT%H")
+        rollup["hourly"] = {b: v for b, v in rollup["hourly"].items() if b >= hourly_cutoff}
+
+        # 요약을 먼저 기록해야 중간에 실패해도 기록이 사라지지 않음
+        os.makedirs(self.rollup_dir, exist_ok=True)
+        Codec.write_file(self._path(user_name), rollup)
+        self.store.write(user_name, keep)
+        return len(old)
+
+    def run(self, now=None):
+        """전체 사용자 처리 -> {사용자: 옮긴 기록 수} (옮긴 것이 있는 사용자만)"""
+        moved = {}
+        for user_name in self.store.users():
+            try:
+                count = self.roll_up(user_name, now)
+            except (OSError, ValueError) as e:
+                logger.error(f"❌ Heartbeat 요약 실패 ({user_name}): {e}")
+                continue
+            if count:
+                moved[user_name] = count
+        return moved
+
+    def history(self, user_name, since=None, resolution="hourly"):
+        """원본(최근) + 요약(과거)을 시간순으로 -> [{"bucket" 또는 "timestamp": ..., ...}]
+        since는 ISO 문자열 (구간 비교는 앞부분 길이만큼). resolution은 "hourly" 또는 "daily"
+        """
+        rollup = self.load(user_name)
+        buckets = rollup[resolution]
+        if resolution == "hourly" and rollup["daily"]:
+            # 시간별 보존 기간이 지난 구간은 일별 요약으로 채움
+            first_hour = min(buckets) if buckets else None
+            older = [(day, summary) for day, summary in rollup["daily"].items()
+                     if first_hour is None or day < first_hour[:DAY_LEN]]
+        else:
+            older = []
+        rows = []
+        for bucket, summary in sorted(older) + sorted(buckets.items()):
+            if since and bucket < since[:len(bucket)]:
+                continue
+            rows.append({"bucket": bucket, **summarize(summary)})
+        # 원본에는 요약 시점의 보존 경계 이후 기록만 남아 있음
+        for record in self.store.read(user_name):
+            if since and record.get('timestamp', '') < since:
+                continue
+            rows.append(record)
+        return rows
@@ -0,0 +1,459 @@
+"""
+HeartbeatStore.py - 사용자별 추가 전용(JSONL) Heartbeat 기록 저장소
+Heartbeat 하나는 <user>.jsonl 에 한 줄 추가로 끝나므로 기록 길이와 무관하게 비용이 일정합니다.
+사용자별 최신 기록(high-water mark)과 최근 timestamp N개(중복 확인 창)는 메모리에 두고,
+재시작 시 파일 끝부분에서 다시 만듭니다. 순서가 뒤바뀐 추가가 있었던 파일만
+주기적으로 정렬/중복 제거(compaction)합니다.
+
+_manifest.json 은 사용자별 {최신 기록, 파일 크기(다음 추가 위치), 기록 수}입니다.
+사용자 파일에 추가한 뒤 변경을 _manifest.log 에 한 줄씩 기록하고, 로그가 커지면
+매니페스트를 원자적으로 교체한 뒤 로그를 비웁니다(checkpoint).
+추가와 로그 기록 사이에 중단되면 매니페스트의 파일 크기가 실제와 달라지므로,
+시작 시에는 두 파일과 각 파일 크기(stat)만 확인하고 크기가 어긋난 사용자만 다시 읽습니다.
+"""
+
+import os
+import re
+import json
+import logging
+import bisect
+import threading
+
+try:
+    from . import Codec
+except ImportError:  # 평면 import 지원
+    import Codec
+
+logger = logging.getLogger(__name__)
+
+LOG_SUFFIX = ".jsonl"
+TAIL_BYTES = 32768  # 최신 기록/중복 확인 창을 만들 때 읽는 파일 끝 크기
+DEDUP_WINDOW = max(int(os.getenv('HEARTBEAT_DEDUP_WINDOW', '64')), 1)  # 사용자별로 기억할 최근 timestamp 수
+MANIFEST_NAME = "_manifest.json"
+MANIFEST_LOG_NAME = "_manifest.log"
+CHECKPOINT_BYTES = 1024 * 1024  # 매니페스트 로그가 이보다 커지면 compact()에서 체크포인트
+
+
+def sanitize_filename(name):
+    """사용자 이름을 안전한 파일명으로 변환 (Poke2와 동일)"""
+    name = re.sub(r'[\\/:*?"<>|]', '_', name)
+    return name[:100]
+
+
+def _is_legacy_name(filename):
+    """기존 <user>.json (리스트) 파일인지 (매니페스트/_last.json 제외)"""
+    return filename.endswith(".json") and not filename.startswith("_") and not filename.endswith("_last.json")
+
+
+def _dumps(record):
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+def _count_lines(path):
+    """파일의 줄 수 (매니페스트가 없을 때 한 번만)"""
+    count = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            count += chunk.count(b'\n')
+    return count
+
+
+def _parse_lines(raw, key='timestamp'):
+    """JSONL 바이트 -> 기록 목록 (잘린 줄/형식 오류는 건너뜀)"""
+    records = []
+    for line in raw.splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict) and key in record:
+            records.append(record)
+    return records
+
+
+class HeartbeatStore:
+    """heartbeat_data 디렉토리의 사용자별 JSONL 기록"""
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self.lock = threading.Lock()
+        # 메모리 상태는 모두 파일명(sanitize_filename) 기준 - 매니페스트/파일 목록과 같은 키
+        self._latest = {}      # 파일명 -> 최신 기록
+        self._recent = {}      # 파일명 -> 최근 timestamp N개 (오름차순)
+        self._complete = set()  # 중복 확인 창에 파일의 모든 timestamp가 들어 있는 파일명
+        self._unsorted = set()  # 순서가 뒤바뀐 추가가 있었던 파일명 (compaction 대상)
+        self._names = {}       # 파일명 -> 원래 사용자 이름 (파일명과 다를 때 load_latest/snapshot에 사용)
+        self._manifest = {}    # 파일명 -> {"latest": 기록, "size": 파일 크기, "count": 기록 수, "name": 이름}
+        self._manifest_loaded = False
+        self._manifest_complete = False  # 매니페스트에 모든 파일이 들어 있는지 (아니면 체크포인트 전에 스캔)
+        self._user_locks = {}  # 파일명 -> RLock (같은 사용자 파일의 추가/다시 쓰기를 스레드 간 직렬화)
+
+    def user_lock(self, user_name):
+        """사용자 파일 잠금 (읽고 다시 쓰는 작업 중 다른 스레드의 추가가 끼어들지 않도록)"""
+        return self._user_locks.setdefault(sanitize_filename(user_name), threading.RLock())
+
+    def _key(self, user_name):
+        """메모리/매니페스트 키 (파일명), 원래 이름이 다르면 기억"""
+        key = sanitize_filename(user_name)
+        if user_name != key:
+            self._names[key] = user_name
+        return key
+
+    def display_name(self, key):
+        """파일명 -> 원래 사용자 이름 (모르면 파일명)"""
+        if key not in self._names and not self._manifest_loaded:
+            self._load_manifest()
+        return self._names.get(key, key)
+
+    def path(self, user_name):
+        return os.path.join(self.data_dir, sanitize_filename(user_name) + LOG_SUFFIX)
+
+    def users(self):
+        """JSONL 기록이 있는 사용자 목록 (파일명 기준)"""
+        if not os.path.isdir(self.data_dir):
+            return []
+        return sorted(name[:-len(LOG_SUFFIX)] for name in os.listdir(self.data_dir) if name.endswith(LOG_SUFFIX))
+
+    def legacy_users(self):
+        """JSONL로 변환되지 않은 기존 <user>.json 사용자 목록 (Poke20 heartbeat_data20 등)"""
+        if not os.path.isdir(self.data_dir):
+            return []
+        converted = set(self.users())
+        return sorted(name[:-len(".json")] for name in os.listdir(self.data_dir)
+                      if _is_legacy_name(name) and name[:-len(".json")] not in converted)
+
+    def _legacy_path(self, user_name):
+        return os.path.join(self.data_dir, sanitize_filename(user_name) + ".json")
+
+    def read_legacy(self, user_name):
+        """기존 <user>.json 리스트를 변환하지 않고 읽기 (시간순, 파일은 그대로 둠)"""
+        data, _ = Codec.read_file(self._legacy_path(user_name))
+        records = [r for r in data if isinstance(r, dict) and 'timestamp' in r] if isinstance(data, list) else []
+        records.sort(key=lambda r: r.get('timestamp', ''))
+        return records
+
+    # ---- 읽기 ----
+    def read(self, user_name):
+        """사용자의 전체 기록 (시간순)"""
+        self._migrate(user_name)
+        path = self.path(user_name)
+        if not os.path.exists(path):
+            return []
+        with open(path, 'rb') as f:
+            records = _parse_lines(f.read())
+        records.sort(key=lambda r: r.get('timestamp', ''))
+        return records
+
+    def _read_tail(self, path):
+        """파일 끝부분의 기록 -> (기록 목록, 파일 전체를 읽었는지)"""
+        try:
+            with open(path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                size = f.tell()
+                f.seek(max(0, size - TAIL_BYTES))
+                raw = f.read()
+        except OSError:
+            return [], True
+        if size > TAIL_BYTES:
+            raw = raw.split(b'\n', 1)[-1]  # 잘린 첫 줄 제거
+        return _parse_lines(raw), size <= TAIL_BYTES
+
+    def _remember(self, user_name, records, complete):
+        """파일 끝부분 기록으로 최신 기록과 중복 확인 창 설정"""
+        user_name = self._key(user_name)
+        stamps = sorted({r.get('timestamp', '') for r in records})
+        if len(stamps) > DEDUP_WINDOW:
+            stamps, complete = stamps[-DEDUP_WINDOW:], False
+        self._recent[user_name] = stamps
+        if complete:
+            self._complete.add(user_name)
+        else:
+            self._complete.discard(user_name)
+        if records:
+            self._latest[user_name] = max(records, key=lambda r: r.get('timestamp', ''))
+        else:
+            self._latest.pop(user_name, None)
+
+    def _load(self, user_name):
+        """아직 메모리에 없는 사용자의 최신 기록/중복 확인 창을 파일에서 읽기"""
+        if self._key(user_name) not in self._recent:
+            self._migrate(user_name)
+            self._remember(user_name, *self._read_tail(self.path(user_name)))
+
+    def latest(self, user_name):
+        """사용자의 최신 기록 (메모리, 없으면 파일 끝에서)"""
+        self._load(user_name)
+        return self._latest.get(self._key(user_name))
+
+    def load_latest(self):
+        """디렉토리 전체의 {사용자: 최신 기록}
+        매니페스트가 있으면 매니페스트+로그만 읽고, 없으면 (기존 .json 변환 후) 각 파일 끝부분을 읽어 매니페스트 생성
+        """
+        if not os.path.isdir(self.data_dir):
+            return {}
+        if self._load_manifest():
+            with self.lock:
+                self._reconcile()
+            return {self._names.get(key, key): entry["latest"]
+                    for key, entry in self._manifest.items() if entry.get("latest")}
+        for filename in os.listdir(self.data_dir):
+            if _is_legacy_name(filename):
+                self._migrate(filename[:-len(".json")])
+        for filename in os.listdir(self.data_dir):
+            if filename.endswith(LOG_SUFFIX):
+                user_name = filename[:-len(LOG_SUFFIX)]
+                path = os.path.join(self.data_dir, filename)
+                self._remember(user_name, *self._read_tail(path))
+                self._manifest[user_name] = {"latest": self._latest.get(user_name),
+                                             "size": os.path.getsize(path), "count": _count_lines(path),
+                                             "name": self._names.get(user_name)}
+        self._manifest_complete = True
+        self.checkpoint()
+        return {self._names.get(key, key): record for key, record in self._latest.items()}
+
+    def high_water_mark(self):
+        """전체 사용자 중 가장 최신 timestamp (메모리의 최신 기록 + 매니페스트, 없으면 None)"""
+        # 다른 스레드가 추가 중일 수 있으므로 복사본으로 순회
+        stamps = [record.get('timestamp', '') for record in list(self._latest.values()) if record]
+        stamps += [entry["latest"].get('timestamp', '') for entry in list(self._manifest.values())
+                   if entry.get("latest")]
+        return max(stamps, default=None)
+
+    def manifest(self, user_name):
+        """사용자의 매니페스트 항목 {"latest", "size", "count"} (없으면 None)"""
+        return self._manifest.get(sanitize_filename(user_name))
+
+    # ---- 매니페스트 ----
+    def _manifest_path(self, name):
+        return os.path.join(self.data_dir, name)
+
+    def _load_manifest(self):
+        """매니페스트 + 로그 재생 -> 매니페스트를 썼는지"""
+        path = self._manifest_path(MANIFEST_NAME)
+        log_path = self._manifest_path(MANIFEST_LOG_NAME)
+        self._manifest_loaded = True
+        if not os.path.exists(path):
+            return False  # 전체 스캔 후 체크포인트로 처음 만들어짐 (로그만 있으면 불완전)
+        try:
+            data, _ = Codec.read_file(path)
+            manifest = dict(data.get("users", {}))
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"⚠️ Heartbeat 매니페스트 읽기 실패, 전체 스캔으로 대체: {e}")
+            return False
+        if os.path.exists(log_path):
+            with open(log_path, 'rb') as f:
+                for entry in _parse_lines(f.read(), key='u'):
+                    manifest[entry['u']] = {"latest": entry.get('r'), "size": entry.get('s', 0),
+                                            "count": entry.get('c', 0), "name": entry.get('n')}
+        self._manifest = manifest
+        self._manifest_complete = True
+        for key, entry in manifest.items():
+            if entry.get("name"):
+                self._names.setdefault(key, entry["name"])
+            if entry.get("latest") and key not in self._recent:
+                self._latest[key] = entry["latest"]
+        return True
+
+    def _reconcile(self):
+        """매니페스트에 없거나 크기가 실제 파일과 다른 사용자만 파일 끝부분을 다시 읽어 항목 갱신 (잠금 안에서 호출)
+        -> 갱신한 사용자 수 (파일 추가 뒤 로그 기록 전에 중단된 경우)
+        """
+        sizes = {}
+        if os.path.isdir(self.data_dir):
+            for filename in os.listdir(self.data_dir):
+                if filename.endswith(LOG_SUFFIX):
+                    try:
+                        sizes[filename[:-len(LOG_SUFFIX)]] = os.path.getsize(os.path.join(self.data_dir, filename))
+                    except OSError:
+                        pass
+        for key in [key for key in self._manifest if key not in sizes]:
+            del self._manifest[key]  # 파일이 없어진 사용자
+        changed = 0
+        for key, size in sizes.items():
+            entry = self._manifest.get(key)
+            if entry is not None and entry.get("size") == size:
+                continue
+            path = os.path.join(self.data_dir, key + LOG_SUFFIX)
+            records, _ = self._read_tail(path)
+            latest = max(records, key=lambda r: r.get('timestamp', '')) if records else None
+            self._manifest[key] = {"latest": latest, "size": size, "count": _count_lines(path),
+                                   "name": self._names.get(key)}
+            if latest and key not in self._recent:
+                self._latest[key] = latest
+            changed += 1
+        if changed:
+            logger.info(f"🔧 Heartbeat 매니페스트 보정: {changed}명 (파일 크기 불일치/누락)")
+        self._manifest_complete = True
+        return changed
+
+    def _log_manifest(self, user_name, latest, size, count):
+        """사용자 파일을 쓴 뒤 매니페스트 변경을 로그에 추가 (잠금 안에서 호출)"""
+        key = self._key(user_name)
+        name = self._names.get(key)
+        self._manifest[key] = {"latest": latest, "size": size, "count": count, "name": name}
+        with open(self._manifest_path(MANIFEST_LOG_NAME), 'ab') as f:
+            f.write(_dumps({"u": key, "r": latest, "s": size, "c": count, "n": name}).encode('utf-8'))
+
+    def checkpoint(self):
+        """매니페스트를 원자적으로 교체하고 로그 비우기
+        매니페스트 없이 시작해 추가된 사용자만 알고 있으면 먼저 전체 파일을 확인 (일부만 담긴 매니페스트 방지)
+        """
+        with self.lock:
+            os.makedirs(self.data_dir, exist_ok=True)
+            if not self._manifest_complete:
+                self._reconcile()
+            Codec.write_file(self._manifest_path(MANIFEST_NAME), {"users": self._manifest}, indent=None)
+            # 교체 후 중단되어도 로그 재생 결과는 매니페스트와 같음
+            with open(self._manifest_path(MANIFEST_LOG_NAME), 'wb'):
+                pass
+
+    def snapshot(self):
+        """메모리 상태 (최신 기록 + 중복 확인 창) -> {사용자: {...}} (StateSnapshot 저장용)"""
+        return {self._names.get(key, key): {"latest": self._latest.get(key), "recent": list(recent),
+                                            "complete": key in self._complete}
+                for key, recent in list(self._recent.items())}
+
+    def restore(self, state, skip=()):
+        """snapshot() 결과로 메모리 상태 복원 -> 복원한 사용자 수 (skip은 파일을 다시 읽을 사용자의 파일명)
+        이미 메모리에 있는 사용자(복원 전에 들어온 Heartbeat)는 창을 합치고 더 새로운 최신 기록을 유지
+        """
+        restored = 0
+        for user_name, entry in state.items():
+            if sanitize_filename(user_name) in skip or not isinstance(entry, dict):
+                continue
+            with self.user_lock(user_name):  # 작업자 스레드가 같은 사용자를 추가 중일 수 있음
+                user_name = self._key(user_name)
+                saved = entry.get("recent") or []
+                complete = bool(entry.get("complete"))
+                current = self._recent.get(user_name)
+                if current is not None:
+                    complete = complete and user_name in self._complete
+                merged = sorted(set(saved) | set(current or []))
+                recent = merged[-DEDUP_WINDOW:]
+                self._recent[user_name] = recent
+                if complete and len(recent) == len(merged):
+                    self._complete.add(user_name)
+                else:
+                    self._complete.discard(user_name)
+                latest = self._latest.get(user_name)
+                if entry.get("latest") and (latest is None or
+                                            entry["latest"].get('timestamp', '') > latest.get('timestamp', '')):
+                    self._latest[user_name] = entry["latest"]
+            restored += 1
+        return restored
+
+    def is_duplicate(self, user_name, timestamp):
+        """이미 기록된 timestamp인지 (대부분 메모리의 창에서 확인)"""
+        self._load(user_name)
+        key = self._key(user_name)
+        recent = self._recent[key]
+        i = bisect.bisect_left(recent, timestamp)
+        if i < len(recent) and recent[i] == timestamp:
+            return True
+        if i > 0 or key in self._complete:
+            return False  # 창 범위 안인데 없거나, 창이 파일 전체를 담고 있음
+        # 창보다 오래된 기록 (드묾) - 파일에서 확인
+        return any(r.get('timestamp') == timestamp for r in self.read(user_name))
+
+    # ---- 쓰기 ----
+    def append(self, user_name, record):
+        """기록 한 줄 추가 - 같은 timestamp가 이미 있으면 False"""
+        return bool(self.append_many(user_name, [record]))
+
+    def append_many(self, user_name, records):
+        """여러 기록을 한 번의 쓰기로 추가 -> 실제로 추가된 기록 목록 (중복 timestamp 제외)"""
+        with self.user_lock(user_name):
+            key = self._key(user_name)
+            added = []
+            for record in records:
+                timestamp = record['timestamp']
+                if self.is_duplicate(user_name, timestamp):
+                    continue
+                latest = self._latest.get(key)
+                if latest is None or timestamp > latest.get('timestamp', ''):
+                    self._latest[key] = record
+                else:
+                    self._unsorted.add(key)  # 나중에 정렬
+                recent = self._recent[key]
+                bisect.insort(recent, timestamp)
+                if len(recent) > DEDUP_WINDOW:
+                    del recent[0]
+                    self._complete.discard(key)
+                added.append(record)
+            if not added:
+                return added
+            with self.lock:
+                os.makedirs(self.data_dir, exist_ok=True)
+                path = self.path(user_name)
+                if not self._manifest_loaded:
+                    self._load_manifest()
+                entry = self._manifest.get(key)
+                with open(path, 'a+b') as f:
+                    data = b''.join(_dumps(record).encode('utf-8') for record in added)
+                    if f.seek(0, os.SEEK_END) > 0:
+                        f.seek(-1, os.SEEK_END)
+                        if f.read(1) != b'\n':  # 중단으로 잘린 마지막 줄과 붙지 않도록
+                            data = b'\n' + data
+                    f.write(data)
+                    size = f.tell()
+                if entry is None or entry.get("size", 0) + len(data) != size:
+                    count = _count_lines(path)  # 매니페스트에 없거나 어긋난 파일 (드묾)
+                else:
+                    count = entry.get("count", 0) + len(added)
+                self._log_manifest(user_name, self._latest.get(key), size, count)
+            return added
+
+    def write(self, user_name, records):
+        """전체 기록을 시간순으로 다시 쓰기 (timestamp 중복 제거)"""
+        with self.user_lock(user_name):
+            unique = {}
+            for record in records:
+                unique[record.get('timestamp', '')] = record
+            ordered = [unique[ts] for ts in sorted(unique)]
+            path = self.path(user_name)
+            with self.lock:
+                os.makedirs(self.data_dir, exist_ok=True)
+                tmp_path = path + '.tmp'
+                data = ''.join(_dumps(r) for r in ordered).encode('utf-8')
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+                self._log_manifest(user_name, ordered[-1] if ordered else None, len(data), len(ordered))
+            self._remember(user_name, ordered, True)
+            self._unsorted.discard(self._key(user_name))
+            return True
+
+    def compact(self):
+        """순서가 뒤바뀐 파일 정렬/중복 제거 (매니페스트 로그가 크면 체크포인트) -> 정리한 사용자 수"""
+        users = list(self._unsorted)
+        for user_name in users:
+            try:
+                with self.user_lock(user_name):
+                    self.write(user_name, self.read(user_name))
+            except OSError as e:
+                logger.error(f"❌ Heartbeat 파일 정리 실패 ({user_name}): {e}")
+        try:
+            if os.path.getsize(self._manifest_path(MANIFEST_LOG_NAME)) > CHECKPOINT_BYTES:
+                self.checkpoint()
+        except OSError:
+            pass
+        return len(users)
+
+    def _migrate(self, user_name):
+        """기존 <user>.json (리스트) 파일을 JSONL로 변환 (1회)"""
+        legacy = self._legacy_path(user_name)
+        if not os.path.exists(legacy) or os.path.exists(self.path(user_name)):
+            return
+        try:
+            records = self.read_legacy(user_name)
+        except (ValueError, OSError) as e:
+            logger.warning(f"⚠️ 기존 Heartbeat 파일 변환 실패 ({legacy}): {e}")
+            return
+        self.write(user_name, records)
+        os.remove(legacy)
+        last_path = legacy[:-len(".json")] + "_last.json"
+        if os.path.exists(last_path):
+            os.remove(last_path)
+        logger.info(f"📦 Heartbeat 파일 JSONL 변환: {os.path.basename(legacy)} ({len(records)}개)")
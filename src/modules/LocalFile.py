@@ -5,10 +5,56 @@ GIST.py와 동일한 인터페이스를 제공하여 GitHub Gist 대신 로컬 
 
 import os
 import json
+import time
 import datetime
+import shutil
 from typing import Union, List, Dict, Any
 import threading
 
+try:
+    from .FileCache import read_cache
+    from .StorageIO import storage_io
+    from . import Codec
+except ImportError:  # LocalFileAdapter 등 평면 import 지원
+    from FileCache import read_cache
+    from StorageIO import storage_io
+    import Codec
+
+# 저널 모드 설정 (STORAGE_JOURNAL=true 이면 edit 마다 로그 한 줄만 추가)
+JOURNAL_MODE = os.getenv('STORAGE_JOURNAL', 'false').lower() == 'true'
+JOURNAL_MAX_BYTES = int(os.getenv('JOURNAL_MAX_BYTES', str(1024 * 1024)))  # 로그 크기 임계값
+JOURNAL_MAX_AGE = int(os.getenv('JOURNAL_MAX_AGE', '3600'))                 # 로그 나이 임계값 (초)
+
+# 백업 설정 (스냅샷 보존 개수: 시간/일/주 단위)
+BACKUP_GROUPS = ['common', 'group7', 'group8']
+BACKUP_NAME_FORMAT = "%Y%m%d_%H%M%S"
+BACKUP_KEEP_HOURLY = int(os.getenv('BACKUP_KEEP_HOURLY', '24'))
+BACKUP_KEEP_DAILY = int(os.getenv('BACKUP_KEEP_DAILY', '7'))
+BACKUP_KEEP_WEEKLY = int(os.getenv('BACKUP_KEEP_WEEKLY', '4'))
+
+
+def _parse_snapshot(name: str):
+    """스냅샷 이름 -> 생성 시각 (형식이 다르면 None)"""
+    try:
+        return datetime.datetime.strptime(name[:15], BACKUP_NAME_FORMAT)
+    except ValueError:
+        return None
+
+
+def _snapshot_order(name: str):
+    """스냅샷 정렬 키 (생성 시각, 같은 초 안의 순번)"""
+    suffix = name[16:]
+    return _parse_snapshot(name), int(suffix) if suffix.isdigit() else 0
+
+
+def _same_file(path: str, other: str) -> bool:
+    """크기와 수정시각이 같으면 같은 파일로 간주 (copy2가 수정시각을 보존)"""
+    try:
+        a, b = os.stat(path), os.stat(other)
+    except OSError:
+        return False
+    return a.st_size == b.st_size and a.st_mtime_ns == b.st_mtime_ns
+
 class SERVER:
     """서버 정보 클래스 (GIST.py와 동일)"""
     def __init__(self, timestamp: str = None, godpack_code: List[str] = None, 
@@ -67,14 +113,99 @@ class USER:
             type=data.get("type", "normal")
         )
 
+class Journal:
+    """스냅샷 파일 옆에 두는 추가 전용(append-only) 작업 로그
+    
+    edit('+'|'-', key, value) 한 번이 로그 한 줄이 되므로 쓰기 비용은 파일 크기와 무관합니다.
+    로드 시 스냅샷 + 로그를 재생하고, 로그가 임계값을 넘으면 새 스냅샷으로 접어 넣습니다(compaction).
+    """
+    
+    def __init__(self, file_path: str, max_bytes: int = None, max_age: int = None):
+        self.file_path = file_path
+        self.log_path = file_path + '.log'
+        self.max_bytes = JOURNAL_MAX_BYTES if max_bytes is None else max_bytes
+        self.max_age = JOURNAL_MAX_AGE if max_age is None else max_age
+        self.lock = threading.Lock()
+        self._size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        self._started = None  # 로그 첫 작업 시각
+    
+    def append(self, mode: str, key: Any, value: Any = None):
+        """작업 한 줄 추가"""
+        now = time.time()
+        line = json.dumps({"t": now, "op": mode, "k": key, "v": value}, ensure_ascii=False) + '\n'
+        encoded = line.encode('utf-8')
+        with self.lock:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            with open(self.log_path, 'ab') as f:
+                f.write(encoded)
+            self._size += len(encoded)
+            if self._started is None:
+                self._started = now
+    
+    def tell(self) -> int:
+        """현재 로그 위치 (스냅샷과 함께 기록해 compaction 범위로 사용)"""
+        return self._size
+    
+    def replay(self, data: Union[Dict, set]) -> Union[Dict, set]:
+        """스냅샷 데이터에 로그 작업을 순서대로 적용"""
+        if not os.path.exists(self.log_path):
+            return data
+        with self.lock:
+            with open(self.log_path, 'rb') as f:
+                raw = f.read()
+        for line in raw.splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # 비정상 종료로 잘린 마지막 줄은 무시
+                continue
+            if self._started is None:
+                self._started = entry.get("t")
+            op, key = entry.get("op"), entry.get("k")
+            if isinstance(data, set):
+                if op == '+':
+                    data.add(key)
+                elif op == '-':
+                    data.discard(key)
+            else:
+                if op == '+':
+                    data[key] = entry.get("v")
+                elif op == '-':
+                    data.pop(key, None)
+        return data
+    
+    def needs_compaction(self) -> bool:
+        """로그 크기 또는 나이가 임계값을 넘었는지 확인"""
+        if self._size >= self.max_bytes:
+            return True
+        return self._started is not None and time.time() - self._started >= self.max_age
+    
+    def truncate(self, upto: int):
+        """스냅샷에 반영된 로그 앞부분(upto 바이트까지) 제거"""
+        with self.lock:
+            if not os.path.exists(self.log_path):
+                self._size = 0
+                return
+            with open(self.log_path, 'rb') as f:
+                f.seek(upto)
+                rest = f.read()
+            tmp_path = self.log_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(rest)
+            os.replace(tmp_path, self.log_path)
+            self._size = len(rest)
+            self._started = time.time() if rest else None
+
+
 class LocalFile:
     """로컬 파일 시스템을 사용한 데이터 저장 클래스"""
     
-    def __init__(self, base_path: str = None, test_mode: bool = False):
+    def __init__(self, base_path: str = None, test_mode: bool = False, journal: bool = None):
         """
         Args:
             base_path: 데이터 저장 기본 경로
             test_mode: 테스트 모드 여부
+            journal: 저널 모드 여부 (None이면 STORAGE_JOURNAL 환경변수 사용)
         """
         # 환경변수에서 DATA_PATH 가져오기
         DATA_PATH = os.getenv('DATA_PATH', 'data')
@@ -83,6 +214,8 @@ class LocalFile:
         self.base_path = base_path if not test_mode else os.path.join(DATA_PATH.replace('data', 'data_test'), "poke_data")
         self._ensure_directories()
         self.lock = threading.Lock()  # 동시 쓰기 방지용 락
+        self.journal_mode = JOURNAL_MODE if journal is None else journal
+        self._journals = {}  # 파일 경로 -> Journal
     
     def _ensure_directories(self):
         """필요한 디렉토리 구조 생성"""
@@ -107,12 +240,38 @@ class LocalFile:
         
         return os.path.join(self.base_path, group_lower, filename)
     
+    def getJournal(self, file_path: str) -> Journal:
+        """파일 경로별 Journal 인스턴스 반환"""
+        journal = self._journals.get(file_path)
+        if journal is None:
+            journal = self._journals.setdefault(file_path, Journal(file_path))
+        return journal
+    
+    def appendEdit(self, group: str, filename: str, mode: str, key: Any, value: Any = None) -> bool:
+        """저널 모드: 변경 작업 한 줄만 로그에 추가 (O(1))"""
+        try:
+            self.getJournal(self._get_file_path(group, filename)).append(mode, key, value)
+            return True
+        except Exception as e:
+            print(f"[LocalFile] 저널 기록 실패: {e}")
+            return False
+    
+    def compactFile(self, group: str, filename: str, content: Union[str, List, Dict],
+                    format: str = 'TEXT', force: bool = False) -> bool:
+        """저널 모드: 로그가 임계값을 넘었을 때만 스냅샷을 새로 쓰고 로그 정리"""
+        journal = self.getJournal(self._get_file_path(group, filename))
+        if not force and not journal.needs_compaction():
+            return True
+        return self.uploadFile(group, filename, content, format)
+    
     def uploadFile(self, group: str, filename: str, content: Union[str, List, Dict], 
                    format: str = 'TEXT') -> bool:
         """파일 업로드 (저장)"""
         try:
             with self.lock:
                 file_path = self._get_file_path(group, filename)
+                journal = self._journals.get(file_path) if self.journal_mode else None
+                mark = journal.tell() if journal else None
                 
                 if format == 'TEXT':
                     # TEXT 형식: 문자열 또는 리스트를 줄바꿈으로 구분
@@ -122,9 +281,13 @@ class LocalFile:
                         f.write(content)
                 
                 elif format == 'JSON':
-                    # JSON 형식: 딕셔너리 또는 리스트를 JSON으로 저장
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        json.dump(content, f, ensure_ascii=False, indent=2)
+                    # JSON 형식: 딕셔너리 또는 리스트 저장 (기존 파일 형식 유지, json/msgpack)
+                    Codec.write_file(file_path, content, indent=2)
+                
+                # 전체 스냅샷이 기록됐으므로 그 시점까지의 로그는 정리
+                if journal:
+                    journal.truncate(mark)
+                read_cache.invalidate(file_path)
                 
                 return True
                 
@@ -136,26 +299,19 @@ class LocalFile:
         """파일 열기 (읽기)"""
         try:
             file_path = self._get_file_path(group, filename)
+            journal = self.getJournal(file_path) if self.journal_mode else None
             
-            if not os.path.exists(file_path):
+            if not os.path.exists(file_path) and not (journal and os.path.exists(journal.log_path)):
                 # 파일이 없으면 기본값 반환
                 if format == 'TEXT':
                     return ""
                 elif format == 'JSON':
                     return {} if 'member' in filename or 'godpack' in filename else []
             
-            if format == 'TEXT':
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    # 빈 파일이면 빈 문자열 반환
-                    if not content:
-                        return ""
-                    # 줄바꿈으로 구분된 리스트로 반환
-                    return content.split('\n') if '\n' in content else [content] if content else []
-            
-            elif format == 'JSON':
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            # 파일(및 저널 로그)이 그대로면 stat()만으로 캐시 반환
+            deps = (journal.log_path,) if journal else ()
+            return read_cache.get(file_path, lambda: self._readFile(file_path, format), deps,
+                                  tag=('LocalFile', format))
         
         except FileNotFoundError:
             # 파일이 없으면 기본값 반환
@@ -164,24 +320,88 @@ class LocalFile:
             elif format == 'JSON':
                 return {} if 'member' in filename or 'godpack' in filename else []
         
-        except json.JSONDecodeError:
+        except ValueError:
             print(f"[LocalFile] JSON 파싱 실패: {file_path}")
             return {} if 'member' in filename or 'godpack' in filename else []
         
         except Exception as e:
             print(f"[LocalFile] 파일 읽기 실패: {e}")
             return None
+
+    def _readFile(self, file_path: str, format: str) -> Union[str, List, Dict, None]:
+        """파일을 실제로 읽고 파싱 (캐시 미스일 때만 호출)"""
+        if format == 'TEXT':
+            content = ""
+            if os.path.exists(file_path) or not self.journal_mode:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read().strip()
+            if self.journal_mode:
+                # 스냅샷 + 로그 재생 (순서 유지)
+                lines = content.split('\n') if content else []
+                data = dict.fromkeys(lines)
+                self.getJournal(file_path).replay(data)
+                return list(data)
+            # 빈 파일이면 빈 문자열 반환
+            if not content:
+                return ""
+            # 줄바꿈으로 구분된 리스트로 반환
+            return content.split('\n') if '\n' in content else [content] if content else []
+
+        elif format == 'JSON':
+            data = {}
+            if os.path.exists(file_path) or not self.journal_mode:
+                data, _ = Codec.read_file(file_path)
+            if self.journal_mode and isinstance(data, dict):
+                self.getJournal(file_path).replay(data)
+            return data
+
+    async def auploadFile(self, group: str, filename: str, content: Union[str, List, Dict],
+                          format: str = 'TEXT') -> bool:
+        """uploadFile()의 비동기 버전 (직렬화/쓰기는 I/O 풀에서, 파일별 순서 유지)"""
+        # 호출자가 이후에 수정해도 영향이 없도록 복사본 전달
+        if isinstance(content, (list, dict, set)):
+            content = content.copy()
+        return await storage_io.run(self._get_file_path(group, filename),
+                                    self.uploadFile, group, filename, content, format)
+    
+    async def aopenFile(self, group: str, filename: str, format: str = 'TEXT') -> Union[str, List, Dict, None]:
+        """openFile()의 비동기 버전"""
+        return await storage_io.run(self._get_file_path(group, filename),
+                                    self.openFile, group, filename, format)
     
     def exists(self, group: str, filename: str) -> bool:
         """파일 존재 여부 확인"""
         file_path = self._get_file_path(group, filename)
         return os.path.exists(file_path)
     
+    def _backup_root(self) -> str:
+        return os.path.join(self.base_path, 'backup')
+    
+    def listBackups(self) -> List[str]:
+        """스냅샷 이름 목록 (오래된 순)"""
+        root = self._backup_root()
+        if not os.path.isdir(root):
+            return []
+        return sorted((name for name in os.listdir(root)
+                       if _parse_snapshot(name) and os.path.isdir(os.path.join(root, name))),
+                      key=_snapshot_order)
+    
     def backup(self, group: str = None):
-        """데이터 백업"""
+        """데이터 백업 (증분 스냅샷)
+        
+        이전 스냅샷과 크기/수정시각이 같은 파일은 하드링크, 바뀐 파일만 복사합니다
+        (rsync --link-dest 방식). 각 스냅샷은 그 자체로 완전한 사본입니다.
+        """
         try:
-            backup_dir = os.path.join(self.base_path, 'backup', 
-                                    datetime.datetime.now().strftime("%Y%m%d_%H%M%S"))
+            previous = self.listBackups()
+            previous_dir = os.path.join(self._backup_root(), previous[-1]) if previous else None
+            name = datetime.datetime.now().strftime(BACKUP_NAME_FORMAT)
+            suffix = 1
+            while name in previous:
+                # 같은 초에 여러 번 백업한 경우
+                name = datetime.datetime.now().strftime(BACKUP_NAME_FORMAT) + f"_{suffix}"
+                suffix += 1
+            backup_dir = os.path.join(self._backup_root(), name)
             os.makedirs(backup_dir, exist_ok=True)
             
             if group:
@@ -189,22 +409,122 @@ class LocalFile:
                 groups = [group]
             else:
                 # 전체 백업
-                groups = ['group7', 'group8']
+                groups = BACKUP_GROUPS
             
+            copied = linked = 0
             for grp in groups:
                 src_dir = os.path.join(self.base_path, grp.lower())
-                dst_dir = os.path.join(backup_dir, grp.lower())
-                if os.path.exists(src_dir):
-                    import shutil
-                    shutil.copytree(src_dir, dst_dir)
+                if not os.path.exists(src_dir):
+                    continue
+                for root, dirs, files in os.walk(src_dir):
+                    rel_root = os.path.relpath(root, self.base_path)
+                    os.makedirs(os.path.join(backup_dir, rel_root), exist_ok=True)
+                    for filename in files:
+                        if filename.endswith('.tmp'):
+                            continue
+                        rel_path = os.path.join(rel_root, filename)
+                        src = os.path.join(self.base_path, rel_path)
+                        dst = os.path.join(backup_dir, rel_path)
+                        prev = os.path.join(previous_dir, rel_path) if previous_dir else None
+                        if prev and _same_file(src, prev):
+                            try:
+                                os.link(prev, dst)
+                                linked += 1
+                                continue
+                            except OSError:
+                                pass  # 하드링크를 지원하지 않으면 복사
+                        shutil.copy2(src, dst)
+                        copied += 1
             
-            print(f"[LocalFile] 백업 완료: {backup_dir}")
+            print(f"[LocalFile] 백업 완료: {backup_dir} (복사 {copied}개, 링크 {linked}개)")
             return True
             
         except Exception as e:
             print(f"[LocalFile] 백업 실패: {e}")
             return False
     
+    def pruneBackups(self, hourly: int = None, daily: int = None, weekly: int = None) -> List[str]:
+        """보존 정책에 맞지 않는 스냅샷 삭제 -> 삭제한 스냅샷 목록
+        
+        최근 hourly개 시간/daily개 날짜/weekly개 주 마다 가장 최신 스냅샷 하나씩과
+        최신 스냅샷은 항상 남깁니다.
+        """
+        buckets = [
+            (BACKUP_KEEP_HOURLY if hourly is None else hourly, "%Y%m%d%H"),
+            (BACKUP_KEEP_DAILY if daily is None else daily, "%Y%m%d"),
+            (BACKUP_KEEP_WEEKLY if weekly is None else weekly, "%G%V"),
+        ]
+        snapshots = self.listBackups()[::-1]
+        keep = set(snapshots[:1])
+        for count, bucket_format in buckets:
+            seen = set()
+            for name in snapshots:
+                bucket = _parse_snapshot(name).strftime(bucket_format)
+                if bucket in seen:
+                    continue
+                if len(seen) >= count:
+                    break
+                seen.add(bucket)
+                keep.add(name)
+        removed = [name for name in snapshots if name not in keep]
+        for name in removed:
+            shutil.rmtree(os.path.join(self._backup_root(), name), ignore_errors=True)
+        if removed:
+            print(f"[LocalFile] 오래된 백업 {len(removed)}개 삭제")
+        return removed
+    
+    def restore(self, snapshot: str = None, group: str = None) -> bool:
+        """스냅샷에서 데이터 복원 (봇이 멈춘 상태에서 실행)
+        
+        Args:
+            snapshot: 스냅샷 이름 (None이면 최신)
+            group: 특정 그룹만 복원 (None이면 스냅샷의 모든 그룹)
+        """
+        try:
+            snapshots = self.listBackups()
+            if snapshot is None:
+                if not snapshots:
+                    print("[LocalFile] 복원할 백업이 없습니다")
+                    return False
+                snapshot = snapshots[-1]
+            elif snapshot not in snapshots:
+                print(f"[LocalFile] 백업을 찾을 수 없습니다: {snapshot}")
+                return False
+            backup_dir = os.path.join(self._backup_root(), snapshot)
+            groups = [group.lower()] if group else sorted(os.listdir(backup_dir))
+            
+            for grp in groups:
+                src_dir = os.path.join(backup_dir, grp)
+                dst_dir = os.path.join(self.base_path, grp)
+                if not os.path.isdir(src_dir):
+                    continue
+                restored = set()
+                for root, dirs, files in os.walk(src_dir):
+                    rel_root = os.path.relpath(root, backup_dir)
+                    os.makedirs(os.path.join(self.base_path, rel_root), exist_ok=True)
+                    for filename in files:
+                        rel_path = os.path.join(rel_root, filename)
+                        dst = os.path.join(self.base_path, rel_path)
+                        # 하드링크가 아닌 복사본으로 (저널 로그 추가 쓰기가 스냅샷을 바꾸지 않도록)
+                        shutil.copy2(os.path.join(backup_dir, rel_path), dst + '.tmp')
+                        os.replace(dst + '.tmp', dst)
+                        read_cache.invalidate(dst)
+                        restored.add(dst)
+                # 스냅샷 이후에 생긴 저널 로그는 복원한 데이터와 맞지 않으므로 제거
+                for root, dirs, files in os.walk(dst_dir):
+                    for filename in files:
+                        path = os.path.join(root, filename)
+                        if filename.endswith('.log') and path not in restored:
+                            os.remove(path)
+                            read_cache.invalidate(path[:-len('.log')])
+            
+            print(f"[LocalFile] 복원 완료: {backup_dir}")
+            return True
+            
+        except Exception as e:
+            print(f"[LocalFile] 복원 실패: {e}")
+            return False
+    
     def parse_godpack(self, message: str) -> tuple:
         """갓팩 메시지 파싱 (GIST.py와 동일한 로직)"""
         lines = message.split('\n')
@@ -242,6 +562,25 @@ class LocalFile:
         data = self.openFile(group, f"{group}_godpack", 'JSON')
         return data if isinstance(data, dict) else {}
 
+# 기본 경로별 공유 인스턴스 (같은 파일은 같은 락을 사용)
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared(base_path: str = None, test_mode: bool = False) -> LocalFile:
+    """기본 경로당 하나의 LocalFile 인스턴스 반환 (디렉토리 생성/락을 공유)"""
+    DATA_PATH = os.getenv('DATA_PATH', 'data')
+    if test_mode:
+        resolved = os.path.join(DATA_PATH.replace('data', 'data_test'), "poke_data")
+    else:
+        resolved = base_path or os.path.join(DATA_PATH, "poke_data")
+    key = os.path.abspath(resolved)
+    with _shared_lock:
+        storage = _shared.get(key)
+        if storage is None:
+            storage = _shared[key] = LocalFile(base_path=resolved)
+        return storage
+
 # 테스트 코드
 if __name__ == "__main__":
     # LocalFile 테스트
@@ -2,7 +2,8 @@
 LocalFileAdapter.py - GIST 인터페이스를 LocalFile로 변환하는 어댑터
 """
 
-from LocalFile import LocalFile as LocalFileBase
+import threading
+from LocalFile import get_shared
 
 class LocalFileAdapter:
     """GIST 클래스와 동일한 인터페이스를 제공하는 LocalFile 어댑터"""
@@ -15,7 +16,7 @@ class LocalFileAdapter:
             format_type: 'JSON' 또는 'TEXT'
             test_mode: 테스트 모드 여부
         """
-        self.storage = LocalFileBase(test_mode=test_mode)
+        self.storage = get_shared(test_mode=test_mode)  # 프로세스 공유 인스턴스
         self.group = group
         self.filename = filename
         self.format_type = format_type
@@ -43,15 +44,20 @@ class LocalFileAdapter:
                 self.DATA = {}
     
     def update(self):
-        """변경사항을 파일에 저장"""
+        """변경사항을 파일에 저장 (저널 모드면 임계값을 넘을 때만 스냅샷 기록)"""
+        if self.storage.journal_mode:
+            return self.storage.compactFile(self.group, self.filename, self._payload(), self.format_type)
+        return self.storage.uploadFile(self.group, self.filename, self._payload(), self.format_type)
+    
+    def _payload(self):
+        """저장용 데이터 변환"""
         if self.format_type == 'TEXT':
             # set을 list로 변환하여 저장
             data_to_save = list(self.DATA) if self.DATA else []
         else:
             # dict는 그대로
             data_to_save = self.DATA if self.DATA else {}
-        
-        return self.storage.uploadFile(self.group, self.filename, data_to_save, self.format_type)
+        return data_to_save
     
     def edit(self, mode, *args):
         """데이터 편집 (GIST와 동일한 인터페이스)"""
@@ -61,12 +67,20 @@ class LocalFileAdapter:
                 self.DATA.add(args[0])
             elif mode == '-' and len(args) >= 1:
                 self.DATA.discard(args[0])
+            else:
+                return
+            if self.storage.journal_mode:
+                self.storage.appendEdit(self.group, self.filename, mode, args[0])
         else:
             # JSON 모드: edit(mode, key, value)
             if mode == '+' and len(args) >= 2:
                 self.DATA[args[0]] = args[1]
             elif mode == '-' and len(args) >= 1:
                 self.DATA.pop(args[0], None)
+            else:
+                return
+            if self.storage.journal_mode:
+                self.storage.appendEdit(self.group, self.filename, mode, args[0], args[1] if len(args) >= 2 else None)
     
     def fetch_raw(self):
         """호환성을 위한 메서드 (로컬에서는 load와 동일)"""
@@ -78,6 +92,21 @@ class LocalFileAdapter:
         self.load()
         return self.DATA
 
+# (기본 경로, 그룹, 파일명, 형식)별 공유 어댑터 - 같은 파일은 하나의 메모리 사본만 유지
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def get_adapter(group, filename, format_type='JSON', test_mode=False):
+    """공유 어댑터 반환 (없으면 생성)"""
+    key = (get_shared(test_mode=test_mode).base_path, group, filename, format_type)
+    with _registry_lock:
+        adapter = _registry.get(key)
+        if adapter is None:
+            adapter = _registry[key] = LocalFileAdapter(group, filename, format_type, test_mode)
+        return adapter
+
+
 # GIST 클래스를 흉내내는 팩토리 함수들
 def TEXT(gist_id, filename, initial=True, test_mode=False):
     """GIST.TEXT와 동일한 인터페이스"""
@@ -95,8 +124,7 @@ def TEXT(gist_id, filename, initial=True, test_mode=False):
         group = 'Common'
         fname = filename
     
-    adapter = LocalFileAdapter(group, fname, 'TEXT', test_mode)
-    return adapter
+    return get_adapter(group, fname, 'TEXT', test_mode)
 
 def JSON(gist_id, filename, initial=True, test_mode=False):
     """GIST.JSON과 동일한 인터페이스"""
@@ -116,5 +144,4 @@ def JSON(gist_id, filename, initial=True, test_mode=False):
         group = 'Common'
         fname = filename
     
-    adapter = LocalFileAdapter(group, fname, 'JSON', test_mode)
-    return adapter
\ No newline at end of file
+    return get_adapter(group, fname, 'JSON', test_mode)
\ No newline at end of file
@@ -0,0 +1,505 @@
+"""
+SQLiteAdapter.py - GIST 인터페이스를 유지하면서 SQLite(WAL)를 사용하는 어댑터
+Alliance/Admin/온라인 목록/갓팩 상태/갓팩 코드를 하나의 DB에 저장합니다.
+edit()은 변경 작업만 모아두고 update()가 해당 행만 한 트랜잭션으로 반영하므로
+파일 전체를 다시 쓰지 않습니다.
+"""
+
+import os
+import json
+import atexit
+import sqlite3
+import threading
+from contextlib import contextmanager
+from .paths import get_data_path
+from .GISTAdapter import SERVER as _BaseServer, USER
+from .StorageIO import storage_io
+from . import Codec
+from .GodpackIndex import IndexedGodpackMixin
+from .GodpackArchive import ArchivedGodpackMixin
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    name TEXT PRIMARY KEY,
+    kind TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS text_items (
+    name TEXT NOT NULL,
+    item TEXT NOT NULL,
+    UNIQUE (name, item)
+);
+CREATE TABLE IF NOT EXISTS json_items (
+    name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT,
+    UNIQUE (name, key)
+);
+"""
+
+
+class SQLiteStore:
+    """DB 연결과 트랜잭션 관리 (스레드 간 공유)"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.RLock()
+        self._batch = None  # batch() 안에서 모인 어댑터 목록
+
+    @contextmanager
+    def transaction(self):
+        """BEGIN ~ COMMIT (예외 시 ROLLBACK)"""
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    @contextmanager
+    def batch(self):
+        """블록 안의 update()를 모아서 하나의 트랜잭션으로 반영 (GODPACK + GPTEST 등)"""
+        with self.lock:
+            if self._batch is not None:
+                # 중첩 batch는 바깥 batch에 합쳐짐
+                yield
+                return
+            self._batch = []
+            try:
+                yield
+                pending, self._batch = self._batch, None
+                if pending:
+                    with self.transaction() as conn:
+                        for adapter in pending:
+                            adapter._apply(conn)
+                    for adapter in pending:
+                        adapter._applied()
+            finally:
+                self._batch = None
+
+    def submit(self, adapter):
+        """어댑터의 변경사항 반영 (batch 중이면 batch 끝에 반영)"""
+        with self.lock:
+            if self._batch is not None:
+                if adapter not in self._batch:
+                    self._batch.append(adapter)
+                return True
+            with self.transaction() as conn:
+                adapter._apply(conn)
+            adapter._applied()
+            return True
+
+    def apply(self, write, pending):
+        """떼어 둔 변경사항을 한 트랜잭션으로 반영 (aupdate()가 storage_io 스레드에서 호출)"""
+        with self.transaction() as conn:
+            write(conn, pending)
+        return True
+
+    def register(self, name, kind, legacy_path=None):
+        """처음 보는 파일이면 등록하고 기존 로컬 파일 내용을 가져옴"""
+        with self.lock:
+            row = self.conn.execute("SELECT kind FROM files WHERE name = ?", (name,)).fetchone()
+            if row:
+                return
+            with self.transaction() as conn:
+                conn.execute("INSERT INTO files (name, kind) VALUES (?, ?)", (name, kind))
+                if legacy_path and os.path.exists(legacy_path):
+                    self._import_legacy(conn, name, kind, legacy_path)
+
+    def _import_legacy(self, conn, name, kind, path):
+        """LocalFile 형식의 기존 파일을 DB로 이전 (JSON은 msgpack으로 변환된 파일도 읽음)"""
+        if kind == 'TEXT':
+            with open(path, 'r', encoding='utf-8') as f:
+                items = [line.strip() for line in f if line.strip()]
+            conn.executemany("INSERT OR IGNORE INTO text_items (name, item) VALUES (?, ?)",
+                             [(name, item) for item in items])
+        else:
+            try:
+                data, _ = Codec.read_file(path)
+            except ValueError:
+                data = {}
+            if isinstance(data, dict):
+                conn.executemany(
+                    "INSERT OR REPLACE INTO json_items (name, key, value) VALUES (?, ?, ?)",
+                    [(name, k, json.dumps(v, ensure_ascii=False)) for k, v in data.items()])
+        print(f"[SQLiteAdapter] 📥 기존 파일 가져옴: {name} <- {path}")
+
+    def read_text(self, name):
+        with self.lock:
+            rows = self.conn.execute("SELECT item FROM text_items WHERE name = ?", (name,)).fetchall()
+        return set(row[0] for row in rows)
+
+    def read_json(self, name):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT key, value FROM json_items WHERE name = ? ORDER BY rowid", (name,)).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def has_text(self, name, item):
+        """인덱스 조회: TEXT 파일에 항목 존재 여부"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM text_items WHERE name = ? AND item = ?", (name, item)).fetchone()
+        return row is not None
+
+    def get_json(self, name, key, default=None):
+        """인덱스 조회: JSON 파일의 키 하나"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT value FROM json_items WHERE name = ? AND key = ?", (name, key)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class SQLiteGISTAdapter:
+    """GIST 클래스와 동일한 인터페이스를 제공하는 SQLite 어댑터"""
+
+    def __init__(self, db_path=None):
+        # TEST_MODE일 때는 data_test 사용
+        is_test_mode = os.getenv('TEST_MODE', 'false').lower() == 'true'
+        if is_test_mode:
+            from .paths import TEST_DATA_DIR
+            self.base_path = os.path.join(TEST_DATA_DIR, "poke_data")
+        else:
+            self.base_path = get_data_path("poke_data")
+
+        self.db_path = db_path or os.getenv('SQLITE_DB_PATH') or os.path.join(self.base_path, "poke.db")
+        self.store = SQLiteStore(self.db_path)
+
+    def start_flusher(self):
+        """GISTAdapter 호환용 (SQLite는 update() 즉시 반영)"""
+        return None
+
+    async def aflush(self):
+        """GISTAdapter 호환용"""
+        return None
+
+    def flush(self):
+        """GISTAdapter 호환용"""
+        return None
+
+    def batch(self):
+        """여러 파일의 update()를 하나의 트랜잭션으로 묶기"""
+        return self.store.batch()
+
+    def TEXT(self, gist_id, filename, initial=True):
+        """GIST.TEXT와 동일한 인터페이스"""
+        # 기존 로컬 파일 위치 (최초 1회 가져오기용, GISTAdapter와 동일한 매핑)
+        mapping = {
+            "Admin": ("common", "admin.txt"),
+            "Group7": ("group7", "online.txt"),
+            "Group8": ("group8", "online.txt"),
+            "GroupTest": ("test", "online.txt"),
+        }
+        folder, local_filename = mapping.get(filename, ("common", f"{filename}.txt"))
+        legacy_path = os.path.join(self.base_path, folder, local_filename)
+        return SQLiteText(self.store, filename, initial=initial, legacy_path=legacy_path)
+
+    def JSON(self, gist_id, filename):
+        """GIST.JSON과 동일한 인터페이스"""
+        mapping = {
+            "Alliance": ("common", "member.json"),
+            "GodPack7": ("group7", "godpack.json"),
+            "Code7": ("group7", "godpackCode.json"),
+            "GodPack8": ("group8", "godpack.json"),
+            "Code8": ("group8", "godpackCode.json"),
+            "GodPackTest": ("test", "godpack.json"),
+            "CodeTest": ("test", "godpackCode.json"),
+        }
+        folder, local_filename = mapping.get(filename, ("common", f"{filename}.json"))
+        legacy_path = os.path.join(self.base_path, folder, local_filename)
+        adapter_class = SQLiteGodpack if filename.startswith("GodPack") else SQLiteJson
+        return adapter_class(self.store, filename, legacy_path=legacy_path)
+
+    def SERVER(self, *args):
+        """GIST.SERVER와 동일한 인터페이스"""
+        return SERVER(*args)
+
+    def USER(self, *args):
+        """GIST.USER와 동일한 인터페이스"""
+        return USER(*args)
+
+
+class SQLiteText:
+    """GIST TEXT 클래스 어댑터 (set 데이터)"""
+
+    def __init__(self, store, name, initial=True, legacy_path=None):
+        self.store = store
+        self.NAME = name  # GIST와의 호환성을 위해 추가
+        store.register(name, 'TEXT', legacy_path)
+        self.DATA = set()
+        self._ops = {}  # item -> '+' / '-' (마지막 작업만 유지)
+        # GIST와 동일한 동작: initial=False면 빈 set으로 시작하고 첫 update에서 전체 교체
+        self._replace = not initial
+        if initial:
+            self.load()
+
+    def load(self):
+        """DB에서 데이터 로드"""
+        self.DATA = self.store.read_text(self.NAME)
+        self._ops.clear()
+
+    def edit(self, mode, text):
+        """데이터 편집"""
+        if mode == '+':
+            self.DATA.add(text)
+        elif mode == '-':
+            self.DATA.discard(text)
+        else:
+            return
+        self._ops[text] = mode
+
+    def update(self):
+        """변경된 항목만 DB에 반영"""
+        if not self._ops and not self._replace:
+            return True
+        return self.store.submit(self)
+
+    def _apply(self, conn):
+        self._write(conn, (self._replace, self.DATA, self._ops))
+
+    def _write(self, conn, pending):
+        replace, data, ops = pending
+        if replace:
+            conn.execute("DELETE FROM text_items WHERE name = ?", (self.NAME,))
+            conn.executemany("INSERT OR IGNORE INTO text_items (name, item) VALUES (?, ?)",
+                             [(self.NAME, item) for item in data])
+            return
+        added = [(self.NAME, item) for item, mode in ops.items() if mode == '+']
+        removed = [(self.NAME, item) for item, mode in ops.items() if mode == '-']
+        if added:
+            conn.executemany("INSERT OR IGNORE INTO text_items (name, item) VALUES (?, ?)", added)
+        if removed:
+            conn.executemany("DELETE FROM text_items WHERE name = ? AND item = ?", removed)
+
+    def _applied(self):
+        self._ops.clear()
+        self._replace = False
+
+    def _take(self):
+        """보낼 변경사항을 떼어 냄 (보내는 동안의 edit()은 다음 update()로)"""
+        pending = (self._replace, set(self.DATA) if self._replace else None, self._ops)
+        self._ops = {}
+        self._replace = False
+        return pending
+
+    def _untake(self, pending):
+        """보내기 실패 -> 떼어 낸 변경사항을 되돌림 (그 뒤의 edit()이 우선)"""
+        replace, _, ops = pending
+        ops.update(self._ops)
+        self._ops = ops
+        self._replace = self._replace or replace
+
+    async def aload(self):
+        """load()의 비동기 버전"""
+        self.DATA = await storage_io.run(('sqlite', self.NAME), self.store.read_text, self.NAME)
+        self._ops.clear()
+
+    async def aupdate(self):
+        """update()의 비동기 버전 (트랜잭션을 storage_io 스레드에서 실행)"""
+        if not self._ops and not getattr(self, '_replace', False):
+            return True
+        if self.store._batch is not None:
+            return self.update()  # batch() 안에서는 batch 끝에 함께 반영
+        pending = self._take()
+        try:
+            return await storage_io.run(('sqlite', self.NAME), self.store.apply, self._write, pending)
+        except Exception:
+            self._untake(pending)
+            raise
+
+    async def afetch_raw(self):
+        """fetch_raw()의 비동기 버전"""
+        return await storage_io.run(('sqlite', self.NAME), self.store.read_text, self.NAME)
+
+    def contains(self, text):
+        """인덱스 조회 (DB 기준)"""
+        return self.store.has_text(self.NAME, text)
+
+    def fetch_raw(self):
+        """호환성을 위한 메서드 - DB에서 직접 읽어서 반환"""
+        return self.store.read_text(self.NAME)
+
+    def fetch_data(self):
+        """호환성을 위한 메서드"""
+        self.load()
+        return self.DATA
+
+
+class SQLiteJson:
+    """GIST JSON 클래스 어댑터 (dict 데이터)"""
+
+    _DELETED = object()
+
+    def __init__(self, store, name, legacy_path=None):
+        self.store = store
+        self.NAME = name  # GIST와의 호환성을 위해 추가
+        store.register(name, 'JSON', legacy_path)
+        self.DATA = {}
+        self._ops = {}  # key -> value / _DELETED
+        self.load()
+
+    def load(self):
+        """DB에서 데이터 로드"""
+        self.DATA = self.store.read_json(self.NAME)
+        self._ops.clear()
+
+    def edit(self, mode, key, value=None):
+        """데이터 편집"""
+        if mode == '+':
+            self.DATA[key] = value
+            self._ops[key] = value
+        elif mode == '-':
+            self.DATA.pop(key, None)
+            self._ops[key] = self._DELETED
+
+    def update(self):
+        """변경된 키만 DB에 반영"""
+        if not self._ops:
+            return True
+        return self.store.submit(self)
+
+    def _apply(self, conn):
+        self._write(conn, self._ops)
+
+    def _write(self, conn, ops):
+        upserts = [(self.NAME, key, json.dumps(value, ensure_ascii=False))
+                   for key, value in ops.items() if value is not self._DELETED]
+        deletes = [(self.NAME, key) for key, value in ops.items() if value is self._DELETED]
+        if upserts:
+            conn.executemany(
+                "INSERT INTO json_items (name, key, value) VALUES (?, ?, ?) "
+                "ON CONFLICT (name, key) DO UPDATE SET value = excluded.value", upserts)
+        if deletes:
+            conn.executemany("DELETE FROM json_items WHERE name = ? AND key = ?", deletes)
+
+    def _applied(self):
+        self._ops.clear()
+
+    def _take(self):
+        """보낼 변경사항을 떼어 냄 (보내는 동안의 edit()은 다음 update()로)"""
+        pending, self._ops = self._ops, {}
+        return pending
+
+    def _untake(self, pending):
+        """보내기 실패 -> 떼어 낸 변경사항을 되돌림 (그 뒤의 edit()이 우선)"""
+        pending.update(self._ops)
+        self._ops = pending
+
+    async def aload(self):
+        """load()의 비동기 버전"""
+        self.DATA = await storage_io.run(('sqlite', self.NAME), self.store.read_json, self.NAME)
+        self._ops.clear()
+
+    async def aupdate(self):
+        """update()의 비동기 버전 (트랜잭션을 storage_io 스레드에서 실행)"""
+        if not self._ops and not getattr(self, '_replace', False):
+            return True
+        if self.store._batch is not None:
+            return self.update()  # batch() 안에서는 batch 끝에 함께 반영
+        pending = self._take()
+        try:
+            return await storage_io.run(('sqlite', self.NAME), self.store.apply, self._write, pending)
+        except Exception:
+            self._untake(pending)
+            raise
+
+    async def afetch_raw(self):
+        """fetch_raw()의 비동기 버전"""
+        await self.aload()
+        return self.DATA
+
+    def get(self, key, default=None):
+        """인덱스 조회 (DB 기준)"""
+        return self.store.get_json(self.NAME, key, default)
+
+    def fetch_raw(self):
+        """호환성을 위한 메서드"""
+        self.load()
+        return self.DATA
+
+    def fetch_data(self):
+        """호환성을 위한 메서드"""
+        self.load()
+        return self.DATA
+
+
+class SQLiteGodpack(ArchivedGodpackMixin, IndexedGodpackMixin, SQLiteJson):
+    """GODPACK 어댑터 (INDEX로 O(1) 조회, 오래된 기록은 ARCHIVE로 분리)"""
+
+    def _archive_dir(self):
+        return os.path.join(os.path.dirname(self.store.db_path), "archive", self.NAME)
+
+
+class SERVER(_BaseServer):
+    """GODPACK + GPTEST 갱신을 하나의 트랜잭션으로 묶는 SERVER"""
+
+    def _store(self):
+        return getattr(self.GODPACK, 'store', None)
+
+    def found_GodPack(self, message):
+        store = self._store()
+        if store is None:
+            return super().found_GodPack(message)
+        with store.batch():
+            return super().found_GodPack(message)
+
+    def found_Pseudo(self, message):
+        store = self._store()
+        if store is None:
+            return super().found_Pseudo(message)
+        with store.batch():
+            return super().found_Pseudo(message)
+
+    async def afound_GodPack(self, message):
+        # 한 번의 짧은 트랜잭션이므로 동기 버전 사용
+        return self.found_GodPack(message)
+
+    async def afound_Pseudo(self, message):
+        return self.found_Pseudo(message)
+
+
+# 싱글톤 인스턴스 (GISTAdapter와 같이 처음 사용할 때 DB 열기/이전)
+_adapter = None
+
+
+def _get_adapter():
+    global _adapter
+    if _adapter is None:
+        _adapter = SQLiteGISTAdapter()
+        atexit.register(_adapter.store.close)
+    return _adapter
+
+
+# GIST 모듈과 동일한 인터페이스 제공
+def TEXT(gist_id, filename, initial=True):
+    return _get_adapter().TEXT(gist_id, filename, initial)
+
+def JSON(gist_id, filename):
+    return _get_adapter().JSON(gist_id, filename)
+
+def start_flusher():
+    return _get_adapter().start_flusher()
+
+def flush():
+    if _adapter is not None:
+        _adapter.flush()
+
+async def aflush():
+    if _adapter is not None:
+        await _adapter.aflush()
+
+def batch():
+    return _get_adapter().batch()
+
+SERVER = SERVER  # 클래스 직접 참조
+USER = USER      # 클래스 직접 참조
@@ -0,0 +1,67 @@
+"""
+StateSnapshot.py - 봇 메모리 상태를 파일 하나로 저장/복원 (빠른 재시작용)
+주기적으로/종료 시 save()로 기록하고, 시작 시 load()로 읽습니다.
+스냅샷 이후 바뀐 파일은 changed_since()로 골라 그 파일만 다시 읽으면 됩니다.
+스냅샷이 없거나 깨졌거나 너무 오래되면 load()가 None을 돌려주므로 기존 방식으로 전체 로드합니다.
+"""
+
+import os
+import time
+import logging
+
+try:
+    from . import Codec
+except ImportError:  # 평면 import 지원
+    import Codec
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+MAX_AGE_HOURS = float(os.getenv('STATE_SNAPSHOT_MAX_AGE_HOURS', '168'))  # 이보다 오래된 스냅샷은 사용 안 함
+
+
+def save(path, state):
+    """상태 dict 저장 (원자적 교체) -> 저장 시각 (epoch 초)"""
+    saved_at = time.time()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    Codec.write_file(path, dict(state, version=SNAPSHOT_VERSION, saved_at=saved_at), indent=None)
+    return saved_at
+
+
+def load(path, max_age_hours=None):
+    """스냅샷 읽기 -> 상태 dict (없거나 깨졌거나 오래되면 None)"""
+    max_age_hours = MAX_AGE_HOURS if max_age_hours is None else max_age_hours
+    if not os.path.exists(path):
+        logger.info(f"📄 상태 스냅샷 없음: {path}")
+        return None
+    try:
+        state, _ = Codec.read_file(path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"⚠️ 상태 스냅샷 읽기 실패 ({path}): {e}")
+        return None
+    if not isinstance(state, dict) or state.get('version') != SNAPSHOT_VERSION:
+        logger.warning(f"⚠️ 상태 스냅샷 형식이 다름 ({path})")
+        return None
+    age_hours = (time.time() - state.get('saved_at', 0)) / 3600
+    if age_hours > max_age_hours:
+        logger.info(f"📄 상태 스냅샷이 오래됨 ({age_hours:.1f}시간 > {max_age_hours}시간): {path}")
+        return None
+    return state
+
+
+def changed_since(directory, suffix, since):
+    """디렉토리의 suffix 파일 -> (전체 이름 집합, since 이후 수정된 이름 집합) (이름은 suffix 제외)"""
+    names, changed = set(), set()
+    try:
+        entries = os.scandir(directory)
+    except FileNotFoundError:
+        return names, changed
+    with entries:
+        for entry in entries:
+            if not entry.name.endswith(suffix) or not entry.is_file():
+                continue
+            name = entry.name[:-len(suffix)]
+            names.add(name)
+            if entry.stat().st_mtime >= since:
+                changed.add(name)
+    return names, changed
@@ -0,0 +1,37 @@
+"""
+StorageIO.py - 저장소 비동기 I/O 실행기
+직렬화와 디스크 쓰기를 전용(크기 제한) 스레드 풀에서 실행해 이벤트 루프를 막지 않고,
+파일별 asyncio.Lock으로 같은 파일에 대한 작업은 호출 순서대로 실행합니다.
+"""
+
+import os
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+# 저장소 I/O 워커 수
+STORAGE_IO_WORKERS = int(os.getenv('STORAGE_IO_WORKERS', '2'))
+
+
+class StorageExecutor:
+    """파일 단위 순서를 보장하는 I/O 스레드 풀"""
+
+    def __init__(self, max_workers=STORAGE_IO_WORKERS):
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="storage-io")
+        self._locks = {}  # 파일 키 -> asyncio.Lock
+
+    async def run(self, key, func, *args, **kwargs):
+        """같은 key의 작업은 순서대로, 다른 key끼리는 병렬로 실행"""
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, functools.partial(func, *args, **kwargs))
+
+    def shutdown(self, wait=True):
+        """스레드 풀 종료"""
+        self._pool.shutdown(wait=wait)
+
+
+# 프로세스 전역 실행기
+storage_io = StorageExecutor()
@@ -0,0 +1,91 @@
+"""
+WriteBehind.py - 어댑터 쓰기 지연(write-behind) 플러셔
+edit()/update() 마다 전체 파일을 다시 쓰는 대신 어댑터를 dirty로 표시하고,
+백그라운드 태스크가 설정된 주기마다 dirty 파일을 최대 한 번씩만 기록합니다.
+"""
+
+import os
+import asyncio
+import logging
+from .StorageIO import storage_io
+
+logger = logging.getLogger(__name__)
+
+# 플러시 주기 (초)
+FLUSH_INTERVAL = float(os.getenv('WRITE_BEHIND_INTERVAL', '2'))
+
+
+class WriteBehindFlusher:
+    """dirty 어댑터를 모아 주기적으로 한 번에 기록하는 플러셔
+
+    어댑터는 아래 메서드를 제공해야 합니다.
+    - _snapshot(): 현재 데이터의 (버전, 복사본, ...) 반환 (이벤트 루프에서 호출)
+    - _write(snapshot): 스냅샷을 파일에 기록 (워커 스레드에서 호출)
+    """
+
+    def __init__(self, interval=FLUSH_INTERVAL):
+        self.interval = interval
+        self._dirty = {}  # 순서 유지용 dict (adapter -> True)
+        self._task = None
+        # 통계
+        self.flush_count = 0   # 실제 파일 쓰기 횟수
+        self.coalesced = 0     # 합쳐져서 생략된 update 횟수
+
+    @property
+    def running(self):
+        """플러셔 태스크 동작 여부"""
+        return self._task is not None and not self._task.done()
+
+    def mark_dirty(self, adapter):
+        """어댑터를 다음 플러시 대상으로 등록"""
+        if adapter in self._dirty:
+            self.coalesced += 1
+        self._dirty[adapter] = True
+
+    def start(self):
+        """현재 이벤트 루프에서 플러셔 태스크 시작"""
+        if not self.running:
+            loop = asyncio.get_running_loop()
+            self._task = loop.create_task(self._run())
+            logger.info(f"[WriteBehind] 플러셔 시작 ({self.interval}초 주기)")
+        return self._task
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    async def flush(self):
+        """dirty 어댑터를 워커 스레드에서 기록 (이벤트 루프 비차단)"""
+        pending = list(self._dirty)
+        self._dirty.clear()
+        for adapter in pending:
+            snapshot = adapter._snapshot()
+            try:
+                await storage_io.run(adapter.file_path, adapter._write, snapshot)
+                self.flush_count += 1
+            except Exception as e:
+                logger.error(f"[WriteBehind] {adapter.file_path} 쓰기 실패, 다음 주기에 재시도: {e}")
+                self._dirty[adapter] = True
+
+    def flush_sync(self):
+        """dirty 어댑터를 즉시 동기적으로 기록 (종료 시 사용)"""
+        pending = list(self._dirty)
+        self._dirty.clear()
+        for adapter in pending:
+            try:
+                adapter._write(adapter._snapshot())
+                self.flush_count += 1
+            except Exception as e:
+                logger.error(f"[WriteBehind] {adapter.file_path} 종료 시 쓰기 실패: {e}")
+
+    async def stop(self):
+        """플러셔 태스크를 멈추고 남은 변경사항 기록"""
+        if self.running:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        await self.flush()
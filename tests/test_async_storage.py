@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+test_async_storage.py - 어댑터 비동기 I/O(aload/aupdate/afetch_raw) 테스트
+"""
+
+import os
+import sys
+import json
+import asyncio
+import tempfile
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.LocalFile import LocalFile
+from src.modules.GISTAdapter import TextAdapter, JsonAdapter, SERVER
+
+
+class FakeMessage:
+    """found_GodPack 테스트용 메시지"""
+    def __init__(self, content):
+        self.content = content
+        self.created_at = datetime(2025, 4, 6, 5, 58, tzinfo=timezone.utc)
+
+
+def test_aupdate_keeps_order():
+    """같은 파일에 대한 aupdate는 호출 순서대로 기록"""
+    print("=== 비동기 쓰기 순서 테스트 ===")
+
+    async def scenario(tmp):
+        storage = LocalFile(base_path=tmp, journal=False)
+        godpack = JsonAdapter(storage, "group7", "godpack.json", name="GodPack7")
+        tasks = []
+        for i in range(20):
+            godpack.edit('+', f"key{i}", i)
+            tasks.append(asyncio.create_task(godpack.aupdate()))
+        await asyncio.gather(*tasks)
+        with open(godpack.file_path, 'r', encoding='utf-8') as f:
+            assert len(json.load(f)) == 20
+
+        online = TextAdapter(storage, "group7", "online.txt", name="Group7", initial=False)
+        online.edit('+', "1234567890123456")
+        await online.aupdate()
+        assert await online.afetch_raw() == {"1234567890123456"}
+
+        await storage.auploadFile("group8", "godpackCode.json", {"a": "b"}, "JSON")
+        assert await storage.aopenFile("group8", "godpackCode.json", "JSON") == {"a": "b"}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(scenario(tmp))
+    return True
+
+
+def test_afound_godpack():
+    """afound_GodPack은 동기 버전과 같은 결과를 기록"""
+    print("\n=== afound_GodPack 테스트 ===")
+
+    async def scenario(tmp):
+        storage = LocalFile(base_path=tmp, journal=False)
+        godpack = JsonAdapter(storage, "group7", "godpack.json", name="GodPack7")
+        gptest = JsonAdapter(storage, "group7", "godpackCode.json", name="Code7")
+        server = SERVER(1, None, godpack, gptest, 2, 3, 4, 5, {})
+        message = FakeMessage("@User\nDUCK (1234567890123456)\n[5/5][3P][Solgaleo] God pack found")
+        inform, title = await server.afound_GodPack(message)
+        assert title == "DUCK Solgaleo / 100% / 3P / 2025.04.06 14:58"
+        save = "2025.04.06 14:58 DUCK Solgaleo 100% 3P"
+        assert godpack.fetch_raw() == {save: "Yet"}
+        assert gptest.fetch_raw() == {save: "1234567890123456"}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(scenario(tmp))
+    return True
+
+
+def main():
+    tests = [
+        ("비동기 쓰기 순서", test_aupdate_keeps_order),
+        ("afound_GodPack", test_afound_godpack),
+    ]
+
+    results = []
+    for name, test in tests:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"❌ {name} 실패: {e}")
+            results.append((name, False))
+
+    print("\n=== 결과 ===")
+    for name, ok in results:
+        print(f"{'✅' if ok else '❌'} {name}")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
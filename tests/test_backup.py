@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+test_backup.py - 증분(하드링크) 백업 / 보존 정리 / 복원 테스트
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.LocalFile import LocalFile
+
+
+def test_incremental_backup_and_restore():
+    """바뀌지 않은 파일은 하드링크, 바뀐 파일만 복사, 복원"""
+    print("=== 증분 백업 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LocalFile(base_path=tmp, journal=False)
+        storage.uploadFile("Group7", "Group7_admin", ["admin1"], 'TEXT')
+        storage.uploadFile("Group7", "Group7_godpack", {"a": "Yet"}, 'JSON')
+        assert storage.backup()
+        first = storage.listBackups()[-1]
+
+        time.sleep(1.1)  # 스냅샷 이름이 초 단위
+        storage.uploadFile("Group7", "Group7_godpack", {"a": "Good"}, 'JSON')
+        assert storage.backup()
+        second = storage.listBackups()[-1]
+        assert first != second
+
+        root = os.path.join(tmp, "backup")
+        admin = [os.stat(os.path.join(root, s, "group7", "admin.txt")) for s in (first, second)]
+        godpack = [os.stat(os.path.join(root, s, "group7", "godpack.json")) for s in (first, second)]
+        assert admin[0].st_ino == admin[1].st_ino       # 하드링크
+        assert godpack[0].st_ino != godpack[1].st_ino   # 복사
+
+        # 첫 스냅샷으로 복원
+        storage.uploadFile("Group7", "Group7_godpack", {"a": "Bad"}, 'JSON')
+        assert storage.restore(first, "group7")
+        assert storage.openFile("Group7", "Group7_godpack", 'JSON') == {"a": "Yet"}
+        # 복원한 파일은 스냅샷과 분리된 복사본
+        assert os.stat(os.path.join(tmp, "group7", "admin.txt")).st_ino != admin[0].st_ino
+    return True
+
+
+def test_prune_backups():
+    """시간/일/주 단위 보존"""
+    print("\n=== 보존 정리 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LocalFile(base_path=tmp, journal=False)
+        names = ["20250401_100000", "20250405_090000", "20250405_100000",
+                 "20250406_100000", "20250406_101000", "20250406_110000"]
+        for name in names:
+            os.makedirs(os.path.join(tmp, "backup", name))
+
+        removed = storage.pruneBackups(hourly=2, daily=2, weekly=0)
+        # 시간: 06일 11시, 06일 10시(10:10) / 일: 06일(11시), 05일(10:00)
+        assert sorted(removed) == ["20250401_100000", "20250405_090000", "20250406_100000"]
+        assert storage.listBackups() == ["20250405_100000", "20250406_101000", "20250406_110000"]
+    return True
+
+
+def main():
+    tests = [
+        ("증분 백업/복원", test_incremental_backup_and_restore),
+        ("보존 정리", test_prune_backups),
+    ]
+
+    results = []
+    for name, test in tests:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"❌ {name} 실패: {e}")
+            results.append((name, False))
+
+    print("\n=== 결과 ===")
+    for name, ok in results:
+        print(f"{'✅' if ok else '❌'} {name}")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+test_channel_cursor.py - 채널별 커서 저장/재개 및 조회 속도 제한 테스트
+"""
+
+import os
+import sys
+import time
+import asyncio
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules import ChannelCursor
+from src.modules.ChannelCursor import ChannelCursors, RateBudget
+
+
+def test_cursor_resume():
+    """처리 중 주기적으로 저장되고, 재시작하면 저장된 위치부터"""
+    print("=== 커서 저장/재개 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cursors.json")
+        cursors = ChannelCursors(path)
+        assert cursors.get(1) is None
+        for message_id in range(100, 100 + ChannelCursor.SAVE_EVERY + 5):
+            cursors.advance(1, message_id)
+        cursors.advance(1, 50)  # 뒤로 가지 않음
+
+        # 마지막 저장 이후 5개는 아직 파일에 없음 (중단 시 그 5개만 다시 읽음)
+        resumed = ChannelCursors(path)
+        assert resumed.get(1) == 100 + ChannelCursor.SAVE_EVERY - 1
+        assert cursors.save() and not cursors.save()
+        assert ChannelCursors(path).get("1") == 100 + ChannelCursor.SAVE_EVERY + 4
+    return True
+
+
+def test_rate_budget():
+    """여러 채널이 나눠 쓰는 토큰 버킷"""
+    print("\n=== 조회 속도 제한 테스트 ===")
+
+    async def run():
+        budget = RateBudget(rate=50, burst=2)
+        start = time.monotonic()
+        await asyncio.gather(*(budget.acquire() for _ in range(7)))
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(run())
+    assert 0.08 <= elapsed < 0.5, elapsed  # 2개는 바로, 나머지 5개는 초당 50개
+    return True
+
+
+def main():
+    tests = [
+        ("커서 저장/재개", test_cursor_resume),
+        ("조회 속도 제한", test_rate_budget),
+    ]
+
+    results = []
+    for name, test in tests:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"❌ {name} 실패: {e}")
+            results.append((name, False))
+
+    print("\n=== 결과 ===")
+    for name, ok in results:
+        print(f"{'✅' if ok else '❌'} {name}")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+test_codec.py - JSON / msgpack 자동 판별 저장 테스트
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules import Codec
+from src.modules.LocalFile import LocalFile
+from src.modules.GISTAdapter import JsonAdapter
+
+
+def test_detect_and_keep_format():
+    """파일별 형식 자동 판별, 다시 저장해도 기존 형식 유지"""
+    print("=== 형식 판별 테스트 ===")
+    if Codec.msgpack is None:
+        print("⚠️ msgpack 미설치 - 건너뜀")
+        return True
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LocalFile(base_path=tmp, journal=False)
+        path = os.path.join(tmp, "group7", "godpack.json")
+        Codec.write_file(path, {"2025.04.06 05:58 DUCK 735 20% 2P": "Yet"}, Codec.FORMAT_MSGPACK)
+        assert Codec.file_format(path) == Codec.FORMAT_MSGPACK
+
+        godpack = JsonAdapter(storage, "group7", "godpack.json", name="GodPack7")
+        assert godpack.DATA == {"2025.04.06 05:58 DUCK 735 20% 2P": "Yet"}
+        godpack.edit('+', "2025.04.06 06:00 DUCK 735 40% 1P", "Good")
+        godpack.update()
+        assert Codec.file_format(path) == Codec.FORMAT_MSGPACK
+        assert storage.openFile("group7", "godpack.json", "JSON") == godpack.DATA
+
+        # JSON 파일은 JSON으로 유지
+        storage.uploadFile("group8", "godpackCode.json", {"a": "b"}, "JSON")
+        assert Codec.file_format(os.path.join(tmp, "group8", "godpackCode.json")) == Codec.FORMAT_JSON
+    return True
+
+
+def main():
+    tests = [
+        ("형식 판별", test_detect_and_keep_format),
+    ]
+
+    results = []
+    for name, test in tests:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"❌ {name} 실패: {e}")
+            results.append((name, False))
+
+    print("\n=== 결과 ===")
+    for name, ok in results:
+        print(f"{'✅' if ok else '❌'} {name}")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+test_file_cache.py - stat() 기반 읽기 캐시 테스트
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.FileCache import StatCache, read_cache
+from src.modules.LocalFile import LocalFile
+from src.modules.GISTAdapter import TextAdapter, JsonAdapter
+
+
+def test_hit_until_file_changes():
+    """파일이 그대로면 적중, 바뀌면 다시 읽음"""
+    print("=== 캐시 적중 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "online.txt")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("a\nb")
+
+        cache = StatCache()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            with open(path, 'r', encoding='utf-8') as f:
+                return set(f.read().split('\n'))
+
+        first = cache.get(path, loader)
+        first.add("mutated")  # 반환값을 수정해도 캐시는 그대로
+        assert cache.get(path, loader) == {"a", "b"}
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("a\nb\nc")
+        assert cache.get(path, loader) == {"a", "b", "c"}
+        assert len(calls) == 2
+    return True
+
+
+def test_adapters_use_cache():
+    """fetch_raw 반복 호출은 stat()만 하고, 자신의 쓰기 직후에도 적중"""
+    print("\n=== 어댑터 캐시 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LocalFile(base_path=tmp, journal=False)
+        online = TextAdapter(storage, "group7", "online.txt", name="Group7", initial=False)
+        online.edit('+', "1234567890123456")
+        online.update()
+
+        hits = read_cache.hits
+        for _ in range(5):
+            assert online.fetch_raw() == {"1234567890123456"}
+        assert read_cache.hits - hits == 5
+
+        godpack = JsonAdapter(storage, "group7", "godpack.json", name="GodPack7")
+        godpack.edit('+', "k", "Yet")
+        godpack.update()
+        godpack.DATA["local"] = "only"
+        assert godpack.fetch_raw() == {"k": "Yet"}
+
+        storage.uploadFile("group7", "godpackCode.json", {"k": "code"}, "JSON")
+        assert storage.openFile("group7", "godpackCode.json", "JSON") == {"k": "code"}
+        hits = read_cache.hits
+        assert storage.openFile("group7", "godpackCode.json", "JSON") == {"k": "code"}
+        assert read_cache.hits - hits == 1
+    return True
+
+
+def main():
+    tests = [
+        ("캐시 적중", test_hit_until_file_changes),
+        ("어댑터 캐시", test_adapters_use_cache),
+    ]
+
+    results = []
+    for name, test in tests:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"❌ {name} 실패: {e}")
+            results.append((name, False))
+
+    print("\n=== 결과 ===")
+    for name, ok in results:
+        print(f"{'✅' if ok else '❌'} {name}")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
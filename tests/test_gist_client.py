@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+test_gist_client.py - GistClient 조건부 요청/동시성 제한 테스트 (로컬 HTTP 대역 서버 사용)
+"""
+
+import os
+import sys
+import json
+import asyncio
+import hashlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web
+from src.modules.GistClient import GistClient, GistBatcher
+
+
+def make_app(gists, stats):
+    """GitHub Gist API 흉내 (GET/PATCH /gists/{id}, ETag 지원)"""
+
+    def body_of(gist_id):
+        files = {name: {"filename": name, "content": content, "truncated": False}
+                 for name, content in gists[gist_id].items()}
+        return json.dumps({"id": gist_id, "files": files})
+
+    async def get_gist(request):
+        stats["get"] += 1
+        stats["active"] += 1
+        stats["peak"] = max(stats["peak"], stats["active"])
+        await asyncio.sleep(0.02)
+        stats["active"] -= 1
+        body = body_of(request.match_info["id"])
+        etag = '"' + hashlib.sha1(body.encode()).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(text=body, headers={"ETag": etag}, content_type="application/json")
+
+    async def patch_gist(request):
+        stats["patch"] += 1
+        payload = await request.json()
+        for name, info in payload["files"].items():
+            gists[request.match_info["id"]][name] = info["content"]
+        return web.Response(text=body_of(request.match_info["id"]), content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/gists/{id}", get_gist)
+    app.router.add_patch("/gists/{id}", patch_gist)
+    return app
+
+
+async def serve(app):
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def test_conditional_get_and_patch():
+    """변경 없으면 304로 캐시 재사용, PATCH 후에는 새 내용"""
+    print("=== 조건부 GET 테스트 ===")
+
+    async def scenario():
+        gists = {"g3": {"GodPack7": json.dumps({"a": "Yet"})}}
+        stats = {"get": 0, "patch": 0, "active": 0, "peak": 0}
+        runner, url = await serve(make_app(gists, stats))
+        client = GistClient(token="t", api_url=url, concurrency=2)
+        try:
+            assert await client.fetch_file("g3", "GodPack7") == json.dumps({"a": "Yet"})
+            assert await client.fetch_file("g3", "GodPack7") == json.dumps({"a": "Yet"})
+            assert client.not_modified == 1
+
+            assert await client.patch("g3", {"GodPack7": json.dumps({"a": "Good"})})
+            assert await client.fetch_file("g3", "GodPack7") == json.dumps({"a": "Good"})
+
+            # 동시성 제한
+            await asyncio.gather(*(client.get_gist("g3") for _ in range(8)))
+            assert stats["peak"] <= 2
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    asyncio.run(scenario())
+    return True
+
+
+def test_batched_patch():
+    """같은 GIST_ID 파일 변경은 한 번의 PATCH, 내용이 같으면 생략"""
+    print("\n=== 배치 PATCH 테스트 ===")
+
+    async def scenario():
+        gists = {"g3": {"GodPack7": "{}", "Code7": "{}"}}
+        stats = {"get": 0, "patch": 0, "active": 0, "peak": 0}
+        runner, url = await serve(make_app(gists, stats))
+        client = GistClient(token="t", api_url=url)
+        batcher = GistBatcher(client=client, window=0.05)
+        try:
+            results = await asyncio.gather(
+                batcher.submit("g3", "GodPack7", json.dumps({"a": "Yet"})),
+                batcher.submit("g3", "Code7", json.dumps({"a": "1234"})),
+            )
+            assert results == [True, True]
+            assert stats["patch"] == 1
+            assert gists["g3"]["Code7"] == json.dumps({"a": "1234"})
+
+            # 변경 없는 파일은 업로드하지 않음
+            assert await batcher.submit("g3", "GodPack7", json.dumps({"a": "Yet"}))
+            assert stats["patch"] == 1 and batcher.skipped == 1
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    asyncio.run(scenario())
+    return True
+
+
+def test_batch_during_flush():
+    """PATCH 중에 들어온 변경/실패한 변경도 다음 창에서 전송"""
+    print("\n=== 전송 중 변경 테스트 ===")
+
+    class SlowClient:
+        def __init__(self):
+            self.sent = []
+            self.fail = 1  # 첫 PATCH는 실패
+
+        async def patch(self, gist_id, files):
+            await asyncio.sleep(0.05)
+            if self.fail:
+                self.fail -= 1
+                return False
+            self.sent.append(dict(files))
+            return True
+
+    async def scenario():
+        client = SlowClient()
+        batcher = GistBatcher(client=client, window=0.01)
+        first = asyncio.create_task(batcher.submit("g", "a", "1"))
+        await asyncio.sleep(0.03)  # 첫 PATCH 진행 중
+        second = await batcher.submit("g", "a", "2")
+        assert await first is False  # 첫 창은 실패로 끝남
+        assert second is True
+        assert client.sent == [{"a": "2"}], client.sent
+        assert not batcher._pending.get("g")
+
+        # A -> B 전송 중에 A로 되돌림 -> 원격이 B로 남지 않고 A가 다시 전송됨
+        batcher.remember("g", "f", "A")
+        sending = asyncio.create_task(batcher.submit("g", "f", "B"))
+        await asyncio.sleep(0.03)  # B PATCH 진행 중
+        assert await batcher.submit("g", "f", "A") is True
+        assert await sending is True
+        assert client.sent[-2:] == [{"f": "B"}, {"f": "A"}], client.sent
+        assert not batcher._pending.get("g")
+
+    asyncio.run(scenario())
+    return True
+
+
+def main():
+    tests = [
+        ("조건부 GET", test_conditional_get_and_patch),
+        ("배치 PATCH", test_batched_patch),
+        ("전송 중 변경", test_batch_during_flush),
+    ]
+
+    results = []
+    for name, test in tests:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"❌ {name} 실패: {e}")
+            results.append((name, False))
+
+    print("\n=== 결과 ===")
+    for name, ok in results:
+        print(f"{'✅' if ok else '❌'} {name}")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+test_gist_server.py - Gist API 대역 서버(scripts/testing/gist_server.py) 테스트
+"""
+
+import os
+import sys
+import json
+import asyncio
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'scripts', 'testing'))
+
+import aiohttp
+from gist_server import GistStandIn
+from src.modules.GistClient import GistClient
+
+
+def test_standin_api():
+    """gist 정보/raw/PATCH, 속도 제한 헤더, 오류 주입"""
+    print("=== Gist 대역 서버 테스트 ===")
+
+    async def scenario():
+        server = GistStandIn({"g1": {"Alliance": json.dumps({"DUCK": "1234"})}}, rate_limit=100)
+        url = await server.start()
+        client = GistClient(token="t", api_url=url)
+        try:
+            assert await client.fetch_file("g1", "Alliance") == json.dumps({"DUCK": "1234"})
+            assert await client.patch("g1", {"Alliance": "{}", "New": "x"})
+            gist = await client.get_gist("g1")
+            assert set(gist["files"]) == {"Alliance", "New"}
+            raw_url = gist["files"]["New"]["raw_url"]
+            assert await client.get_text(raw_url) == "x"
+
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"{url}/gists/g1") as resp:
+                    assert resp.headers["X-RateLimit-Limit"] == "100"
+                    assert int(resp.headers["X-RateLimit-Remaining"]) < 100
+
+            # 오류 주입
+            server.error_rate = 1.0
+            assert not await client.patch("g1", {"New": "y"})
+            assert server.stats["errors"] == 1
+        finally:
+            await client.close()
+            await server.stop()
+
+    asyncio.run(scenario())
+    return True
+
+
+def main():
+    tests = [
+        ("Gist 대역 서버", test_standin_api),
+    ]
+
+    results = []
+    for name, test in tests:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"❌ {name} 실패: {e}")
+            results.append((name, False))
+
+    print("\n=== 결과 ===")
+    for name, ok in results:
+        print(f"{'✅' if ok else '❌'} {name}")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
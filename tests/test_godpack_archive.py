@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+test_godpack_archive.py - 갓팩 월별 아카이브 분리 테스트
+"""
+
+import os
+import sys
+import asyncio
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.LocalFile import LocalFile
+from src.modules.GISTAdapter import GodpackAdapter
+from src.modules.GodpackArchive import KST
+
+
+def test_archive_cold():
+    """오래된 Good/Bad/NaN만 월별 파일로 이동, Yet과 최근 기록은 유지"""
+    print("=== 아카이브 분리 테스트 ===")
+    now = datetime(2025, 6, 1, 12, 0, tzinfo=KST)
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LocalFile(base_path=tmp, journal=False)
+        godpack = GodpackAdapter(storage, "group7", "godpack.json", name="GodPack7")
+        godpack.edit('+', "2025.04.06 05:58 DUCK 735 20% 2P", "Good")
+        godpack.edit('+', "2025.04.20 09:00 DUCK 735 40% 1P", "Bad")
+        godpack.edit('+', "2025.05.02 10:00 NEQI 100 60% 3P", "NaN")
+        godpack.edit('+', "2025.04.01 10:00 OLD 1 80% 4P", "Yet")
+        godpack.edit('+', "2025.05.30 10:00 NEW 2 100% 5P", "Good")
+        godpack.update()
+
+        assert godpack.archive_cold(days=14, now=now) == 3
+        assert set(godpack.DATA) == {"2025.04.01 10:00 OLD 1 80% 4P", "2025.05.30 10:00 NEW 2 100% 5P"}
+        assert godpack.ARCHIVE.months() == ["2025-04", "2025-05"]
+
+        # 라이브 파일도 줄어든 상태로 저장
+        reloaded = GodpackAdapter(storage, "group7", "godpack.json", name="GodPack7")
+        assert set(reloaded.DATA) == set(godpack.DATA)
+
+        # 아카이브 조회
+        assert reloaded.ARCHIVE.query(name="DUCK", number="735") == {
+            "2025.04.06 05:58 DUCK 735 20% 2P": "Good",
+            "2025.04.20 09:00 DUCK 735 40% 1P": "Bad",
+        }
+        assert reloaded.ARCHIVE.query(since="2025-05") == {"2025.05.02 10:00 NEQI 100 60% 3P": "NaN"}
+        assert reloaded.ARCHIVE.get("2025.04.20 09:00 DUCK 735 40% 1P") == "Bad"
+
+        # 다시 실행해도 옮길 것이 없음
+        assert godpack.archive_cold(days=14, now=now) == 0
+    return True
+
+
+def test_async_archive_resumes():
+    """aarchive_cold - 아카이브만 쓰고 중단된 기록은 다음 실행이 중복 없이 옮김, 그동안 바뀐 상태는 유지"""
+    print("\n=== 비동기 아카이브/중단 후 재실행 테스트 ===")
+    now = datetime(2025, 6, 1, 12, 0, tzinfo=KST)
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LocalFile(base_path=tmp, journal=False)
+        godpack = GodpackAdapter(storage, "group7", "godpack.json", name="GodPack7")
+        godpack.edit('+', "2025.04.06 05:58 DUCK 735 20% 2P", "Good")
+        godpack.edit('+', "2025.04.20 09:00 DUCK 735 40% 1P", "Bad")
+        godpack.update()
+
+        # 아카이브 쓰기 후 라이브 저장 전에 중단된 상태
+        godpack.ARCHIVE.add({"2025.04.06 05:58 DUCK 735 20% 2P": "Bad"})
+        godpack.edit('+', "2025.04.06 05:58 DUCK 735 20% 2P", "Good")
+
+        async def run():
+            task = asyncio.create_task(godpack.aarchive_cold(days=14, now=now))
+            await asyncio.sleep(0)  # 아카이브를 쓰는 동안 상태 변경
+            godpack.edit('+', "2025.04.20 09:00 DUCK 735 40% 1P", "Good")
+            return await task
+
+        assert asyncio.run(run()) == 1
+        assert set(godpack.DATA) == {"2025.04.20 09:00 DUCK 735 40% 1P"}
+        assert godpack.ARCHIVE.get("2025.04.06 05:58 DUCK 735 20% 2P") == "Good"  # 라이브 값으로 덮어씀
+        reloaded = GodpackAdapter(storage, "group7", "godpack.json", name="GodPack7")
+        assert reloaded.DATA == {"2025.04.20 09:00 DUCK 735 40% 1P": "Good"}
+        assert asyncio.run(godpack.aarchive_cold(days=14, now=now)) == 1
+        assert godpack.ARCHIVE.query(name="DUCK") == {"2025.04.06 05:58 DUCK 735 20% 2P": "Good",
+                                                      "2025.04.20 09:00 DUCK 735 40% 1P": "Good"}
+    return True
+
+
+def main():
+    tests = [
+        ("아카이브 분리", test_archive_cold),
+        ("비동기 아카이브 재실행", test_async_archive_resumes),
+    ]
+
+    results = []
+    for name, test in tests:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"❌ {name} 실패: {e}")
+            results.append((name, False))
+
+    print("\n=== 결과 ===")
+    for name, ok in results:
+        print(f"{'✅' if ok else '❌'} {name}")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+test_godpack_index.py - 갓팩 키 보조 인덱스 테스트
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.GodpackIndex import GodpackIndex
+from src.modules.LocalFile import LocalFile
+from src.modules.GISTAdapter import GodpackAdapter
+
+
+def test_index_lookups():
+    """(이름, 번호) / sub / 제목 / 상태 조회"""
+    print("=== 인덱스 조회 테스트 ===")
+    index = GodpackIndex({
+        "2025.04.06 05:58 DUCK 735 20% 2P": "Yet",
+        "2025.04.07 10:00 DUCK 735 100% 1P": "Good",
+        "2025.04.07 11:00 NEQI 귀이이 Palkia Trainer 3P": "Yet",
+    })
+    assert index.find("DUCK", "735") == ["2025.04.06 05:58 DUCK 735 20% 2P", "2025.04.07 10:00 DUCK 735 100% 1P"]
+    assert index.find_sub("DUCK 735 100% 1P") == "2025.04.07 10:00 DUCK 735 100% 1P"
+    assert index.title("2025.04.06 05:58 DUCK 735 20% 2P") == "DUCK 735 / 20% / 2P / 2025.04.06 05:58"
+    # 이름에 공백이 있어도 뒤에서부터 분해
+    assert index.find("NEQI 귀이이", "Palkia") == ["2025.04.07 11:00 NEQI 귀이이 Palkia Trainer 3P"]
+
+    index.add("2025.04.06 05:58 DUCK 735 20% 2P", "Bad")
+    assert index.keys_with_state("Yet") == ["2025.04.07 11:00 NEQI 귀이이 Palkia Trainer 3P"]
+    index.remove("2025.04.07 10:00 DUCK 735 100% 1P")
+    assert index.find_sub("DUCK 735 100% 1P") is None
+    assert index.keys_with_state("Good") == []
+    return True
+
+
+def test_multi_word_special_keys():
+    """여러 단어 카드 타입(Full Art / Double two star) 키와 분해 안 되는 키"""
+    print("\n=== Special 키 분해 테스트 ===")
+    full_art = "2025.06.06 22:48 「NEQI ㆍ귀이이 1.•넅 Solgaleo Full Art 2P"
+    double = "2025.06.07 01:02 Rami108 Dialga Double two star 1P"
+    odd = "2025.06.07 01:03 Saisai10 Shining"  # 팩 자리가 없는 형식
+    index = GodpackIndex({full_art: "Yet", double: "Yet", odd: "Yet"})
+    assert index.find("「NEQI ㆍ귀이이 1.•넅", "Solgaleo") == [full_art]
+    assert index.find("Rami108", "Dialga") == [double]
+    assert index.title(double) == "Rami108 Dialga / Double two star / 1P / 2025.06.07 01:02"
+    assert index.find_sub("Rami108 Dialga Double two star 1P") == double
+    assert index.find("Saisai10", "Shining") == [odd]  # 부분 문자열로 찾음
+    index.remove(odd)
+    assert index.find("Saisai10", "Shining") == []
+    return True
+
+
+def test_adapter_keeps_index():
+    """GodpackAdapter는 edit/load 마다 인덱스 갱신"""
+    print("\n=== 어댑터 인덱스 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LocalFile(base_path=tmp, journal=False)
+        godpack = GodpackAdapter(storage, "group7", "godpack.json", name="GodPack7")
+        godpack.edit('+', "2025.04.06 05:58 DUCK 735 20% 2P", "Yet")
+        godpack.update()
+        assert godpack.INDEX.keys_with_state("Yet") == ["2025.04.06 05:58 DUCK 735 20% 2P"]
+
+        reloaded = GodpackAdapter(storage, "group7", "godpack.json", name="GodPack7")
+        assert reloaded.INDEX.find("DUCK", "735") == ["2025.04.06 05:58 DUCK 735 20% 2P"]
+    return True
+
+
+def main():
+    tests = [
+        ("인덱스 조회", test_index_lookups),
+        ("Special 키 분해", test_multi_word_special_keys),
+        ("어댑터 인덱스", test_adapter_keeps_index),
+    ]
+
+    results = []
+    for name, test in tests:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"❌ {name} 실패: {e}")
+            results.append((name, False))
+
+    print("\n=== 결과 ===")
+    for name, ok in results:
+        print(f"{'✅' if ok else '❌'} {name}")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
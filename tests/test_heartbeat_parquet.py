@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+test_heartbeat_parquet.py - Heartbeat Parquet 내보내기 / 파티션 정리 / 집계 테스트
+"""
+
+import os
+import sys
+import json
+import tempfile
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.HeartbeatStore import HeartbeatStore
+from src.modules import HeartbeatParquet
+
+NOW = datetime(2025, 4, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def hb(day, hour, minute, barracks, group="GROUP7", rate=None):
+    record = {"timestamp": f"2025-04-{day:02d}T{hour:02d}:{minute:02d}:00+00:00", "source_group": group,
+              "barracks": barracks, "version": "v1", "type": "Inject", "select": "Mewtwo"}
+    if rate is not None:
+        record.update(time_minutes=60, packs=int(rate * 60), packs_per_min=rate)
+    return record
+
+
+def test_export_and_query():
+    """내보내기 -> 날짜 파티션, 조건 조회, 파티션 정리"""
+    print("=== 내보내기/조회 테스트 ===")
+    if not HeartbeatParquet.AVAILABLE:
+        print("pyarrow 없음 - 건너뜀")
+        return True
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HeartbeatStore(os.path.join(tmp, "heartbeat_data"))
+        store.write("a", [hb(8, 10, 0, 20), hb(8, 10, 30, 24), hb(9, 10, 0, 30)])
+        store.write("b", [hb(8, 10, 15, 10, group="GROUP8"), {"timestamp": "broken"}])
+
+        parquet = HeartbeatParquet.HeartbeatParquet(os.path.join(tmp, "parquet"))
+        assert parquet.export_store(store) == 5
+        assert parquet.dates() == ["2025-04-08", "2025-04-09"]
+
+        # Poke20 형식(<user>.json 리스트)은 변환 없이 읽기만
+        legacy = HeartbeatStore(os.path.join(tmp, "heartbeat_data20"))
+        os.makedirs(legacy.data_dir)
+        with open(os.path.join(legacy.data_dir, "c.json"), 'w', encoding='utf-8') as f:
+            json.dump([hb(7, 9, 0, 5)], f)
+        other = HeartbeatParquet.HeartbeatParquet(os.path.join(tmp, "parquet20"))
+        assert other.export_store(legacy) == 1 and other.dates() == ["2025-04-07"]
+        assert os.listdir(legacy.data_dir) == ["c.json"]
+
+        df = parquet.query(columns=["user", "barracks"], since=datetime(2025, 4, 9, tzinfo=timezone.utc))
+        assert df.to_dict("records") == [{"user": "a", "barracks": 30}]
+        assert len(parquet.query(groups=["GROUP8"])) == 1
+
+        # 이어서 추가 -> 파티션에 파일이 늘었다가 정리 후 하나로
+        parquet.add("b", hb(8, 11, 0, 12, group="GROUP8"))
+        assert parquet.flush() == 1
+        assert parquet.compact() == 1
+        assert len(os.listdir(os.path.join(parquet.root_dir, "date=2025-04-08"))) == 1
+        assert len(parquet.query()) == 5
+
+        hourly = HeartbeatParquet.barracks_per_group_hour(parquet, days=30, now=NOW)
+        rows = {(r["source_group"], r["hour"].hour, r["hour"].day): r["barracks"] for r in hourly.to_dict("records")}
+        assert rows[("GROUP7", 10, 8)] == 24  # 사용자별 시간 최대값
+        assert rows[("GROUP8", 11, 8)] == 12
+    return True
+
+
+def test_packs_per_min_drop():
+    """기준 기간보다 packs/min이 떨어진 사용자"""
+    print("\n=== packs/min 하락 테스트 ===")
+    if not HeartbeatParquet.AVAILABLE:
+        print("pyarrow 없음 - 건너뜀")
+        return True
+    with tempfile.TemporaryDirectory() as tmp:
+        parquet = HeartbeatParquet.HeartbeatParquet(tmp)
+        for day in (5, 6, 7):
+            parquet.add("slow", hb(day, 10, 0, 20, rate=2.0))
+            parquet.add("steady", hb(day, 10, 0, 20, rate=2.0))
+        parquet.add("slow", hb(10, 1, 0, 20, rate=1.0))
+        parquet.add("steady", hb(10, 1, 0, 20, rate=1.9))
+        parquet.flush()
+
+        df = HeartbeatParquet.packs_per_min_drop(parquet, recent_hours=24, baseline_days=7, now=NOW)
+        assert df["user"].tolist() == ["slow"]
+        assert df["change"].tolist() == [-0.5]
+    return True
+
+
+def main():
+    tests = [
+        ("내보내기/조회", test_export_and_query),
+        ("packs/min 하락", test_packs_per_min_drop),
+    ]
+
+    results = []
+    for name, test in tests:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"❌ {name} 실패: {e}")
+            results.append((name, False))
+
+    print("\n=== 결과 ===")
+    for name, ok in results:
+        print(f"{'✅' if ok else '❌'} {name}")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+test_heartbeat_parser.py - Heartbeat 메시지 파서 골든 테스트
+메시지 형식은 scripts/testing/test_cases/messages.py, messages_for_barrack.py 의 생성 형식을 그대로 사용
+"""
+
+import os
+import sys
+import math
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules import HeartbeatParser
+
+# messages.py create_heartbeat_message
+STANDARD = '''papawolf
+Online: 1, 2, 3, 4
+Offline: Main
+Time: 120m | Packs: 300 | Avg: 2.50 packs/min
+Version: Arturo-v6.3.29
+Type: 5 Pack (Fast) (Menu Delete)
+Opening: Shining'''
+
+# messages.py 초기 로그인 (0분, 0팩)
+INITIAL = '''papawolf
+Online: 1, 2, 3, 4
+Offline: Main
+Time: 0m | Packs: 0 | Avg: 0.00 packs/min
+Version: Arturo-v6.3.29
+Type: 5 Pack (Fast) (Menu Delete)
+Opening: Mew'''
+
+# messages_for_barrack.py create_heartbeat_message (Time 줄에 "|" 하나 빠짐, Opening 여러 개)
+BARRACK = '''user3
+Online: Main, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10
+Offline: none
+Time: 45m Packs: 90 | Avg: 2.00 packs/min
+Version: mixman208-v6.4.14
+Type: Inject for Reroll (1P Method)
+Opening: Arceus, Palkia,'''
+
+# Select와 Opening이 함께 있는 구형 메시지
+SELECT_AND_OPENING = '''olduser
+Online: 1, 2
+Select: Buzzwole
+Opening: Buzzwole, Solgaleo
+Type: 96P'''
+
+GOLDEN = [
+    (STANDARD,
+     {'barracks': 4, 'version': 'Arturo-v6.3.29', 'type': '5 Pack (Fast) (Menu Delete)', 'select': 'Shining',
+      'time_minutes': 120, 'packs': 300, 'packs_per_min': 2.5},
+     {'BARRACKS': 4, 'RUNTIME': 120, 'PACKS': 300, 'AVG': 2.5, 'TYPE': 5,
+      'METHOD': ['Fast', 'Menu Delete'], 'SELECT': ['Shining']}),
+    (INITIAL,
+     {'barracks': 4, 'version': 'Arturo-v6.3.29', 'type': '5 Pack (Fast) (Menu Delete)', 'select': 'Mew',
+      'time_minutes': 0, 'packs': 0, 'packs_per_min': 0.0},
+     {'BARRACKS': 4, 'RUNTIME': 0, 'PACKS': 0, 'AVG': float('nan'), 'TYPE': 5,
+      'METHOD': ['Fast', 'Menu Delete'], 'SELECT': ['Mew']}),
+    (BARRACK,
+     {'barracks': 10, 'version': 'mixman208-v6.4.14', 'type': 'Inject for Reroll (1P Method)',
+      'select': 'Arceus, Palkia,'},
+     {'BARRACKS': 10, 'RUNTIME': 45, 'PACKS': 90, 'AVG': 2.0, 'TYPE': None,
+      'METHOD': ['1P Method'], 'SELECT': ['Arceus', 'Palkia']}),
+    (SELECT_AND_OPENING,
+     {'barracks': 2, 'version': 'Unknown', 'type': '96P', 'select': 'Buzzwole, Solgaleo'},
+     {'BARRACKS': 2, 'TYPE': 96, 'METHOD': [], 'SELECT': ['Buzzwole', 'Solgaleo']}),
+]
+
+
+def same(actual, expected):
+    """NaN끼리도 같다고 보는 dict 비교"""
+    if actual.keys() != expected.keys():
+        return False
+    return all(actual[k] == expected[k] or (isinstance(expected[k], float) and math.isnan(expected[k])
+                                            and math.isnan(actual[k])) for k in expected)
+
+
+def test_golden():
+    """Poke2 기록 필드 / GIST.USER.extract 필드가 기존과 같음"""
+    print("=== 골든 메시지 테스트 ===")
+    for content, record, inform in GOLDEN:
+        heartbeat = HeartbeatParser.parse(content)
+        assert heartbeat.user_name == content.split("\n")[0]
+        assert HeartbeatParser.to_record(heartbeat) == record, HeartbeatParser.to_record(heartbeat)
+        actual = HeartbeatParser.to_inform(heartbeat, "created")
+        assert actual.pop('TIME') == "created"
+        assert same(actual, inform), actual
+    return True
+
+
+def test_case_and_missing_fields():
+    """Poke2는 줄 앞 키를 대소문자 무시, GIST는 대소문자 구분 / 없는 값은 기본값"""
+    print("\n=== 대소문자/누락 필드 테스트 ===")
+    heartbeat = HeartbeatParser.parse("someone\r\nonline: 7 8\r\nversion: v1 \r\ntime: 3m | packs: 9 | avg: 3.00 packs/min")
+    assert HeartbeatParser.to_record(heartbeat) == {
+        'barracks': 2, 'version': 'v1', 'type': 'Unknown', 'select': 'Unknown',
+        'time_minutes': 3, 'packs': 9, 'packs_per_min': 3.0}
+    assert HeartbeatParser.to_inform(heartbeat, 0) == {'TIME': 0}
+    assert HeartbeatParser.parse("").user_name == ""
+    return True
+
+
+def main():
+    tests = [
+        ("골든 메시지", test_golden),
+        ("대소문자/누락 필드", test_case_and_missing_fields),
+    ]
+
+    results = []
+    for name, test in tests:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"❌ {name} 실패: {e}")
+            results.append((name, False))
+
+    print("\n=== 결과 ===")
+    for name, ok in results:
+        print(f"{'✅' if ok else '❌'} {name}")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+test_heartbeat_queue.py - Heartbeat 일괄 처리 큐 (우선순위/묶음/대기/커서 위치) 테스트
+"""
+
+import os
+import sys
+import asyncio
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.HeartbeatQueue import HeartbeatQueue, LIVE, BACKFILL
+from src.modules.HeartbeatStore import HeartbeatStore
+from src.modules.ChannelCursor import ChannelCursors
+
+
+def hb(minute):
+    return {"timestamp": f"2025-04-01T10:{minute:02d}:00+00:00", "barracks": minute}
+
+
+def test_batches_and_priority():
+    """live가 backfill보다 먼저, 사용자별 한 번의 쓰기로 저장"""
+    print("=== 묶음 처리/우선순위 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HeartbeatStore(os.path.join(tmp, "heartbeat_data"))
+        batches = []
+
+        def handler(items):
+            batches.append([item.source for item in items])
+            by_user = {}
+            for item in items:
+                by_user.setdefault(item.payload[0], []).append(item.payload[1])
+            return sum(len(store.append_many(user, records)) for user, records in by_user.items())
+
+        async def run():
+            queue = HeartbeatQueue(handler, workers=1, batch_size=10, batch_wait=0)
+            for minute in range(1, 6):
+                await queue.put(1, 100 + minute, ("a", hb(minute)), BACKFILL)
+            await queue.put(1, 100 + 3, ("a", hb(3)), BACKFILL)  # 중복
+            await queue.put(2, 900, ("b", hb(30)), LIVE)
+            queue.start()
+            await queue.wait_channel(1)
+            await queue.stop()
+            return queue
+
+        queue = asyncio.run(run())
+        assert batches == [[LIVE] + [BACKFILL] * 6], batches
+        assert queue.stats["processed"] == 7 and queue.stats["stored"] == 6
+        assert [r["barracks"] for r in store.read("a")] == [1, 2, 3, 4, 5]
+        assert store.manifest("a")["count"] == 5
+    return True
+
+
+def test_backpressure_and_position():
+    """자리가 차면 put()이 기다리고, 커서 위치는 처리 안 된 메시지를 넘지 않음"""
+    print("\n=== 대기/커서 위치 테스트 ===")
+    positions = []
+
+    async def run():
+        queue = HeartbeatQueue(len, workers=1, maxsize=2, batch_size=1, batch_wait=0,
+                               after_batch=lambda items: positions.append(
+                                   (queue.position(1), queue.position(1, include_live=False))))
+        await queue.put(1, 10, None, BACKFILL)
+        await queue.put(1, 11, None, BACKFILL)
+        blocked = asyncio.create_task(queue.put(1, 12, None, BACKFILL))
+        await asyncio.sleep(0.01)
+        assert not blocked.done() and queue.stats["put_waits"] == 1
+        await queue.put(1, 50, None, LIVE)  # live 자리는 따로
+
+        queue.start()
+        await blocked
+        await queue.wait_channel(1)
+        await queue.stop()
+        return queue
+
+    queue = asyncio.run(run())
+    assert positions[0] == (9, None), positions  # live 50 처리, 10은 아직 -> 9까지만
+    assert positions[1] == (10, 10), positions
+    assert positions[-1] == (50, 12), positions
+    assert queue.depth() == 0 and queue.stats["stored"] == 4 and "평균 묶음" in queue.summary()
+    return True
+
+
+def test_failed_batch_blocks_cursor():
+    """async 처리 함수 실패 -> after_batch 안 부르고, 커서 위치는 실패한 메시지 앞에서 멈춤"""
+    print("\n=== 처리 실패 테스트 ===")
+    finished = []
+
+    async def handler(items):
+        await asyncio.sleep(0)
+        if any(item.message_id == 11 for item in items):
+            raise OSError("disk full")
+        return len(items)
+
+    async def run():
+        queue = HeartbeatQueue(handler, workers=2, maxsize=1, batch_size=1, batch_wait=0,
+                               after_batch=lambda items: finished.extend(item.message_id for item in items))
+        queue.start()
+        for message_id in (10, 11, 12):
+            await queue.put(1, message_id, None, BACKFILL)  # 자리 하나 -> 실패해도 자리는 풀림
+        await queue.wait_channel(1)
+        await queue.stop()
+        return queue
+
+    queue = asyncio.run(run())
+    assert finished == [10, 12], finished
+    assert queue.position(1) == 10 and queue.stats["errors"] == 1 and queue.stats["stored"] == 2
+
+    # 따라잡기 끝(Heartbeat가 아닌 메시지 13까지 스캔)에서도 커서는 실패한 11 앞에 머묾
+    with tempfile.TemporaryDirectory() as tmp:
+        cursors = ChannelCursors(os.path.join(tmp, "cursors.json"))
+        cursors.advance(1, queue.scanned_position(1, 13))
+        assert cursors.get(1) == 10
+        cursors.advance(2, queue.scanned_position(2, 13))  # 실패 없는 채널은 끝까지
+        assert cursors.get(2) == 13
+    return True
+
+
+def main():
+    tests = [
+        ("묶음 처리/우선순위", test_batches_and_priority),
+        ("대기/커서 위치", test_backpressure_and_position),
+        ("처리 실패", test_failed_batch_blocks_cursor),
+    ]
+
+    results = []
+    for name, test in tests:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"❌ {name} 실패: {e}")
+            results.append((name, False))
+
+    print("\n=== 결과 ===")
+    for name, ok in results:
+        print(f"{'✅' if ok else '❌'} {name}")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
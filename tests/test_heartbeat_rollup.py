@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+test_heartbeat_rollup.py - Heartbeat 보존 기간 / 시간·일별 요약 테스트
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.HeartbeatStore import HeartbeatStore
+from src.modules.HeartbeatRollup import HeartbeatRollup
+
+NOW = datetime(2025, 4, 20, 12, 30, tzinfo=timezone.utc)
+
+
+def hb(day, hour, minute, barracks, select="Mewtwo", version="v1"):
+    return {"timestamp": f"2025-04-{day:02d}T{hour:02d}:{minute:02d}:00+00:00", "source_group": "GROUP7",
+            "barracks": barracks, "version": version, "type": "Inject", "select": select}
+
+
+def test_roll_up_old_records():
+    """보존 기간이 지난 원본만 요약으로 옮기고 원본 파일에서 제거"""
+    print("=== 요약 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HeartbeatStore(tmp)
+        store.write("user", [
+            hb(1, 10, 0, 10), hb(1, 10, 10, 20, select="Lunala"), hb(1, 10, 20, 30), hb(1, 11, 50, 40),
+            hb(2, 9, 0, 50, version="v2"),
+            hb(19, 9, 0, 60),  # 보존 기간 안
+        ])
+        rollup = HeartbeatRollup(store, raw_days=7, hourly_days=30)
+        assert rollup.run(NOW) == {"user": 5}
+        assert rollup.run(NOW) == {}
+        assert [r["barracks"] for r in store.read("user")] == [60]
+
+        data = rollup.load("user")
+        assert sorted(data["hourly"]) == ["2025-04-01T10", "2025-04-01T11", "2025-04-02T09"]
+        assert sorted(data["daily"]) == ["2025-04-01", "2025-04-02"]
+
+        rows = rollup.history("user")
+        hour = rows[0]
+        assert hour["bucket"] == "2025-04-01T10" and hour["count"] == 3
+        assert (hour["barracks_min"], hour["barracks_max"], hour["barracks_avg"]) == (10, 30, 20)
+        assert hour["online_minutes"] == 20 + 15  # 10분 + 10분 + (다음 기록까지 90분 -> 최대 15분)
+        assert hour["pack_select"] == "Mewtwo" and hour["version"] == "v1"
+        assert rows[-1]["timestamp"].startswith("2025-04-19")  # 최근 원본
+
+        day = rollup.history("user", since="2025-04-02", resolution="daily")
+        assert day[0]["bucket"] == "2025-04-02" and day[0]["version"] == "v2"
+        assert len(day) == 2
+
+        # 시간별 보존 기간이 지나면 일별 요약으로 조회
+        rollup = HeartbeatRollup(store, raw_days=0, hourly_days=2)
+        rollup.run(NOW)
+        buckets = [row.get("bucket") for row in rollup.history("user")]
+        assert buckets == ["2025-04-01", "2025-04-02", "2025-04-19T09"]
+    return True
+
+
+def main():
+    tests = [
+        ("요약", test_roll_up_old_records),
+    ]
+
+    results = []
+    for name, test in tests:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"❌ {name} 실패: {e}")
+            results.append((name, False))
+
+    print("\n=== 결과 ===")
+    for name, ok in results:
+        print(f"{'✅' if ok else '❌'} {name}")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
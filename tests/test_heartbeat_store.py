@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+test_heartbeat_store.py - 사용자별 JSONL Heartbeat 저장소 테스트
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.HeartbeatStore import HeartbeatStore
+
+
+def hb(minute, **extra):
+    return {"timestamp": f"2025-04-01T10:{minute:02d}:00+00:00", "online": ["1"], **extra}
+
+
+def test_append_and_dedup():
+    """한 줄 추가, 같은 timestamp 무시, 순서가 뒤바뀐 기록은 compaction으로 정렬"""
+    print("=== 추가/중복 제거 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HeartbeatStore(tmp)
+        assert store.append("user/1", hb(1))
+        assert store.append("user/1", hb(3))
+        assert not store.append("user/1", hb(3))   # 최신과 같은 timestamp
+        assert store.append("user/1", hb(2))       # 오래된 기록
+        assert not store.append("user/1", hb(2))   # 파일에 이미 있음
+        assert store.latest("user/1")["timestamp"].startswith("2025-04-01T10:03")
+
+        path = store.path("user/1")
+        assert os.path.basename(path) == "user_1.jsonl"
+        with open(path, encoding='utf-8') as f:
+            assert len(f.readlines()) == 3
+
+        assert store.compact() == 1
+        assert store.compact() == 0
+        with open(path, encoding='utf-8') as f:
+            stamps = [json.loads(line)["timestamp"][11:16] for line in f]
+        assert stamps == ["10:01", "10:02", "10:03"]
+        assert [r["timestamp"][11:16] for r in store.read("user/1")] == stamps
+    return True
+
+
+def test_dedup_window_after_restart():
+    """재시작 후에도 파일 끝에서 만든 창으로 중복 확인, 창보다 오래된 기록만 파일 확인"""
+    print("\n=== 중복 확인 창 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HeartbeatStore(tmp)
+        store.write("user", [hb(m) for m in range(0, 60, 2)])
+
+        store = HeartbeatStore(tmp)
+        store.load_latest()
+        reads = []
+        store.read = lambda user_name, _read=store.read: reads.append(user_name) or _read(user_name)
+        assert not store.append("user", hb(30))   # 재시작 전 기록과 겹침 (창에서 확인)
+        assert store.append("user", hb(31))       # 창 안의 새 기록
+        assert reads == []
+
+        import src.modules.HeartbeatStore as module
+        window, module.DEDUP_WINDOW = module.DEDUP_WINDOW, 4
+        try:
+            store = HeartbeatStore(tmp)
+            assert not store.append("user", hb(58))  # 창 안 (파일 끝)
+            assert reads == []
+            store.read = lambda user_name, _read=store.read: reads.append(user_name) or _read(user_name)
+            assert not store.append("user", hb(2))   # 창보다 오래됨 -> 파일 확인
+            assert store.append("user", hb(3))
+            assert reads == ["user", "user"]
+        finally:
+            module.DEDUP_WINDOW = window
+    return True
+
+
+def test_migrate_and_load_latest():
+    """기존 <user>.json / _last.json 을 JSONL로 변환하고 최신 기록만 로드"""
+    print("\n=== 기존 파일 변환 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "old.json"), 'w', encoding='utf-8') as f:
+            json.dump([hb(5), hb(4)], f)
+        with open(os.path.join(tmp, "old_last.json"), 'w', encoding='utf-8') as f:
+            json.dump(hb(5), f)
+        HeartbeatStore(tmp).append("new", hb(7))
+        with open(os.path.join(tmp, "new.jsonl"), 'a', encoding='utf-8') as f:
+            f.write('{"timestamp": "2025-04-01T10:0')  # 잘린 마지막 줄
+
+        # 변환 전에는 읽기 전용으로 읽을 수 있고 파일은 그대로 (Poke20 폴더)
+        store = HeartbeatStore(tmp)
+        assert store.users() == ["new"] and store.legacy_users() == ["old"]
+        assert [r["timestamp"][11:16] for r in store.read_legacy("old")] == ["10:04", "10:05"]
+        assert os.path.exists(os.path.join(tmp, "old_last.json"))
+
+        latest = store.load_latest()
+        assert store.legacy_users() == []
+        assert sorted(f for f in os.listdir(tmp) if not f.startswith("_")) == ["new.jsonl", "old.jsonl"]
+        assert latest["old"]["timestamp"][11:16] == "10:05"
+        assert latest["new"]["timestamp"][11:16] == "10:07"
+        assert [r["timestamp"][11:16] for r in store.read("old")] == ["10:04", "10:05"]
+
+        # 잘린 줄 뒤에 추가해도 새 기록은 온전히 남음
+        assert store.append("new", hb(8))
+        assert [r["timestamp"][11:16] for r in store.read("new")] == ["10:07", "10:08"]
+    return True
+
+
+def test_manifest():
+    """매니페스트 + 로그만으로 최신 상태 복원, 체크포인트 후 로그 비움"""
+    print("\n=== 매니페스트 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HeartbeatStore(tmp)
+        store.write("a", [hb(1), hb(2)])
+        assert store.load_latest()["a"]["timestamp"][11:16] == "10:02"  # 전체 스캔 -> 매니페스트 생성
+        assert os.path.getsize(os.path.join(tmp, "_manifest.log")) == 0
+        store.append("a", hb(3))
+        store.append("b", hb(9))
+
+        restarted = HeartbeatStore(tmp)
+        restarted._read_tail = None  # 사용자 파일은 읽지 않음
+        latest = restarted.load_latest()
+        assert {user: r["timestamp"][11:16] for user, r in latest.items()} == {"a": "10:03", "b": "10:09"}
+        assert restarted.high_water_mark()[11:16] == "10:09"
+        entry = restarted.manifest("a")
+        assert entry["count"] == 3 and entry["size"] == os.path.getsize(store.path("a"))
+
+        restarted.checkpoint()
+        assert os.path.getsize(os.path.join(tmp, "_manifest.log")) == 0
+        assert HeartbeatStore(tmp).load_latest().keys() == {"a", "b"}
+    return True
+
+
+def test_stale_manifest():
+    """파일 추가 뒤 로그 기록 전 중단 - 크기가 어긋난 사용자만 다시 읽음, 매니페스트 없이 시작한 체크포인트도 전체 포함"""
+    print("\n=== 매니페스트 불일치 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HeartbeatStore(tmp)
+        store.write("a", [hb(1)])
+        store.write("b", [hb(2)])
+        store.load_latest()
+        with open(store.path("a"), 'a', encoding='utf-8') as f:  # 로그에 남지 않은 추가
+            f.write(json.dumps(hb(5)) + '\n')
+        with open(os.path.join(tmp, "c.jsonl"), 'w', encoding='utf-8') as f:  # 매니페스트에 없는 파일
+            f.write(json.dumps(hb(7)) + '\n')
+
+        restarted = HeartbeatStore(tmp)
+        latest = restarted.load_latest()
+        assert {user: r["timestamp"][11:16] for user, r in latest.items()} == {"a": "10:05", "b": "10:02", "c": "10:07"}
+        entry = restarted.manifest("a")
+        assert entry["count"] == 2 and entry["size"] == os.path.getsize(store.path("a"))
+
+        # _manifest.json 이 없을 때 추가된 사용자만으로 체크포인트하지 않음
+        os.remove(os.path.join(tmp, "_manifest.json"))
+        partial = HeartbeatStore(tmp)
+        assert partial.append("a", hb(6))
+        partial.checkpoint()
+        with open(os.path.join(tmp, "_manifest.json"), encoding='utf-8') as f:
+            assert set(json.load(f)["users"]) == {"a", "b", "c"}
+        assert HeartbeatStore(tmp).load_latest()["a"]["timestamp"][11:16] == "10:06"
+    return True
+
+
+def test_sanitized_user_name():
+    """파일명으로 바뀌는 이름 ("a/b") - 재시작/복원 후에도 중복 확인과 최신 기록이 같은 키로"""
+    print("\n=== 파일명 변환 이름 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HeartbeatStore(tmp)
+        store.load_latest()
+        assert store.append("a/b", hb(1)) and store.append("a/b", hb(2))
+        state = store.snapshot()
+        assert list(state) == ["a/b"]
+
+        restarted = HeartbeatStore(tmp)
+        assert restarted.load_latest() == {"a/b": hb(2)}
+        assert restarted.latest("a/b") == hb(2)
+        assert not restarted.append("a/b", hb(2))  # 중복
+        assert restarted.display_name("a_b") == "a/b"
+
+        restored = HeartbeatStore(tmp)
+        restored.restore(state)
+        assert not restored.append("a/b", hb(1))
+        assert restored.read("a/b") == [hb(1), hb(2)]
+    return True
+
+
+def main():
+    tests = [
+        ("추가/중복 제거", test_append_and_dedup),
+        ("중복 확인 창", test_dedup_window_after_restart),
+        ("기존 파일 변환", test_migrate_and_load_latest),
+        ("매니페스트", test_manifest),
+        ("매니페스트 불일치", test_stale_manifest),
+        ("파일명 변환 이름", test_sanitized_user_name),
+    ]
+
+    results = []
+    for name, test in tests:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"❌ {name} 실패: {e}")
+            results.append((name, False))
+
+    print("\n=== 결과 ===")
+    for name, ok in results:
+        print(f"{'✅' if ok else '❌'} {name}")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+test_journal.py - LocalFile 저널 모드(추가 전용 로그 + compaction) 테스트
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.LocalFile import LocalFile
+from src.modules.GISTAdapter import TextAdapter, JsonAdapter
+
+
+def test_edit_appends_without_rewrite():
+    """저널 모드에서는 update()가 스냅샷을 다시 쓰지 않고 로그만 늘어남"""
+    print("=== 저널 추가 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LocalFile(base_path=tmp, journal=True)
+        godpack = JsonAdapter(storage, "group7", "godpack.json", name="GodPack7")
+        for i in range(10):
+            godpack.edit('+', f"2025.04.06 05:{i:02d} name 735 20% 2P", "Yet")
+            godpack.update()
+        godpack.edit('-', "2025.04.06 05:00 name 735 20% 2P")
+        godpack.update()
+
+        assert not os.path.exists(godpack.file_path)
+        with open(godpack.file_path + '.log', 'r', encoding='utf-8') as f:
+            assert len(f.readlines()) == 11
+
+        # 새 인스턴스는 로그를 재생해서 동일한 상태 복원
+        reloaded = JsonAdapter(storage, "group7", "godpack.json", name="GodPack7")
+        assert reloaded.DATA == godpack.DATA
+        assert len(reloaded.DATA) == 9
+    return True
+
+
+def test_compaction_and_partial_line():
+    """임계값 초과 시 compaction, 잘린 마지막 줄은 무시"""
+    print("\n=== compaction 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LocalFile(base_path=tmp, journal=True)
+        online = TextAdapter(storage, "group7", "online.txt", name="Group7")
+        online.journal.max_bytes = 200
+        for i in range(20):
+            online.edit('+', f"{i:016d}")
+            online.update()
+
+        # 최소 한 번은 스냅샷이 기록되고 로그는 임계값 아래로 유지
+        assert os.path.exists(online.file_path)
+        assert os.path.getsize(online.file_path + '.log') < 200
+
+        # 비정상 종료로 잘린 줄 추가
+        with open(online.file_path + '.log', 'a', encoding='utf-8') as f:
+            f.write('{"t": 1, "op": "+", "k": "broken')
+
+        reloaded = TextAdapter(storage, "group7", "online.txt", name="Group7")
+        assert reloaded.DATA == {f"{i:016d}" for i in range(20)}
+    return True
+
+
+def test_localfile_open_replays_journal():
+    """LocalFile.openFile도 스냅샷 + 로그를 합쳐서 반환"""
+    print("\n=== openFile 재생 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LocalFile(base_path=tmp, journal=True)
+        storage.uploadFile("group8", "godpackCode.json", {"a": "1"}, "JSON")
+        storage.appendEdit("group8", "godpackCode.json", '+', "b", "2")
+        storage.appendEdit("group8", "godpackCode.json", '-', "a")
+        assert storage.openFile("group8", "godpackCode.json", "JSON") == {"b": "2"}
+
+        storage.compactFile("group8", "godpackCode.json", {"b": "2"}, "JSON", force=True)
+        journal = storage.getJournal(storage._get_file_path("group8", "godpackCode.json"))
+        assert journal.tell() == 0
+        with open(journal.file_path, 'r', encoding='utf-8') as f:
+            assert json.load(f) == {"b": "2"}
+    return True
+
+
+def main():
+    tests = [
+        ("저널 추가", test_edit_appends_without_rewrite),
+        ("compaction", test_compaction_and_partial_line),
+        ("openFile 재생", test_localfile_open_replays_journal),
+    ]
+
+    results = []
+    for name, test in tests:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"❌ {name} 실패: {e}")
+            results.append((name, False))
+
+    print("\n=== 결과 ===")
+    for name, ok in results:
+        print(f"{'✅' if ok else '❌'} {name}")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+test_shared_storage.py - LocalFile 공유 인스턴스 / 어댑터 레지스트리 테스트
+"""
+
+import os
+import sys
+import tempfile
+
+# LocalFileAdapter는 평면 import를 사용
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'modules'))
+
+import LocalFile
+import LocalFileAdapter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules import GISTAdapter
+from src.modules.LocalFile import get_shared
+
+
+def test_shared_instance_and_adapter():
+    """같은 경로는 같은 LocalFile, 같은 파일은 같은 어댑터"""
+    print("=== 공유 인스턴스 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['DATA_PATH'] = tmp
+        try:
+            first = LocalFile.get_shared()
+            assert LocalFile.get_shared() is first
+            assert LocalFile.get_shared(base_path=os.path.join(tmp, "poke_data")) is first
+
+            godpack = LocalFileAdapter.JSON(None, 'GodPack7')
+            same = LocalFileAdapter.JSON(None, 'GodPack7')
+            assert godpack is same
+            assert godpack.storage is first
+            assert LocalFileAdapter.JSON(None, 'Code7') is not godpack
+
+            godpack.edit('+', "k", "Yet")
+            godpack.update()
+            assert same.DATA == {"k": "Yet"}
+        finally:
+            os.environ.pop('DATA_PATH', None)
+    return True
+
+
+def test_gist_adapter_shared_files():
+    """GISTAdapter도 같은 파일은 같은 어댑터 (쓰기 락 공유)"""
+    print("\n=== GISTAdapter 공유 어댑터 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        adapter = GISTAdapter.GISTAdapter()
+        adapter.local_storage = get_shared(base_path=tmp)
+        godpack = adapter.JSON(None, "GodPack7")
+        assert adapter.JSON(None, "GodPack7") is godpack
+        assert adapter.JSON(None, "Code7") is not godpack
+
+        online = adapter.TEXT(None, "Group7")
+        online.edit('+', "1234")
+        online.update()
+        assert adapter.TEXT(None, "Group7") is online and online.DATA == {"1234"}
+        # initial=False로 다시 열면 같은 어댑터를 빈 상태로
+        assert adapter.TEXT(None, "Group7", False) is online and online.DATA == set()
+    return True
+
+
+def main():
+    tests = [
+        ("공유 인스턴스", test_shared_instance_and_adapter),
+        ("GISTAdapter 공유 어댑터", test_gist_adapter_shared_files),
+    ]
+
+    results = []
+    for name, test in tests:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"❌ {name} 실패: {e}")
+            results.append((name, False))
+
+    print("\n=== 결과 ===")
+    for name, ok in results:
+        print(f"{'✅' if ok else '❌'} {name}")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
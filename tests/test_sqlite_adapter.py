@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+test_sqlite_adapter.py - SQLite 백엔드 어댑터 테스트
+"""
+
+import os
+import sys
+import json
+import asyncio
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules import Codec
+from src.modules import SQLiteAdapter
+from src.modules.SQLiteAdapter import SQLiteGISTAdapter
+
+
+def test_point_updates_and_reload():
+    """edit/update가 변경된 행만 반영하고 새 인스턴스에서 그대로 복원"""
+    print("=== 부분 갱신 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        adapter = SQLiteGISTAdapter(db_path=os.path.join(tmp, "poke.db"))
+        member = adapter.JSON(None, "Alliance")
+        member.edit('+', "DUCK", "1234567890123456")
+        member.edit('+', "Saisai2", "6543210987654321")
+        member.update()
+        member.edit('-', "DUCK")
+        member.update()
+
+        admin = adapter.TEXT(None, "Admin")
+        admin.edit('+', "111")
+        admin.edit('+', "222")
+        admin.update()
+
+        reopened = SQLiteGISTAdapter(db_path=os.path.join(tmp, "poke.db"))
+        assert reopened.JSON(None, "Alliance").DATA == {"Saisai2": "6543210987654321"}
+        assert reopened.TEXT(None, "Admin").fetch_raw() == {"111", "222"}
+        assert reopened.TEXT(None, "Admin").contains("111")
+    return True
+
+
+def test_aupdate_in_thread():
+    """aupdate는 storage_io 스레드에서 반영, 보내는 동안의 edit()은 다음 갱신으로 / import만으로 DB를 열지 않음"""
+    print("\n=== 비동기 갱신 테스트 ===")
+    assert SQLiteAdapter._adapter is None
+    with tempfile.TemporaryDirectory() as tmp:
+        adapter = SQLiteGISTAdapter(db_path=os.path.join(tmp, "poke.db"))
+        member = adapter.JSON(None, "Alliance")
+        online = adapter.TEXT(None, "Group7", False)
+
+        async def run():
+            member.edit('+', "DUCK", "1")
+            online.edit('+', "a")
+            sending = asyncio.gather(member.aupdate(), online.aupdate())
+            await asyncio.sleep(0)  # 변경사항을 떼어 내고 스레드로 보낸 상태
+            member.edit('+', "Saisai2", "2")  # 보내는 중의 변경
+            await sending
+            assert member._ops == {"Saisai2": "2"}
+            await member.aupdate()
+
+        asyncio.run(run())
+        reopened = SQLiteGISTAdapter(db_path=os.path.join(tmp, "poke.db"))
+        assert reopened.JSON(None, "Alliance").DATA == {"DUCK": "1", "Saisai2": "2"}
+        assert reopened.TEXT(None, "Group7").DATA == {"a"}
+    return True
+
+
+def test_initial_false_replaces_set():
+    """initial=False 온라인 목록은 첫 update에서 기존 내용을 교체"""
+    print("\n=== 온라인 목록 교체 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        adapter = SQLiteGISTAdapter(db_path=os.path.join(tmp, "poke.db"))
+        online = adapter.TEXT(None, "Group7")
+        online.edit('+', "old")
+        online.update()
+
+        online = adapter.TEXT(None, "Group7", False)
+        online.edit('+', "new")
+        online.update()
+        assert online.fetch_raw() == {"new"}
+    return True
+
+
+def test_batch_is_atomic():
+    """batch 안의 GODPACK + GPTEST 갱신은 하나의 트랜잭션"""
+    print("\n=== 트랜잭션 묶음 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        adapter = SQLiteGISTAdapter(db_path=os.path.join(tmp, "poke.db"))
+        godpack = adapter.JSON(None, "GodPack7")
+        code = adapter.JSON(None, "Code7")
+        save = "2025.04.06 05:58 DUCK Solgaleo 100% 3P"
+
+        try:
+            with adapter.batch():
+                godpack.edit('+', save, "Yet")
+                godpack.update()
+                assert godpack.fetch_raw() == {}  # 아직 반영 전
+                raise RuntimeError("중간 실패")
+        except RuntimeError:
+            pass
+        assert adapter.JSON(None, "GodPack7").DATA == {}
+
+        godpack.edit('+', save, "Yet")
+        with adapter.batch():
+            godpack.update()
+            code.edit('+', save, "1234567890123456")
+            code.update()
+        assert adapter.JSON(None, "GodPack7").DATA == {save: "Yet"}
+        assert adapter.JSON(None, "Code7").get(save) == "1234567890123456"
+    return True
+
+
+def test_legacy_import():
+    """처음 여는 파일은 기존 LocalFile 데이터를 가져옴"""
+    print("\n=== 기존 파일 가져오기 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        adapter = SQLiteGISTAdapter(db_path=os.path.join(tmp, "poke.db"))
+        adapter.base_path = tmp
+        os.makedirs(os.path.join(tmp, "group8"))
+        with open(os.path.join(tmp, "group8", "godpack.json"), 'w', encoding='utf-8') as f:
+            json.dump({"a": "Yet", "b": "Good"}, f)
+        assert adapter.JSON(None, "GodPack8").DATA == {"a": "Yet", "b": "Good"}
+
+        # convert_storage_format.py로 msgpack 변환된 파일도 가져옴
+        if Codec.msgpack is not None:
+            Codec.write_file(os.path.join(tmp, "group8", "godpackCode.json"), {"a": "1234"}, Codec.FORMAT_MSGPACK)
+            assert adapter.JSON(None, "Code8").DATA == {"a": "1234"}
+    return True
+
+
+def main():
+    tests = [
+        ("부분 갱신", test_point_updates_and_reload),
+        ("온라인 목록 교체", test_initial_false_replaces_set),
+        ("트랜잭션 묶음", test_batch_is_atomic),
+        ("기존 파일 가져오기", test_legacy_import),
+        ("비동기 갱신", test_aupdate_in_thread),
+    ]
+
+    results = []
+    for name, test in tests:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"❌ {name} 실패: {e}")
+            results.append((name, False))
+
+    print("\n=== 결과 ===")
+    for name, ok in results:
+        print(f"{'✅' if ok else '❌'} {name}")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+test_state_snapshot.py - 상태 스냅샷 저장/복원 및 변경 파일 감지 테스트
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules import StateSnapshot
+from src.modules.HeartbeatStore import HeartbeatStore
+
+
+def hb(minute):
+    return {"timestamp": f"2025-04-01T10:{minute:02d}:00+00:00", "barracks": minute}
+
+
+def test_snapshot_roundtrip():
+    """저장 -> 복원 시 파일을 읽지 않고 최신 기록/중복 확인 창 복원, 오래된/깨진 스냅샷은 None"""
+    print("=== 스냅샷 저장/복원 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HeartbeatStore(os.path.join(tmp, "heartbeat_data"))
+        store.append("a", hb(1))
+        store.append("a", hb(2))
+        path = os.path.join(tmp, "state.json")
+        saved_at = StateSnapshot.save(path, {"heartbeat": store.snapshot(), "scan_cursor": hb(2)["timestamp"]})
+
+        state = StateSnapshot.load(path)
+        assert state["saved_at"] == saved_at and state["scan_cursor"] == hb(2)["timestamp"]
+
+        restored = HeartbeatStore(store.data_dir)
+        restored._read_tail = None  # 파일을 읽으면 실패
+        assert restored.restore(state["heartbeat"]) == 1
+        assert restored.latest("a")["barracks"] == 2
+        assert restored.high_water_mark() == hb(2)["timestamp"]  # 매니페스트 없이 메모리 기준
+        assert restored.is_duplicate("a", hb(1)["timestamp"])
+
+        # 복원 전에 들어온 실시간 Heartbeat의 창/최신 기록은 유지하고 합침
+        live = HeartbeatStore(store.data_dir)
+        live.append("a", hb(3))
+        assert live.restore(state["heartbeat"]) == 1
+        assert live.latest("a")["barracks"] == 3
+        assert all(live.is_duplicate("a", hb(m)["timestamp"]) for m in (1, 2, 3))
+
+        assert StateSnapshot.load(path, max_age_hours=-1) is None
+        with open(path, 'w') as f:
+            f.write("{broken")
+        assert StateSnapshot.load(path) is None
+        assert StateSnapshot.load(os.path.join(tmp, "missing.json")) is None
+    return True
+
+
+def test_changed_since():
+    """스냅샷 이후 수정된 파일만 골라냄"""
+    print("\n=== 변경 파일 감지 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("old.json", "new.json", "skip.txt"):
+            with open(os.path.join(tmp, name), 'w') as f:
+                f.write("{}")
+        past = time.time() - 100
+        os.utime(os.path.join(tmp, "old.json"), (past, past))
+        names, changed = StateSnapshot.changed_since(tmp, ".json", time.time() - 50)
+        assert names == {"old", "new"}
+        assert changed == {"new"}
+        assert StateSnapshot.changed_since(os.path.join(tmp, "none"), ".json", 0) == (set(), set())
+    return True
+
+
+def main():
+    tests = [
+        ("스냅샷 저장/복원", test_snapshot_roundtrip),
+        ("변경 파일 감지", test_changed_since),
+    ]
+
+    results = []
+    for name, test in tests:
+        try:
+            results.append((name, test()))
+        except Exception as e:
+            print(f"❌ {name} 실패: {e}")
+            results.append((name, False))
+
+    print("\n=== 결과 ===")
+    for name, ok in results:
+        print(f"{'✅' if ok else '❌'} {name}")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
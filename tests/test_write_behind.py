@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+test_write_behind.py - GISTAdapter write-behind 플러시 테스트
+"""
+
+import os
+import sys
+import json
+import asyncio
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.LocalFile import LocalFile
+from src.modules.GISTAdapter import TextAdapter, JsonAdapter
+from src.modules.WriteBehind import WriteBehindFlusher
+
+
+def test_immediate_write_without_flusher():
+    """플러셔가 없으면 update() 즉시 기록"""
+    print("=== 즉시 쓰기 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LocalFile(base_path=tmp)
+        godpack = JsonAdapter(storage, "group7", "godpack.json", name="GodPack7")
+        godpack.edit('+', "2025.04.06 05:58 name 735 20% 2P", "Yet")
+        godpack.update()
+        with open(godpack.file_path, 'r', encoding='utf-8') as f:
+            assert json.load(f) == {"2025.04.06 05:58 name 735 20% 2P": "Yet"}
+    return True
+
+
+def test_coalesced_flush():
+    """플러셔 동작 중에는 여러 update()가 한 번의 쓰기로 합쳐짐"""
+    print("\n=== write-behind 병합 테스트 ===")
+
+    async def scenario(tmp):
+        storage = LocalFile(base_path=tmp)
+        flusher = WriteBehindFlusher(interval=0.05)
+        online = TextAdapter(storage, "group7", "online.txt", name="Group7", initial=False, flusher=flusher)
+        godpack = JsonAdapter(storage, "group7", "godpack.json", name="GodPack7", flusher=flusher)
+        flusher.start()
+
+        for i in range(20):
+            online.edit('+', f"code{i:02d}")
+            online.update()
+            godpack.edit('+', f"key{i}", "Yet")
+            godpack.update()
+
+        # 아직 플러시 전이므로 파일 없음
+        assert not os.path.exists(online.file_path)
+
+        await asyncio.sleep(0.2)
+        assert flusher.flush_count == 2, flusher.flush_count
+        assert flusher.coalesced == 38, flusher.coalesced
+
+        with open(online.file_path, 'r', encoding='utf-8') as f:
+            assert f.read().split('\n') == [f"code{i:02d}" for i in range(20)]
+
+        # 종료 시 남은 변경사항 기록
+        godpack.edit('-', "key0")
+        godpack.update()
+        await flusher.stop()
+        with open(godpack.file_path, 'r', encoding='utf-8') as f:
+            assert "key0" not in json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(scenario(tmp))
+    return True
+
+
+def test_stale_snapshot_skipped():
+    """오래된 스냅샷은 최신 기록을 덮어쓰지 않음"""
+    print("\n=== 스냅샷 버전 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LocalFile(base_path=tmp)
+        online = TextAdapter(storage, "group8", "online.txt", name="Group8", initial=False)
+        online.edit('+', "old")
+        stale = online._snapshot()
+        online.edit('+', "new")
+        online._write(online._snapshot())
+        online._write(stale)
+        assert online.fetch_raw() == {"old", "new"}
+    return True
+
+
+def main():
+    """메인 테스트 실행"""
+    print("write-behind 테스트 시작\n")
+
+    tests = [
+        ("즉시 쓰기", test_immediate_write_without_flusher),
+        ("write-behind 병합", test_coalesced_flush),
+        ("스냅샷 버전", test_stale_snapshot_skipped),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_name, test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+                print(f"\n✅ {test_name} 테스트 통과")
+            else:
+                failed += 1
+                print(f"\n❌ {test_name} 테스트 실패")
+        except Exception as e:
+            failed += 1
+            print(f"\n❌ {test_name} 테스트 중 에러: {e}")
+
+    print("\n" + "="*50)
+    print(f"테스트 결과: {passed}개 통과, {failed}개 실패")
+    print("="*50)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)